@@ -7,6 +7,9 @@ Starts a FastAPI application exposing three endpoint groups:
   POST /api/v1/assets/upload        - Upload ad-set or product-flow images to Firebase Storage
   GET  /api/v1/assets/              - List current user's uploaded assets
   POST /api/v1/simulations/run      - Run an Ad or Product-Flow simulation
+  POST /api/v1/simulations/jobs     - Submit a simulation job (poll GET /simulations/{id}, SSE /{id}/events)
+  GET  /health/llm                  - LLM concurrency limiter and cache stats
+  GET  /metrics                     - LLM calls, tokens, latency and cost per tier / caller / model
 
 Run locally:
   uvicorn app:app --reload --port 8000
@@ -24,6 +27,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.image_cache import close_http_client
 from src.api.routes.auth import router as auth_router
 from src.api.routes.assets import router as assets_router
 from src.api.routes.simulation import router as simulation_router
@@ -37,7 +41,7 @@ from src.api.routes.simulation import router as simulation_router
 async def lifespan(app: FastAPI):
     # Do not block startup on persona DB; first request will load if needed
     yield
-    # Nothing to tear down
+    await close_http_client()
 
 
 # ---------------------------------------------------------------------------
@@ -84,6 +88,26 @@ async def health():
     return {"status": "ok", "service": "apriori-api"}
 
 
+@app.get("/health/llm", tags=["Health"])
+async def llm_health():
+    """Adaptive concurrency limits, response-cache counters and token usage per model tier."""
+    from src.api.gemini_client import gemini_client
+
+    return {
+        "limiters": gemini_client.limiter_stats(),
+        "cache": gemini_client.cache_stats(),
+        "tokens": gemini_client.token_stats(),
+    }
+
+
+@app.get("/metrics", tags=["Health"])
+async def llm_metrics():
+    """LLM calls, tokens, latency, retries and cost since startup, per tier / caller / model."""
+    from src.api.llm_telemetry import llm_telemetry
+
+    return llm_telemetry.usage.summary()
+
+
 @app.get("/", tags=["Health"])
 async def root():
     return {
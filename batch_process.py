@@ -5,6 +5,7 @@ This script allows running multiple simulation campaigns in parallel
 with different configurations.
 """
 
+import argparse
 import asyncio
 import json
 from pathlib import Path
@@ -26,6 +27,11 @@ class CampaignConfig:
     @property
     def output_path(self):
         return f"data/campaigns/{self.name}_{self.timestamp}.json"
+    
+    @property
+    def run_id(self):
+        """Checkpoint journal id; rerunning with the same timestamp resumes the campaign."""
+        return f"campaign_{self.name}_{self.timestamp}"
 
 
 # Define multiple campaigns
@@ -135,7 +141,8 @@ async def run_campaign(config: CampaignConfig):
         result = await orchestrator.run_full_simulation(
             ads=config.ads,
             num_personas=config.num_personas,
-            output_path=config.output_path
+            output_path=config.output_path,
+            run_id=config.run_id
         )
         
         print(f"\n✅ Campaign '{config.name}' completed successfully!")
@@ -236,8 +243,18 @@ def generate_comparison_report(results: list):
     return comparison
 
 
-async def main():
-    """Main entry point for batch processing."""
+async def main(resume: str = None):
+    """Main entry point for batch processing.
+
+    resume: timestamp of an interrupted batch (from its campaign file names); each
+    campaign picks up from its journal and only simulates the missing reactions.
+    """
+    if resume:
+        for config in CAMPAIGNS:
+            config.timestamp = resume
+        print(f"\n♻️  Resuming batch {resume}")
+    else:
+        print(f"\n🧾 Batch timestamp: {CAMPAIGNS[0].timestamp} (resume with: python batch_process.py --resume {CAMPAIGNS[0].timestamp})")
     
     # Choose mode
     print("\n" + "="*80)
@@ -270,4 +287,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Apriori batch processing")
+    parser.add_argument("--resume", metavar="TIMESTAMP",
+                        help="Resume an interrupted batch (e.g. 20250101_120000)")
+    asyncio.run(main(resume=parser.parse_args().resume))
@@ -0,0 +1 @@
+"""Offline benchmarks (fake OpenRouter server + throughput scenarios)."""
@@ -0,0 +1,429 @@
+"""
+Local OpenAI-compatible stub of OpenRouter for offline benchmarks.
+
+Serves POST /api/v1/chat/completions with canned, schema-valid JSON for every
+prompt the engine sends (hydration, creative analysis, visual anchors, Tier 1 /
+Tier 2 / batched reactions, flow screen analysis and step decisions, monologues),
+after a simulated latency. A configurable share of requests fails with HTTP 429
+(with Retry-After) or HTTP 500, so limiter and retry behaviour can be measured.
+
+Prompt caching is simulated like Anthropic via OpenRouter: the text up to the last
+content part carrying cache_control is a cacheable prefix (at least
+--cache-min-tokens). The first request writes it; later requests with the same
+model and prefix within --cache-ttl report it as usage.prompt_tokens_details
+.cached_tokens, are billed at --cache-read-factor of the input price in usage.cost
+and get a shorter latency (--cache-latency-saving x cached share).
+
+GET /stats returns served / throttled / failed counts; POST /stats/reset clears them.
+
+Usage:
+  python -m benchmarks.fake_openrouter --port 8765 --flash-latency-ms 300 --throttle-rate 0.02
+  OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1 python run_simulation.py ...
+
+Standard library only (asyncio streams), so it runs wherever the engine runs.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class StubConfig:
+    pro_latency_ms: float = 1500.0
+    flash_latency_ms: float = 400.0
+    latency_jitter: float = 0.3          # lognormal sigma around the mean
+    throttle_rate: float = 0.0           # share of requests answered with 429
+    error_rate: float = 0.0              # share of requests answered with 500
+    retry_after_seconds: float = 1.0
+    continue_rate: float = 0.85          # flow step decisions that CONTINUE
+    click_rate: float = 0.15
+    pro_model_hint: str = "claude"       # substring identifying the Pro model
+    seed: int = 7
+    prompt_cache: bool = True            # honour cache_control breakpoints
+    cache_ttl_seconds: float = 300.0
+    cache_min_tokens: int = 1024
+    cache_read_factor: float = 0.1       # cached input tokens cost this share of the input price
+    cache_latency_saving: float = 0.5    # latency reduction at 100% cached prompt
+    input_price_per_mtok: float = 3.0    # USD per 1M input tokens
+    output_price_per_mtok: float = 15.0
+
+
+@dataclass
+class StubStats:
+    served: int = 0
+    throttled: int = 0
+    failed: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    cache_writes: int = 0
+    cost: float = 0.0
+    by_kind: Dict[str, int] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "served": self.served,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_writes": self.cache_writes,
+            "cost": round(self.cost, 6),
+            "by_kind": dict(self.by_kind),
+            "uptime_seconds": round(time.time() - self.started_at, 2),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Canned responses
+# ---------------------------------------------------------------------------
+
+_BATCH_ITEM_RE = re.compile(r"^- (P\d+xA\d+):", re.MULTILINE)
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> Tuple[str, bool]:
+    """Concatenate all message text; report whether an image part was attached."""
+    parts, has_image = [], False
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            for item in content:
+                if item.get("type") == "text":
+                    parts.append(item.get("text", ""))
+                elif item.get("type") == "image_url":
+                    has_image = True
+    return "\n".join(parts), has_image
+
+
+def _cached_prefix(messages: List[Dict[str, Any]]) -> str:
+    """Text up to and including the last content part marked with cache_control ("" if none)."""
+    parts, prefix = [], ""
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            for item in content:
+                if item.get("type") == "text":
+                    parts.append(item.get("text", ""))
+                    if item.get("cache_control"):
+                        prefix = "\n".join(parts)
+    return prefix
+
+
+def classify_prompt(text: str) -> str:
+    if '"reactions"' in text and "item_id" in text:
+        return "tier2_batch"
+    if "final_action" in text:
+        return "tier1_reaction"
+    if '"gut_reaction"' in text:
+        return "tier2_reaction"
+    if '"ad_copy"' in text:
+        return "creative_analysis"
+    if '"trust_signals"' in text:
+        return "visual_anchor"
+    if '"purchasing_power_tier"' in text:
+        return "hydration"
+    if '"main_content"' in text:
+        return "screen_analysis"
+    if "CONTINUE or DROP_OFF" in text:
+        return "flow_decision"
+    return "text"
+
+
+def _reaction(rng: random.Random, cfg: StubConfig) -> Dict[str, Any]:
+    action = "CLICK" if rng.random() < cfg.click_rate else rng.choice(["IGNORE"] * 9 + ["REPORT"])
+    return {
+        "gut_reaction": "Looks interesting but I am not sure.",
+        "critical_audit": "Who is behind this? The offer needs more proof.",
+        "constraint_hits": ["Limited budget"],
+        "trust_score": rng.randint(2, 8),
+        "relevance_score": rng.randint(2, 9),
+        "action": action,
+        "intent_level": "High" if action == "CLICK" and rng.random() < 0.5 else rng.choice(["Low", "Medium", "None"]),
+        "reasoning": "System 2 kept the gut reaction in check.",
+        "emotional_response": rng.choice(["Curious", "Skeptical", "Indifferent"]),
+        "primary_barrier": "" if action == "CLICK" else "Not relevant right now",
+    }
+
+
+def canned_content(kind: str, text: str, rng: random.Random, cfg: StubConfig) -> str:
+    if kind == "tier2_batch":
+        items = []
+        for item_id in _BATCH_ITEM_RE.findall(text):
+            items.append({"item_id": item_id, **_reaction(rng, cfg)})
+        return json.dumps({"reactions": items})
+    if kind == "tier2_reaction":
+        return json.dumps(_reaction(rng, cfg))
+    if kind == "tier1_reaction":
+        r = _reaction(rng, cfg)
+        return json.dumps({
+            "system1_gut_reaction": r["gut_reaction"],
+            "system2_critical_audit": r["critical_audit"],
+            "identity_anchors": ["Supports a family of four"],
+            "friction_points": r["constraint_hits"],
+            "social_pressure": "My family would ask questions.",
+            "final_trust_score": r["trust_score"],
+            "final_relevance_score": r["relevance_score"],
+            "final_action": r["action"],
+            "intent_level": r["intent_level"],
+            "reasoning": r["reasoning"],
+            "emotional_response": r["emotional_response"],
+            "primary_barrier": r["primary_barrier"],
+        })
+    if kind in ("creative_analysis", "visual_anchor"):
+        data = {
+            "trust_signals": "Brand logo, clean layout",
+            "visual_quality": "Sharp, professional typography",
+            "color_psychology": "Blue and white, calm and trustworthy",
+            "brand_perception": "Looks like a legitimate brand",
+            "scam_indicators": "None detected",
+        }
+        if kind == "creative_analysis":
+            data = {"ad_copy": "Grow your business. Get paid faster. Sign up today.", **data}
+        return json.dumps(data)
+    if kind == "hydration":
+        return json.dumps({
+            "purchasing_power_tier": rng.choice(["High", "Mid", "Low"]),
+            "digital_literacy": rng.randint(2, 9),
+            "primary_device": rng.choice(["Android"] * 8 + ["iPhone", "Feature Phone"]),
+            "scam_vulnerability": rng.choice(["High", "Low"]),
+            "monthly_income_inr": rng.randrange(8000, 250000, 1000),
+            "financial_risk_tolerance": rng.choice(["High", "Low"]),
+        })
+    if kind == "screen_analysis":
+        return json.dumps({
+            "main_content": "Sign-up form",
+            "key_information": "Phone number and OTP",
+            "required_action": "Enter details and continue",
+            "design_quality": "Clear",
+            "friction_points": "Long form",
+        })
+    if kind == "flow_decision":
+        cont = rng.random() < cfg.continue_rate
+        return json.dumps({
+            "step_type": "MANDATORY",
+            "decision": "CONTINUE" if cont else "DROP_OFF",
+            "reasoning": "Seems fine, moving on." if cont else "Too many questions.",
+            "drop_off_reason": "" if cont else "Asked for too much information",
+            "trust_score": rng.randint(3, 9),
+            "clarity_score": rng.randint(3, 9),
+            "value_perception_score": rng.randint(3, 9),
+            "emotional_state": "calm" if cont else "annoyed",
+            "time_spent_seconds": rng.randint(5, 60),
+        })
+    return "I looked at it for a moment and moved on; it was fine but not for me right now."
+
+
+# ---------------------------------------------------------------------------
+# Minimal HTTP/1.1 server
+# ---------------------------------------------------------------------------
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class FakeOpenRouter:
+    """Keep-alive HTTP/1.1 server answering chat completions with canned JSON."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.stats = StubStats()
+        self.rng = random.Random(config.seed)
+        self._prefix_cache: Dict[str, float] = {}  # sha256(model, prefix) -> expiry
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    def _latency(self, model: str, cached_share: float = 0.0) -> float:
+        cfg = self.config
+        mean_ms = cfg.pro_latency_ms if cfg.pro_model_hint in model else cfg.flash_latency_ms
+        if mean_ms <= 0:
+            return 0.0
+        mean_ms *= 1 - cfg.cache_latency_saving * cached_share
+        return mean_ms / 1000.0 * self.rng.lognormvariate(0.0, cfg.latency_jitter)
+
+    def _cached_tokens(self, model: str, messages: List[Dict[str, Any]]) -> int:
+        """Prefix tokens served from cache (0 on a miss, which writes the prefix)."""
+        cfg = self.config
+        prefix = _cached_prefix(messages) if cfg.prompt_cache else ""
+        tokens = len(prefix) // 4
+        if tokens < cfg.cache_min_tokens:
+            return 0
+        key = hashlib.sha256(f"{model}\x00{prefix}".encode("utf-8")).hexdigest()
+        now = time.time()
+        hit = self._prefix_cache.get(key, 0.0) > now
+        self._prefix_cache[key] = now + cfg.cache_ttl_seconds  # written or refreshed
+        if not hit:
+            self.stats.cache_writes += 1
+        return tokens if hit else 0
+
+    async def _completion(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        model = str(payload.get("model", ""))
+        messages = payload.get("messages", [])
+        text, _ = _prompt_text(messages)
+        prompt_tokens = len(text) // 4
+        cached_tokens = self._cached_tokens(model, messages)
+        await asyncio.sleep(self._latency(model, cached_tokens / prompt_tokens if prompt_tokens else 0.0))
+
+        roll = self.rng.random()
+        if roll < self.config.throttle_rate:
+            self.stats.throttled += 1
+            headers = {"Retry-After": f"{self.config.retry_after_seconds:g}"}
+            return 429, headers, {"error": {"message": "Rate limit exceeded", "code": 429}}
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self.stats.failed += 1
+            return 500, {}, {"error": {"message": "Upstream provider error", "code": 500}}
+
+        kind = classify_prompt(text)
+        content = canned_content(kind, text, self.rng, self.config)
+        completion_tokens = len(content) // 4
+        cfg = self.config
+        cost = (
+            (prompt_tokens - cached_tokens + cached_tokens * cfg.cache_read_factor) * cfg.input_price_per_mtok
+            + completion_tokens * cfg.output_price_per_mtok
+        ) / 1_000_000
+        self.stats.served += 1
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.cached_tokens += cached_tokens
+        self.stats.cost += cost
+        self.stats.by_kind[kind] = self.stats.by_kind.get(kind, 0) + 1
+        return 200, {}, {
+            "id": f"gen-{uuid.uuid4().hex[:16]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+                "cost": round(cost, 8),
+            },
+        }
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        path = path.split("?")[0]
+        if method == "POST" and path.endswith("/chat/completions"):
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                return 500, {}, {"error": {"message": "Invalid JSON body"}}
+            return await self._completion(payload)
+        if method == "GET" and path == "/stats":
+            return 200, {}, self.stats.as_dict()
+        if method == "POST" and path == "/stats/reset":
+            self.stats = StubStats()
+            return 200, {}, {"reset": True}
+        return 404, {}, {"error": {"message": f"No route for {method} {path}"}}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                status, extra_headers, data = await self._route(method, path, body)
+                out = json.dumps(data).encode("utf-8")
+                head = [
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(out)}",
+                    "Connection: keep-alive",
+                ] + [f"{k}: {v}" for k, v in extra_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + out)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        await self.start(host, port)
+        print(f"Fake OpenRouter listening on http://{host}:{port}/api/v1", flush=True)
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible OpenRouter stub for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pro-latency-ms", type=float, default=StubConfig.pro_latency_ms)
+    parser.add_argument("--flash-latency-ms", type=float, default=StubConfig.flash_latency_ms)
+    parser.add_argument("--latency-jitter", type=float, default=StubConfig.latency_jitter,
+                        help="Lognormal sigma of the latency distribution (0 = fixed)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=StubConfig.retry_after_seconds,
+                        help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--continue-rate", type=float, default=StubConfig.continue_rate)
+    parser.add_argument("--click-rate", type=float, default=StubConfig.click_rate)
+    parser.add_argument("--pro-model-hint", default=StubConfig.pro_model_hint,
+                        help="Substring of the model id that gets Pro latency")
+    parser.add_argument("--seed", type=int, default=StubConfig.seed)
+    parser.add_argument("--no-prompt-cache", action="store_true", help="Ignore cache_control breakpoints")
+    parser.add_argument("--cache-ttl", type=float, default=StubConfig.cache_ttl_seconds,
+                        help="Seconds a cached prompt prefix stays warm (refreshed on every hit)")
+    parser.add_argument("--cache-min-tokens", type=int, default=StubConfig.cache_min_tokens)
+    parser.add_argument("--cache-read-factor", type=float, default=StubConfig.cache_read_factor,
+                        help="Price of a cached input token relative to an uncached one")
+    parser.add_argument("--cache-latency-saving", type=float, default=StubConfig.cache_latency_saving,
+                        help="Latency reduction for a fully cached prompt (0-1)")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        pro_latency_ms=args.pro_latency_ms,
+        flash_latency_ms=args.flash_latency_ms,
+        latency_jitter=args.latency_jitter,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after_seconds=args.retry_after,
+        continue_rate=args.continue_rate,
+        click_rate=args.click_rate,
+        pro_model_hint=args.pro_model_hint,
+        seed=args.seed,
+        prompt_cache=not args.no_prompt_cache,
+        cache_ttl_seconds=args.cache_ttl,
+        cache_min_tokens=args.cache_min_tokens,
+        cache_read_factor=args.cache_read_factor,
+        cache_latency_saving=args.cache_latency_saving,
+    )
+
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    try:
+        asyncio.run(FakeOpenRouter(config_from_args(args)).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
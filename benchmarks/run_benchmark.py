@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the simulation pipeline.
+
+Starts benchmarks/fake_openrouter.py in a subprocess, points the engine at it
+(OPENROUTER_BASE_URL) and runs scenarios of N personas x M ads / screens.
+For every stage it reports wall time, LLM requests/sec, p50/p95 request
+latency, 429 / 5xx counts, CPU seconds and peak RSS.
+
+Usage:
+  python -m benchmarks.run_benchmark                              # 100 and 1000 personas, 3 ads, 5 screens
+  python -m benchmarks.run_benchmark --personas 100,1000,10000 --ads 5 --screens 8
+  python -m benchmarks.run_benchmark --scenarios ads --throttle-rate 0.05 --flash-latency-ms 800
+  TIER2_BATCH_SIZE=8 python -m benchmarks.run_benchmark --scenarios ads
+
+Scenarios:
+  ads   hydration → creative analysis → tiered simulation → validation → optimization
+  flow  hydration → FlowSimulator.run_flow (screen analysis + step decisions)
+  api   POST /api/v1/simulations/run end to end (synthetic DuckDB personas, n capped at 100)
+
+Results are printed as a table and written to data/benchmarks/bench_<timestamp>.json.
+Caches that would hide LLM cost (response cache, hydration store, creative analysis
+file cache) are disabled unless --keep-caches is given.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StubClient:
+    """Reads request counters from the stub server."""
+
+    def __init__(self, base: str):
+        self.base = base
+
+    def stats(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(f"{self.base}/stats", timeout=5) as resp:
+            return json.loads(resp.read())
+
+
+class LLMCallRecorder:
+    """Wraps the OpenAI client's chat.completions.create to time every HTTP call."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def install(self, gemini_client) -> None:
+        completions = gemini_client.client.chat.completions
+        original = completions.create
+
+        async def timed_create(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.latencies.append(time.perf_counter() - started)
+
+        completions.create = timed_create
+
+    def reset(self) -> None:
+        self.latencies = []
+        self.errors = 0
+
+
+class Bench:
+    """Collects per-stage metrics for all scenarios."""
+
+    def __init__(self, stub: StubClient, recorder: LLMCallRecorder, verbose: bool = False):
+        self.stub = stub
+        self.recorder = recorder
+        self.verbose = verbose
+        self.rows: List[Dict[str, Any]] = []
+
+    @contextlib.asynccontextmanager
+    async def stage(self, scenario: str, stage: str, **labels: Any):
+        self.recorder.reset()
+        stub_before = self.stub.stats()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        with open(os.devnull, "w") as devnull:
+            with contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(devnull):
+                yield
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        stub_after = self.stub.stats()
+        lat = self.recorder.latencies
+        row = {
+            "scenario": scenario,
+            "stage": stage,
+            **labels,
+            "wall_seconds": round(wall, 3),
+            "llm_calls": len(lat),
+            "requests_per_second": round(len(lat) / wall, 2) if wall > 0 else None,
+            "latency_p50_ms": round(_percentile(lat, 50) * 1000, 1) if lat else None,
+            "latency_p95_ms": round(_percentile(lat, 95) * 1000, 1) if lat else None,
+            "stub_served": stub_after["served"] - stub_before["served"],
+            "stub_throttled": stub_after["throttled"] - stub_before["throttled"],
+            "stub_failed": stub_after["failed"] - stub_before["failed"],
+            "client_errors": self.recorder.errors,
+            "cpu_seconds": round(cpu, 3),
+            "cpu_percent": round(cpu / wall * 100, 1) if wall > 0 else None,
+            "rss_mb": round(_current_rss_mb(), 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+        self.rows.append(row)
+        print(
+            f"  {scenario:<5} {stage:<18} n={labels.get('personas', '-'):<6} "
+            f"{row['wall_seconds']:>8.2f}s  calls={row['llm_calls']:<6} rps={row['requests_per_second'] or 0:<8} "
+            f"p95={row['latency_p95_ms'] or 0:>7}ms  429={row['stub_throttled']:<4} cpu={row['cpu_seconds']:.2f}s "
+            f"peak_rss={row['peak_rss_mb']}MB",
+            flush=True,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _write_images(dest: Path, count: int, prefix: str) -> List[Path]:
+    """Distinct placeholder image files (the stub never decodes them)."""
+    dest.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(1, count + 1):
+        p = dest / f"{prefix}_{i:02d}.png"
+        p.write_bytes(b"\x89PNG\r\n\x1a\n" + uuid.uuid4().bytes * 64)
+        paths.append(p)
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+async def hydrate(bench: Bench, n: int, seed: int):
+    from src.core.persona_hydrator import PersonaHydrator
+    from src.data.loader import data_loader
+
+    random.seed(seed)
+    raw = data_loader._generate_synthetic_personas(n)
+    async with bench.stage("setup", "hydration", personas=n):
+        enriched = await PersonaHydrator(use_store=False).hydrate_batch(raw)
+    return raw, enriched
+
+
+async def scenario_ads(bench: Bench, enriched, n: int, n_ads: int, workdir: Path) -> None:
+    from src.core.ad_simulator import AdSimulator
+    from src.core.optimizer import optimizer
+    from src.core.simulation_engine import Ad
+    from src.core.validator import validator
+    from src.utils.creative_analysis import analyze_creatives
+
+    paths = _write_images(workdir / f"ads_{n}", n_ads, "ad")
+    labels = {"personas": n, "ads": n_ads}
+
+    async with bench.stage("ads", "creative_analysis", **labels):
+        analyses = await analyze_creatives([str(p) for p in paths])
+    ads = [
+        Ad(
+            ad_id=f"ad_{i}",
+            name=f"Creative {i}",
+            copy=(analyses.get(str(p)) or {}).get("ad_copy", ""),
+            image_path=str(p),
+            description=f"Benchmark creative {i}",
+        )
+        for i, p in enumerate(paths, 1)
+    ]
+
+    async with bench.stage("ads", "simulation", **labels):
+        result = await AdSimulator(product_category="general").run(enriched, ads)
+
+    ad_contexts = {ad.ad_id: {"copy": ad.copy, "description": ad.description, "scam_indicators": "Unknown"} for ad in ads}
+    async with bench.stage("ads", "validation", **labels):
+        _, valid = validator.validate_and_filter(enriched, result.reactions, ad_contexts)
+
+    async with bench.stage("ads", "optimization", **labels):
+        optimizer.optimize_portfolio(valid, enriched, max_ads=len(ads))
+        optimizer.generate_heatmap_matrix(valid, enriched, [ad.ad_id for ad in ads])
+
+
+async def scenario_flow(bench: Bench, enriched, n: int, n_screens: int, workdir: Path) -> None:
+    from src.core.base import FlowScreen, FlowStimulus
+    from src.core.flow_simulator import FlowSimulator
+
+    paths = _write_images(workdir / f"flow_{n}", n_screens, "screen")
+    flow = FlowStimulus(
+        flow_id="bench_flow",
+        flow_name="Benchmark Flow",
+        screens=[
+            FlowScreen(
+                view_id=f"screen_{i}",
+                view_number=i,
+                view_name=f"Screen {i}",
+                image_path=str(p),
+                description=f"Screen {i}",
+                step_type="MANDATORY",
+            )
+            for i, p in enumerate(paths, 1)
+        ],
+    )
+    async with bench.stage("flow", "run_flow", personas=n, screens=n_screens):
+        await FlowSimulator().run_flow(enriched, flow, analyze_screens=True, progress=False)
+
+
+async def scenario_api(bench: Bench, raw, n: int, n_ads: int, workdir: Path) -> None:
+    import httpx
+    import pandas as pd
+
+    try:
+        from app import app
+    except Exception as exc:  # firebase_admin / multipart missing in minimal environments
+        print(f"  api   skipped: could not import app ({exc!r})")
+        return
+
+    from src.data.loader import data_loader
+
+    csv_path = workdir / f"personas_{n}.csv"
+    pd.DataFrame([p.model_dump() for p in raw]).to_csv(csv_path, index=False)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        data_loader.load_from_csv(str(csv_path))
+
+    ads_dir = workdir / f"api_ads_{n}"
+    _write_images(ads_dir, n_ads, "ad")
+    body = {
+        "n": min(n, 100),
+        "target_group": "urban small business owners",
+        "simulation_type": 0,
+        "local_ads_dir": str(ads_dir),
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async with bench.stage("api", "POST /run", personas=body["n"], ads=n_ads):
+            resp = await client.post("/api/v1/simulations/run", json=body)
+    if resp.status_code != 200:
+        print(f"  api   POST /run returned HTTP {resp.status_code}: {resp.text[:200]}")
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Fake OpenRouter did not start on port {port}")
+
+
+async def run_all(args: argparse.Namespace, stub_base: str) -> List[Dict[str, Any]]:
+    # Imported only after the environment points at the stub
+    from src.api.gemini_client import gemini_client
+
+    recorder = LLMCallRecorder()
+    recorder.install(gemini_client)
+    bench = Bench(StubClient(stub_base), recorder, verbose=args.verbose)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="apriori_bench_") as tmp:
+        workdir = Path(tmp)
+        for n in [int(x) for x in args.personas.split(",") if x.strip()]:
+            print(f"\n▶ {n} personas")
+            raw, enriched = await hydrate(bench, n, args.seed)
+            if "ads" in scenarios:
+                await scenario_ads(bench, enriched, n, args.ads, workdir)
+            if "flow" in scenarios:
+                await scenario_flow(bench, enriched, n, args.screens, workdir)
+            if "api" in scenarios:
+                await scenario_api(bench, raw, n, args.ads, workdir)
+    return bench.rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark against a fake OpenRouter")
+    parser.add_argument("--personas", default="100,1000", help="Comma-separated persona counts")
+    parser.add_argument("--ads", type=int, default=3)
+    parser.add_argument("--screens", type=int, default=5)
+    parser.add_argument("--scenarios", default="ads,flow", help="Any of: ads, flow, api")
+    parser.add_argument("--pro-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--flash-latency-ms", type=float, default=400.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.3)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=0, help="Stub port (default: any free port)")
+    parser.add_argument("--keep-caches", action="store_true", help="Leave LLM / hydration / creative caches as configured")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline console logs")
+    args = parser.parse_args()
+
+    port = args.port or _free_port()
+    stub_base = f"http://127.0.0.1:{port}"
+    os.environ["OPENROUTER_BASE_URL"] = f"{stub_base}/api/v1"
+    os.environ.setdefault("OPENROUTER_API_KEY", "sk-or-bench")
+    os.environ.setdefault("APRIORI_SKIP_AUTH", "1")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    tmp_db = Path(tempfile.mkdtemp(prefix="apriori_bench_db_")) / "bench.db"
+    os.environ["DB_PATH"] = str(tmp_db)
+    if not args.keep_caches:
+        os.environ["LLM_CACHE_ENABLED"] = "0"
+        os.environ["HYDRATION_STORE_ENABLED"] = "0"
+        os.environ["CREATIVE_ANALYSIS_CACHE_ENABLED"] = "0"
+
+    from src.utils.config import GEMINI_PRO_MODEL
+
+    stub_cmd = [
+        sys.executable, "-m", "benchmarks.fake_openrouter",
+        "--port", str(port),
+        "--pro-latency-ms", str(args.pro_latency_ms),
+        "--flash-latency-ms", str(args.flash_latency_ms),
+        "--latency-jitter", str(args.latency_jitter),
+        "--throttle-rate", str(args.throttle_rate),
+        "--error-rate", str(args.error_rate),
+        "--retry-after", str(args.retry_after),
+        "--pro-model-hint", GEMINI_PRO_MODEL,
+        "--seed", str(args.seed),
+    ]
+    stub = subprocess.Popen(stub_cmd, cwd=str(BASE_DIR), stdout=subprocess.DEVNULL)
+    started = time.time()
+    try:
+        _wait_for_port(port)
+        print(f"Fake OpenRouter on {stub_base} (pro {args.pro_latency_ms}ms, flash {args.flash_latency_ms}ms, "
+              f"429 {args.throttle_rate:.0%}, 5xx {args.error_rate:.0%})")
+        rows = asyncio.run(run_all(args, stub_base))
+    finally:
+        stub.terminate()
+        stub.wait(timeout=10)
+
+    report = {
+        "started_at": started,
+        "total_seconds": round(time.time() - started, 2),
+        "args": vars(args),
+        "env": {k: os.environ.get(k) for k in (
+            "TIER2_BATCH_SIZE", "TIER2_BATCH_MODE", "MAX_CONCURRENT_REQUESTS",
+            "PRO_MAX_CONCURRENCY", "FLASH_MAX_CONCURRENCY", "TIER1_SAMPLE_SIZE",
+        )},
+        "stages": rows,
+    }
+    out = Path(args.output) if args.output else BASE_DIR / "data" / "benchmarks" / f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\n✅ Benchmark complete in {report['total_seconds']}s → {out}")
+
+
+if __name__ == "__main__":
+    main()
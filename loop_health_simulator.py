@@ -10,6 +10,8 @@ from tqdm.asyncio import tqdm
 from src.data.loader import data_loader
 from src.core.persona_hydrator import persona_hydrator
 from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
+from src.utils.creative_analysis import analyze_image
 from src.utils.schemas import RawPersona, EnrichedPersona
 from src.utils.config import DATA_DIR
 from pydantic import BaseModel, Field
@@ -526,17 +528,9 @@ Return as JSON:
 """
         
         try:
-            # Load image
-            with open(view.image_path, 'rb') as f:
-                image_data = f.read()
-            
-            response = await gemini_client.generate_pro(prompt, image_data)
-            
-            if not response or response.strip() == "":
-                raise ValueError("Empty response from API")
-            
-            # Parse the JSON response
-            parsed = gemini_client.parse_json_response(response)
+            # Cached by image hash + prompt, so unchanged screens are analyzed once across runs
+            with llm_caller("screen_analysis"):
+                parsed = dict(await analyze_image(view.image_path, prompt))
             
             # Ensure all required keys exist
             required_keys = ["main_content", "key_information", "required_action", "design_quality", "friction_points"]
@@ -703,10 +697,11 @@ Potential Issues: {view_analysis.get('friction_points', 'Unknown')}
             )
             
             try:
-                response = await gemini_client.generate_flash(
-                    prompt=prompt,
-                    system_prompt=self.FLOW_SIMULATION_SYSTEM_PROMPT
-                )
+                with llm_caller("flow_step"):
+                    response = await gemini_client.generate_flash(
+                        prompt=prompt,
+                        system_prompt=self.FLOW_SIMULATION_SYSTEM_PROMPT
+                    )
                 decision_data = gemini_client.parse_json_response(response)
                 
                 decision = PersonaFlowDecision(
@@ -12,6 +12,8 @@ import random
 from src.data.loader import data_loader
 from src.core.persona_hydrator import persona_hydrator
 from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
+from src.utils.creative_analysis import analyze_image
 from src.utils.schemas import RawPersona, EnrichedPersona
 from src.utils.config import DATA_DIR
 from pydantic import BaseModel, Field
@@ -1562,9 +1564,6 @@ Be authentic to YOUR profile. Different personas make different decisions!
     async def analyze_view_with_interventions(self, view: FlowView) -> Dict[str, str]:
         """Analyze view and optionally add interventions."""
         try:
-            with open(view.image_path, 'rb') as f:
-                image_data = f.read()
-            
             prompt = f"""Analyze this health insurance onboarding screen (View {view.view_number}/8).
 
 Describe what you see:
@@ -1585,8 +1584,9 @@ Return ONLY valid JSON (no newlines in strings):
     "friction_points": "potential issues"
 }}
 """
-            response = await gemini_client.generate_pro(prompt, image_data)
-            return gemini_client.parse_json_response(response)
+            # Cached by image hash + prompt, so unchanged screens are analyzed once across runs
+            with llm_caller("screen_analysis"):
+                return await analyze_image(view.image_path, prompt)
             
         except Exception as e:
             print(f"⚠️ Error analyzing view {view.view_id}: {e}")
@@ -1811,10 +1811,11 @@ Potential Issues: {analysis.get('friction_points', 'None')}"""
             prompt = self.ENHANCED_DECISION_PROMPT.format(**context)
             
             try:
-                response = await gemini_client.generate_flash(
-                    prompt=prompt,
-                    system_prompt=self.ENHANCED_SYSTEM_PROMPT
-                )
+                with llm_caller("flow_step"):
+                    response = await gemini_client.generate_flash(
+                        prompt=prompt,
+                        system_prompt=self.ENHANCED_SYSTEM_PROMPT
+                    )
                 decision_data = gemini_client.parse_json_response(response)
                 
                 decision = EnhancedFlowDecision(
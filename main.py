@@ -1,5 +1,6 @@
 """Main orchestrator - End-to-end simulation pipeline."""
 
+import argparse
 import asyncio
 import shutil
 import time
@@ -13,6 +14,8 @@ from src.core.persona_hydrator import persona_hydrator
 from src.core.simulation_engine import simulation_engine, Ad
 from src.core.validator import validator
 from src.core.optimizer import optimizer
+from src.core.run_journal import RunJournal, load_prior_run, new_run_id
+from src.utils.schemas import EnrichedPersona
 from src.utils.config import DATA_DIR
 from src.utils.report_generator import (
     generate_persona_comparison_report,
@@ -26,21 +29,8 @@ from src.utils.ad_copy_extractor import extract_copy_for_all_ads
 class AprioriOrchestrator:
     """Coordinates the full simulation pipeline."""
     
-    async def run_full_simulation(
-        self,
-        ads: List[Ad],
-        num_personas: int = 10,
-        output_path: str = None,
-        target_segment: str = "exporters_freelancers_smes"
-    ) -> dict:
-        """Execute the complete simulation workflow."""
-        
-        print("\n" + "="*80)
-        print("🚀 APRIORI AD-PORTFOLIO SIMULATOR v2.0")
-        print("="*80)
-        
-        start_time = time.time()
-        
+    async def _prepare_personas(self, num_personas: int, target_segment: str) -> List[EnrichedPersona]:
+        """Steps 1-2: load the persona sample and hydrate it."""
         # STEP 1: Load Personas
         print("\n📚 STEP 1: Loading Persona Dataset...")
         personas_file_env = os.getenv("PERSONAS_FILE")
@@ -104,6 +94,41 @@ class AprioriOrchestrator:
             print(f"   ⚠️  Scam Vulnerability: {ep.scam_vulnerability} | Risk Tolerance: {ep.financial_risk_tolerance}")
             print()
         
+        return enriched_personas
+    
+    async def run_full_simulation(
+        self,
+        ads: List[Ad],
+        num_personas: int = 10,
+        output_path: str = None,
+        target_segment: str = "exporters_freelancers_smes",
+        run_id: str = None,
+        prior_run_id: str = None
+    ) -> dict:
+        """Execute the complete simulation workflow.
+
+        With run_id, completed reactions are checkpointed under RUN_JOURNAL_DIR/<run_id>;
+        calling again with the same run_id resumes and only simulates what is missing.
+        prior_run_id: an earlier run whose reactions guide the "uncertainty" / "neyman"
+        Tier 1 assignment (TIER_ASSIGNMENT_STRATEGY).
+        """
+        
+        print("\n" + "="*80)
+        print("🚀 APRIORI AD-PORTFOLIO SIMULATOR v2.0")
+        print("="*80)
+        
+        start_time = time.time()
+        
+        # Resumable runs: reuse the personas and completed reactions of an earlier attempt
+        journal = RunJournal(run_id) if run_id else None
+        enriched_personas = journal.load_personas(EnrichedPersona) if journal else None
+        if enriched_personas:
+            print(f"\n♻️  Resuming run {run_id}: reusing {len(enriched_personas)} personas from the journal")
+        else:
+            enriched_personas = await self._prepare_personas(num_personas, target_segment)
+            if journal:
+                journal.save_personas(enriched_personas)
+        
         # STEP 3: Run Tiered Simulation
         print("\n🎬 STEP 3: Running Tiered Simulation (Pro + Flash)...")
         print(f"   - {len(ads)} ad creatives")
@@ -115,7 +140,18 @@ class AprioriOrchestrator:
             if ad.image_path:
                 print(f"        Image: {ad.image_path}")
         
-        reactions = await simulation_engine.run_simulation(enriched_personas, ads)
+        prior_reactions, prior_personas = load_prior_run(prior_run_id, EnrichedPersona) if prior_run_id else (None, None)
+        if prior_reactions:
+            print(f"   - Prior: {len(prior_reactions)} reactions from run {prior_run_id}")
+        
+        try:
+            reactions = await simulation_engine.run_simulation(
+                enriched_personas, ads, journal=journal,
+                prior_reactions=prior_reactions, prior_personas=prior_personas
+            )
+        finally:
+            if journal:
+                journal.close()
         print(f"\n✅ Generated {len(reactions)} reactions")
         
         # Save raw reactions to file
@@ -237,7 +273,7 @@ class AprioriOrchestrator:
             for ad in ads
         }
         
-        validation_summary = validator.validate_batch(
+        validation_summary, valid_reactions = validator.validate_and_filter(
             enriched_personas,
             reactions,
             ad_contexts
@@ -259,12 +295,7 @@ class AprioriOrchestrator:
                 print(f"      ... and {len(validation_summary['flagged_reactions']) - 5} more")
             print()
         
-        # Filter to valid reactions only
-        valid_reactions = validator.filter_valid_reactions(
-            enriched_personas,
-            reactions,
-            ad_contexts
-        )
+        # Only valid reactions go on to analysis
         print(f"✅ Using {len(valid_reactions)} valid reactions for analysis")
         
         # STEP 5: Optimize Portfolio
@@ -272,7 +303,8 @@ class AprioriOrchestrator:
         optimization_result = optimizer.optimize_portfolio(
             valid_reactions,
             enriched_personas,
-            max_ads=len(ads)  # Allow all ads
+            max_ads=len(ads),  # Allow all ads
+            cluster_weights=(simulation_engine.last_sampling_report or {}).get("cluster_weights")
         )
         print(f"\n✅ Portfolio optimized")
         
@@ -463,7 +495,7 @@ class AprioriOrchestrator:
 orchestrator = AprioriOrchestrator()
 
 
-async def main():
+async def main(run_id: str = None, prior_run_id: str = None):
     """Main execution with user's ad creatives."""
     
     # Load ad creatives from ads folder
@@ -506,12 +538,16 @@ async def main():
     
     # Run simulation
     output_path = DATA_DIR / "simulation_report.json"
+    run_id = run_id or new_run_id()
+    print(f"\n🧾 Run id: {run_id} (resume with: python main.py --resume {run_id})")
     
     result = await orchestrator.run_full_simulation(
         ads=sample_ads,
         num_personas=NUM_PERSONAS,
         output_path=str(output_path),
-        target_segment="exporters_freelancers_smes"
+        target_segment="exporters_freelancers_smes",
+        run_id=run_id,
+        prior_run_id=prior_run_id
     )
     
     # Copy outputs to dashboard public data for UI
@@ -528,4 +564,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Apriori ad-portfolio simulation")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted run from its journal")
+    parser.add_argument("--prior-run", metavar="RUN_ID",
+                        help="Earlier run whose reactions guide the uncertainty / neyman Tier 1 split")
+    cli_args = parser.parse_args()
+    asyncio.run(main(run_id=cli_args.resume, prior_run_id=cli_args.prior_run))
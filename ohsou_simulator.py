@@ -374,7 +374,7 @@ async def main():
         for ad in sample_ads
     }
     
-    validation_summary = validator.validate_batch(
+    validation_summary, valid_reactions = validator.validate_and_filter(
         enriched_personas,
         reactions,
         ad_contexts
@@ -385,12 +385,7 @@ async def main():
     print(f"      - Valid: {validation_summary['valid']}")
     print(f"      - Flagged: {validation_summary['flagged']} ({validation_summary['flagged_percentage']:.1f}%)")
     
-    # Filter to valid reactions only
-    valid_reactions = validator.filter_valid_reactions(
-        enriched_personas,
-        reactions,
-        ad_contexts
-    )
+    # Only valid reactions go on to analysis
     print(f"✅ Using {len(valid_reactions)} valid reactions for analysis")
     
     # STEP 5: Optimize Portfolio
@@ -398,7 +393,8 @@ async def main():
     optimization_result = optimizer.optimize_portfolio(
         valid_reactions,
         enriched_personas,
-        max_ads=len(sample_ads)
+        max_ads=len(sample_ads),
+        cluster_weights=(d2c_simulation_engine.last_sampling_report or {}).get("cluster_weights")
     )
     print(f"\n✅ Portfolio optimized")
     
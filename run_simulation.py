@@ -6,6 +6,7 @@ Usage:
   python run_simulation.py --company ohsou --mode ad
   python run_simulation.py --company loop_health --mode flow
   python run_simulation.py --company loop_health --mode flow --flows-dir product_flow
+  python run_simulation.py --company ohsou --mode ad --resume <run_id>   # continue an interrupted run
 
 Company plugins define: target users, assets (ads/flows), domain context.
 Core simulation engine: abstract, shared between both use cases.
@@ -18,16 +19,20 @@ import shutil
 import time
 from pathlib import Path
 
+from src.api.llm_telemetry import llm_telemetry
 from src.companies.base import SimulationMode
 from src.companies.loop_health import LoopHealthPlugin
 from src.companies.ohsou import OhsouPlugin
 from src.companies.blink_money import BlinkMoneyPlugin
 from src.core.ad_simulator import AdSimulator
-from src.core.flow_simulator import FlowSimulator, journey_result_to_dict
+from src.core.base import FlowJourneyResult, FlowStepDecision
+from src.core.flow_simulator import FlowSimulator, is_error_journey, journey_result_to_dict
 from src.core.flow_analyzer import compare_flows
-from src.utils.config import DATA_DIR
+from src.utils.config import DATA_DIR, FLOW_CONCURRENT_FLOWS
 from src.core.validator import validator
 from src.core.optimizer import optimizer
+from src.core.run_journal import RunJournal, load_prior_run, new_run_id
+from src.utils.schemas import EnrichedPersona
 from src.utils.report_generator import (
     generate_persona_comparison_report,
     generate_ad_comparison_report,
@@ -60,9 +65,14 @@ async def run_ad_simulation(plugin, args):
     
     start = time.time()
     
-    # Load
+    journal = RunJournal(args.run_id)
+    
+    # Load (a resumed run reuses the personas of its first attempt)
     print("\n📚 Loading personas...")
-    personas = await plugin.load_personas(count=args.num_personas)
+    personas = journal.load_personas(EnrichedPersona)
+    if personas is None:
+        personas = await plugin.load_personas(count=args.num_personas)
+        journal.save_personas(personas)
     print(f"   ✅ {len(personas)} personas")
     
     print("\n📸 Loading ads...")
@@ -70,10 +80,20 @@ async def run_ad_simulation(plugin, args):
     ads = await plugin.load_ads(ads_dir=ads_dir)
     print(f"   ✅ {len(ads)} ad creatives")
     
+    prior_reactions, prior_personas = None, None
+    if args.prior_run:
+        prior_reactions, prior_personas = load_prior_run(args.prior_run, EnrichedPersona)
+        print(f"   ✅ {len(prior_reactions)} prior reactions from run {args.prior_run}")
+    
     # Simulate
     print("\n🎬 Running simulation...")
     ad_sim = AdSimulator(product_category=plugin.config.product_category)
-    result = await ad_sim.run(personas, ads)
+    try:
+        result = await ad_sim.run(
+            personas, ads, journal=journal, prior_reactions=prior_reactions, prior_personas=prior_personas
+        )
+    finally:
+        journal.close()
     reactions = result.reactions
     
     # Validate
@@ -82,14 +102,14 @@ async def run_ad_simulation(plugin, args):
         ad.ad_id: {"copy": ad.copy, "description": ad.description, "scam_indicators": "Unknown"}
         for ad in ads
     }
-    validation = validator.validate_batch(personas, reactions, ad_contexts)
-    valid_reactions = validator.filter_valid_reactions(personas, reactions, ad_contexts)
+    validation, valid_reactions = validator.validate_and_filter(personas, reactions, ad_contexts)
     print(f"   ✅ {len(valid_reactions)}/{len(reactions)} valid")
     
     # Optimize
     print("\n📊 Optimizing portfolio...")
     optimization = optimizer.optimize_portfolio(
-        valid_reactions, personas, max_ads=len(ads)
+        valid_reactions, personas, max_ads=len(ads),
+        cluster_weights=(result.sampling or {}).get("cluster_weights")
     )
     
     # Save outputs
@@ -112,7 +132,8 @@ async def run_ad_simulation(plugin, args):
             "company": plugin.config.company_id,
             "num_personas": len(personas),
             "num_ads": len(ads),
-            "execution_time_seconds": round(time.time() - start, 2)
+            "execution_time_seconds": round(time.time() - start, 2),
+            "llm_usage": llm_telemetry.usage.summary(),
         }
     }
     report_path = out_dir / "simulation_report.json"
@@ -132,6 +153,38 @@ async def run_ad_simulation(plugin, args):
     return report
 
 
+def _legacy_journey(journey, flow_id: str) -> FlowJourneyResult:
+    """Loop Health v2 journey as a FlowJourneyResult (journal / report format)."""
+    return FlowJourneyResult(
+        persona_uuid=journey.persona_uuid,
+        flow_id=flow_id,
+        total_screens_seen=journey.total_views_seen,
+        completed_flow=journey.completed_flow,
+        dropped_off_at_view=journey.dropped_off_at_view,
+        drop_off_reason=journey.drop_off_reason,
+        total_time_seconds=journey.total_time_seconds,
+        decisions=[
+            FlowStepDecision(
+                persona_uuid=journey.persona_uuid,
+                flow_id=flow_id,
+                view_id=d.view_id,
+                view_number=d.view_number,
+                step_type=d.step_type,
+                decision=d.decision,
+                reasoning=d.reasoning,
+                drop_off_reason=journey.drop_off_reason if d.decision == "DROP_OFF" else None,
+                trust_score=d.trust_score,
+                clarity_score=d.clarity_score,
+                value_perception_score=d.value_perception_score,
+                emotional_state=d.emotional_state,
+                friction_points=list(d.friction_points),
+                time_spent_seconds=d.time_spent_seconds,
+            )
+            for d in journey.decisions
+        ],
+    )
+
+
 async def run_flow_simulation(plugin, args):
     """Run flow simulation: load personas, flows, simulate each, compare, report."""
     print("\n" + "=" * 80)
@@ -159,62 +212,72 @@ async def run_flow_simulation(plugin, args):
     # Priority 1: Company plugin exposes its own specialized simulator (e.g. BlinkMoney, Loop Health)
     # Priority 2: Generic FlowSimulator
     flow_results: Dict[str, list] = {}
+    journal = RunJournal(args.run_id)
+    try:
+        if hasattr(plugin, "get_flow_simulator"):
+            sim = plugin.get_flow_simulator()
+        
+            async def _run_plugin_flow(flow):
+                # Plugin simulators know nothing about the journal: only pass personas still missing
+                done = journal.completed_journeys(flow.flow_id)
+                pending = [p for p in personas if p.uuid not in done]
+                fresh = await sim.run_flow(pending, flow) if pending else []
+                for j in fresh:
+                    if not is_error_journey(j):
+                        journal.record_journey(j)
+                by_persona = {**done, **{j.persona_uuid: j for j in fresh}}
+                return [by_persona[p.uuid] for p in personas if p.uuid in by_persona]
+        
+            # All flows at once (FLOW_CONCURRENT_FLOWS): comparing K flows takes about as long as the slowest
+            if FLOW_CONCURRENT_FLOWS:
+                per_flow = await asyncio.gather(*[_run_plugin_flow(flow) for flow in flows])
+            else:
+                per_flow = [await _run_plugin_flow(flow) for flow in flows]
+            for flow, journeys in zip(flows, per_flow):
+                flow_results[flow.flow_id] = [journey_result_to_dict(j) for j in journeys]
 
-    if hasattr(plugin, "get_flow_simulator"):
-        sim = plugin.get_flow_simulator()
-        for flow in flows:
-            journeys = await sim.run_flow(personas, flow)
-            flow_results[flow.flow_id] = [journey_result_to_dict(j) for j in journeys]
-
-    elif hasattr(plugin, "get_enhanced_flow_simulator"):
-        # Loop Health legacy path
-        enh_sim = plugin.get_enhanced_flow_simulator()
-        for flow in flows:
+        elif hasattr(plugin, "get_enhanced_flow_simulator"):
+            # Loop Health legacy path
             from loop_health_simulator_v2 import FlowView
-            views = [
-                FlowView(
-                    view_id=s.view_id, view_number=s.view_number,
-                    view_name=s.view_name, image_path=s.image_path,
-                    description=s.description,
-                    intervention_applied=s.intervention_applied
-                )
-                for s in flow.screens
-            ]
-            view_analyses_list = await asyncio.gather(
-                *[enh_sim.analyze_view_with_interventions(v) for v in views]
-            )
-            view_analyses = {views[i].view_id: view_analyses_list[i] for i in range(len(views))}
-            journeys = await asyncio.gather(
-                *[enh_sim.simulate_enhanced_journey(p, views, view_analyses) for p in personas]
-            )
-            flow_results[flow.flow_id] = [
-                {
-                    "persona_uuid": j.persona_uuid, "flow_id": flow.flow_id,
-                    "completed_flow": j.completed_flow,
-                    "dropped_off_at_view": j.dropped_off_at_view,
-                    "drop_off_reason": j.drop_off_reason,
-                    "total_screens_seen": j.total_views_seen,
-                    "total_time_seconds": j.total_time_seconds,
-                    "decisions": [
-                        {
-                            "view_id": d.view_id if hasattr(d, "view_id") else f"view_{d.view_number}",
-                            "view_number": d.view_number, "decision": d.decision,
-                            "reasoning": d.reasoning,
-                            "drop_off_reason": j.drop_off_reason if d.decision == "DROP_OFF" else None,
-                        }
-                        for d in j.decisions
-                    ],
-                    "metadata": {}
-                }
-                for j in journeys
-            ]
-    else:
-        flow_sim = FlowSimulator()
-        raw = await flow_sim.run_multiple_flows(personas, flows)
-        flow_results = {
-            fid: [journey_result_to_dict(r) for r in results]
-            for fid, results in raw.items()
-        }
+            enh_sim = plugin.get_enhanced_flow_simulator()
+            for flow in flows:
+                done = journal.completed_journeys(flow.flow_id)
+                pending = [p for p in personas if p.uuid not in done]
+                fresh = []
+                if pending:
+                    views = [
+                        FlowView(
+                            view_id=s.view_id, view_number=s.view_number,
+                            view_name=s.view_name, image_path=s.image_path,
+                            description=s.description,
+                            intervention_applied=s.intervention_applied
+                        )
+                        for s in flow.screens
+                    ]
+                    view_analyses_list = await asyncio.gather(
+                        *[enh_sim.analyze_view_with_interventions(v) for v in views]
+                    )
+                    view_analyses = {views[i].view_id: view_analyses_list[i] for i in range(len(views))}
+                    journeys = await asyncio.gather(
+                        *[enh_sim.simulate_enhanced_journey(p, views, view_analyses) for p in pending]
+                    )
+                    fresh = [_legacy_journey(j, flow.flow_id) for j in journeys]
+                    for j in fresh:
+                        if not is_error_journey(j):
+                            journal.record_journey(j)
+                by_persona = {**done, **{j.persona_uuid: j for j in fresh}}
+                flow_results[flow.flow_id] = [
+                    journey_result_to_dict(by_persona[p.uuid]) for p in personas if p.uuid in by_persona
+                ]
+        else:
+            flow_sim = FlowSimulator()
+            raw = await flow_sim.run_multiple_flows(personas, flows, journal=journal)
+            flow_results = {
+                fid: [journey_result_to_dict(r) for r in results]
+                for fid, results in raw.items()
+            }
+    finally:
+        journal.close()
 
     # -- Analyze & compare --
     print("\n  Analyzing and comparing flows...")
@@ -263,6 +326,7 @@ async def run_flow_simulation(plugin, args):
             "num_personas": len(personas),
             "num_flows": len(flows),
             "execution_time_seconds": round(time.time() - start, 2),
+            "llm_usage": llm_telemetry.usage.summary(),
         },
     }
     with open(out_dir / "flow_comparison_report.json", "w") as f:
@@ -410,8 +474,14 @@ def main():
     parser.add_argument("--flows-dir", type=str, help="Flows directory (flow mode)")
     parser.add_argument("--flow-dirs", type=str, nargs="+",
                         help="Multiple flow directories for comparison")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume an interrupted run: completed reactions / journeys are reused")
+    parser.add_argument("--prior-run", metavar="RUN_ID",
+                        help="Ad mode: earlier run whose reactions guide the uncertainty / neyman Tier 1 split")
     
     args = parser.parse_args()
+    args.run_id = args.resume or new_run_id(f"{args.company}_{args.mode}")
+    print(f"🧾 Run id: {args.run_id} (resume with --resume {args.run_id})")
     
     plugin = get_plugin(args.company)
     
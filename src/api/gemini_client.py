@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from typing import List, Optional, Dict, Any
 from tenacity import retry, stop_after_attempt, wait_exponential
 from openai import AsyncOpenAI
@@ -21,8 +22,28 @@ from src.utils.config import (
     GEMINI_PRO_MODEL,
     GEMINI_FLASH_MODEL,
     GENERATION_CONFIG,
-    MAX_CONCURRENT_REQUESTS
+    MAX_CONCURRENT_REQUESTS,
+    PRO_MAX_CONCURRENCY,
+    FLASH_MAX_CONCURRENCY,
+    PRO_LATENCY_TARGET_SECONDS,
+    FLASH_LATENCY_TARGET_SECONDS,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    PROMPT_CACHE_ENABLED,
+    PROMPT_CACHE_MODELS,
+    PROMPT_CACHE_MIN_CHARS,
+    OPENROUTER_USAGE_ACCOUNTING,
 )
+from src.api.llm_cache import LLMResponseCache, make_cache_key
+from src.api.llm_telemetry import LLMCall, current_attempt, current_caller, llm_telemetry, set_attempt
+from src.api.rate_limiter import AdaptiveConcurrencyLimiter
+
+
+def _note_attempt(retry_state) -> None:
+    """tenacity hook: expose the attempt number to the call's telemetry record."""
+    set_attempt(retry_state.attempt_number)
 
 
 class GeminiClient:
@@ -47,9 +68,136 @@ class GeminiClient:
             "X-Title": "Apriori Ad Simulator"
         }
         
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Separate adaptive pools so Pro throttling does not starve Flash (and vice versa)
+        self.limiters = {
+            "pro": AdaptiveConcurrencyLimiter(
+                "pro",
+                initial_limit=MAX_CONCURRENT_REQUESTS,
+                max_limit=PRO_MAX_CONCURRENCY,
+                latency_target_seconds=PRO_LATENCY_TARGET_SECONDS,
+            ),
+            "flash": AdaptiveConcurrencyLimiter(
+                "flash",
+                initial_limit=MAX_CONCURRENT_REQUESTS,
+                max_limit=FLASH_MAX_CONCURRENCY,
+                latency_target_seconds=FLASH_LATENCY_TARGET_SECONDS,
+            ),
+        }
+        
+        # Optional on-disk response cache (LLM_CACHE_ENABLED=1)
+        self.cache: Optional[LLMResponseCache] = None
+        if LLM_CACHE_ENABLED:
+            self.cache = LLMResponseCache(
+                LLM_CACHE_PATH,
+                ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+            )
+        
+        # Ask OpenRouter for per-call cost (usage.cost) alongside token counts
+        self.extra_body = {"usage": {"include": True}} if OPENROUTER_USAGE_ACCOUNTING else None
+    
+    def _cache_breakpoint(self, model: str, text: str) -> bool:
+        """Whether to mark text as a provider prompt-cache prefix for this model."""
+        return (
+            PROMPT_CACHE_ENABLED
+            and len(text) >= PROMPT_CACHE_MIN_CHARS
+            and model.startswith(PROMPT_CACHE_MODELS)
+        )
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    def _build_messages(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        image_data: Optional[bytes] = None
+    ) -> List[Dict[str, Any]]:
+        """Chat messages; a long system prompt becomes a cache_control breakpoint (stable prefix)."""
+        messages = []
+        
+        # Add system message if provided (for persona simulation, this sets the role)
+        if system_prompt:
+            if self._cache_breakpoint(model, system_prompt):
+                content: Any = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            else:
+                content = system_prompt
+            messages.append({"role": "system", "content": content})
+        
+        if image_data:
+            # OpenRouter supports image input via base64
+            import base64
+            image_base64 = base64.b64encode(image_data).decode('utf-8')
+            
+            messages.append({
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{image_base64}"
+                        }
+                    }
+                ]
+            })
+        else:
+            messages.append({
+                "role": "user",
+                "content": prompt
+            })
+        return messages
+    
+    @staticmethod
+    def _usage(response: Any) -> Dict[str, Any]:
+        """Token counts (cached = prompt tokens served from the provider's prefix cache) and cost."""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cost = getattr(usage, "cost", None)
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", None) or 0,
+            "cost": float(cost) if isinstance(cost, (int, float)) else None,
+        }
+    
+    def token_stats(self) -> Dict[str, Any]:
+        """Prompt / cached / completion tokens per model tier since start."""
+        keys = ("calls", "prompt_tokens", "cached_tokens", "uncached_tokens", "completion_tokens", "cached_share")
+        return {
+            tier: {k: v for k, v in usage.summary().items() if k in keys}
+            for tier, usage in llm_telemetry.usage.by_tier.items()
+        }
+    
+    def _cache_key(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        image_data: Optional[bytes] = None,
+        max_tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """Content hash of the full request, or None when caching is off."""
+        if self.cache is None:
+            return None
+        return make_cache_key(
+            model=model,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            image_data=image_data,
+            temperature=GENERATION_CONFIG.get("temperature", 0.7),
+            max_tokens=max_tokens or GENERATION_CONFIG.get("max_output_tokens", 2048),
+        )
+    
+    def limiter_stats(self) -> Dict[str, Any]:
+        """Current adaptive concurrency numbers per model tier."""
+        return {tier: limiter.stats() for tier, limiter in self.limiters.items()}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the response cache."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+    
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10), before=_note_attempt)
     async def generate_pro(self, prompt: str, image_data: Optional[bytes] = None, system_prompt: Optional[str] = None) -> str:
         """Generate using Gemini Pro (Tier 1 - High Fidelity) via OpenRouter.
         
@@ -58,39 +206,19 @@ class GeminiClient:
             image_data: Optional image bytes for multimodal input
             system_prompt: Optional system message to set context/role
         """
-        async with self.semaphore:
+        cache_key = self._cache_key(self.pro_model, prompt, system_prompt, image_data)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                _log_llm("CACHE_HIT", "Pro", model=self.pro_model, prompt_len=len(prompt))
+                llm_telemetry.record(LLMCall(model=self.pro_model, tier="pro", caller=current_caller(), cache_hit=True))
+                return cached
+        
+        queued_at = time.perf_counter()
+        async with self.limiters["pro"].slot():
+            started = time.perf_counter()
             try:
-                messages = []
-                
-                # Add system message if provided (for persona simulation, this sets the role)
-                if system_prompt:
-                    messages.append({
-                        "role": "system",
-                        "content": system_prompt
-                    })
-                
-                if image_data:
-                    # OpenRouter supports image input via base64
-                    import base64
-                    image_base64 = base64.b64encode(image_data).decode('utf-8')
-                    
-                    messages.append({
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_base64}"
-                                }
-                            }
-                        ]
-                    })
-                else:
-                    messages.append({
-                        "role": "user",
-                        "content": prompt
-                    })
+                messages = self._build_messages(self.pro_model, prompt, system_prompt, image_data)
                 
                 _log_llm("REQUEST", "Pro", model=self.pro_model, prompt_len=len(prompt), has_image=bool(image_data))
                 response = await self.client.chat.completions.create(
@@ -98,15 +226,30 @@ class GeminiClient:
                     messages=messages,
                     temperature=GENERATION_CONFIG.get("temperature", 0.7),
                     max_tokens=GENERATION_CONFIG.get("max_output_tokens", 2048),
-                    extra_headers=self.extra_headers
+                    extra_headers=self.extra_headers,
+                    extra_body=self.extra_body
                 )
                 
                 content = response.choices[0].message.content
-                _log_llm("RESPONSE", "Pro", model=self.pro_model, response_len=len(content or ""))
+                call = LLMCall(
+                    model=self.pro_model, tier="pro", caller=current_caller(), attempt=current_attempt(),
+                    latency_seconds=time.perf_counter() - started, wait_seconds=started - queued_at,
+                    **self._usage(response)
+                )
+                llm_telemetry.record(call)
+                _log_llm("RESPONSE", "Pro", model=self.pro_model, caller=call.caller, response_len=len(content or ""),
+                         latency=f"{call.latency_seconds:.2f}s", prompt_tokens=call.prompt_tokens,
+                         cached_tokens=call.cached_tokens, completion_tokens=call.completion_tokens)
+                if cache_key and content:
+                    self.cache.set(cache_key, self.pro_model, content)
                 return content
                 
             except Exception as e:
                 error_msg = str(e)
+                llm_telemetry.record(LLMCall(
+                    model=self.pro_model, tier="pro", caller=current_caller(), attempt=current_attempt(),
+                    latency_seconds=time.perf_counter() - started, wait_seconds=started - queued_at, error=True
+                ))
                 _log_llm("ERROR", "Pro", model=self.pro_model, error=error_msg)
                 if hasattr(e, "response") and e.response is not None:
                     try:
@@ -116,47 +259,61 @@ class GeminiClient:
                         pass
                 if "model" in error_msg.lower() or "401" in error_msg:
                     _log_llm("ERROR", "Pro hint", hint="Check OPENROUTER_API_KEY and model availability on OpenRouter.ai")
-                raise RuntimeError(f"OpenRouter API error (Pro): {error_msg}")
+                raise RuntimeError(f"OpenRouter API error (Pro): {error_msg}") from e
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
-    async def generate_flash(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10), before=_note_attempt)
+    async def generate_flash(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: Optional[int] = None) -> str:
         """Generate using Gemini Flash (Tier 2 - High Throughput) via OpenRouter.
         
         Args:
             prompt: The user message/task
             system_prompt: Optional system message to set context/role
+            max_tokens: Optional output budget override (e.g. for batched multi-reaction prompts)
         """
-        async with self.semaphore:
+        cache_key = self._cache_key(self.flash_model, prompt, system_prompt, max_tokens=max_tokens)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                _log_llm("CACHE_HIT", "Flash", model=self.flash_model, prompt_len=len(prompt))
+                llm_telemetry.record(LLMCall(model=self.flash_model, tier="flash", caller=current_caller(), cache_hit=True))
+                return cached
+        
+        queued_at = time.perf_counter()
+        async with self.limiters["flash"].slot():
+            started = time.perf_counter()
             try:
-                messages = []
-                
-                # Add system message if provided (for persona simulation, this sets the role)
-                if system_prompt:
-                    messages.append({
-                        "role": "system",
-                        "content": system_prompt
-                    })
-                
-                messages.append({
-                    "role": "user",
-                    "content": prompt
-                })
+                messages = self._build_messages(self.flash_model, prompt, system_prompt)
                 
                 _log_llm("REQUEST", "Flash", model=self.flash_model, prompt_len=len(prompt))
                 response = await self.client.chat.completions.create(
                     model=self.flash_model,
                     messages=messages,
                     temperature=GENERATION_CONFIG.get("temperature", 0.7),
-                    max_tokens=GENERATION_CONFIG.get("max_output_tokens", 2048),
-                    extra_headers=self.extra_headers
+                    max_tokens=max_tokens or GENERATION_CONFIG.get("max_output_tokens", 2048),
+                    extra_headers=self.extra_headers,
+                    extra_body=self.extra_body
                 )
                 
                 content = response.choices[0].message.content
-                _log_llm("RESPONSE", "Flash", model=self.flash_model, response_len=len(content or ""))
+                call = LLMCall(
+                    model=self.flash_model, tier="flash", caller=current_caller(), attempt=current_attempt(),
+                    latency_seconds=time.perf_counter() - started, wait_seconds=started - queued_at,
+                    **self._usage(response)
+                )
+                llm_telemetry.record(call)
+                _log_llm("RESPONSE", "Flash", model=self.flash_model, caller=call.caller, response_len=len(content or ""),
+                         latency=f"{call.latency_seconds:.2f}s", prompt_tokens=call.prompt_tokens,
+                         cached_tokens=call.cached_tokens, completion_tokens=call.completion_tokens)
+                if cache_key and content:
+                    self.cache.set(cache_key, self.flash_model, content)
                 return content
                 
             except Exception as e:
                 error_msg = str(e)
+                llm_telemetry.record(LLMCall(
+                    model=self.flash_model, tier="flash", caller=current_caller(), attempt=current_attempt(),
+                    latency_seconds=time.perf_counter() - started, wait_seconds=started - queued_at, error=True
+                ))
                 _log_llm("ERROR", "Flash", model=self.flash_model, error=error_msg)
                 if hasattr(e, "response") and e.response is not None:
                     try:
@@ -164,7 +321,7 @@ class GeminiClient:
                         _log_llm("ERROR", "Flash response body", body_preview=(body[:500] if body else ""))
                     except Exception:
                         pass
-                raise RuntimeError(f"OpenRouter API error (Flash): {error_msg}")
+                raise RuntimeError(f"OpenRouter API error (Flash): {error_msg}") from e
     
     async def batch_generate_flash(self, prompts: List[str]) -> List[str]:
         """Batch generate using Flash for high throughput."""
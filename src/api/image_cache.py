@@ -0,0 +1,276 @@
+"""Shared HTTP client and content-addressed cache for downloaded images.
+
+Ad creatives and flow screens are fetched from Firebase Storage / public URLs
+on every simulation. Instead of a fresh httpx.AsyncClient per URL, one pooled
+client is shared for the whole process (HTTP/2 when the `h2` package is
+installed), and each download is stored once under its SHA-256:
+
+  <IMAGE_CACHE_DIR>/blobs/<sha256><ext>   image bytes (deduplicated across URLs)
+  <IMAGE_CACHE_DIR>/index.sqlite          url → sha256, ETag / Last-Modified, size
+
+A URL validated within IMAGE_CACHE_REVALIDATE_SECONDS is served from disk without
+any request; older entries are revalidated with If-None-Match / If-Modified-Since
+so an unchanged asset costs a 304 instead of a full download. Total blob size
+is capped at IMAGE_CACHE_MAX_BYTES with least-recently-used eviction.
+"""
+
+import asyncio
+import hashlib
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.utils.config import (
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_ENABLED,
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_CACHE_REVALIDATE_SECONDS,
+    IMAGE_DOWNLOAD_CONCURRENCY,
+    IMAGE_DOWNLOAD_TIMEOUT_SECONDS,
+)
+
+
+def _log_images(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for image downloads / cache."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[IMAGE_CACHE] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+# ---------------------------------------------------------------------------
+# Application-scoped HTTP client
+# ---------------------------------------------------------------------------
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=IMAGE_DOWNLOAD_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=IMAGE_DOWNLOAD_CONCURRENCY,
+                max_keepalive_connections=IMAGE_DOWNLOAD_CONCURRENCY,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed image cache
+# ---------------------------------------------------------------------------
+
+class ImageCache:
+    """URL-indexed, SHA-256-addressed image store with a total size cap."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path = IMAGE_CACHE_DIR,
+        max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+        revalidate_seconds: int = IMAGE_CACHE_REVALIDATE_SECONDS,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                validated_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_images_sha256 ON images(sha256)")
+        self._conn.commit()
+
+    def _blob_path(self, sha256: str, ext: str) -> Path:
+        return self.blob_dir / f"{sha256}{ext}"
+
+    def _lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, ext, etag, last_modified, validated_at FROM images WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(("sha256", "ext", "etag", "last_modified", "validated_at"), row))
+        if not self._blob_path(entry["sha256"], entry["ext"]).exists():
+            return None  # blob evicted or removed by hand
+        return entry
+
+    def _touch(self, url: str, validated: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if validated:
+                self._conn.execute(
+                    "UPDATE images SET last_access = ?, validated_at = ? WHERE url = ?", (now, now, url)
+                )
+            else:
+                self._conn.execute("UPDATE images SET last_access = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+
+    def _store(self, url: str, content: bytes, ext: str, etag: Optional[str], last_modified: Optional[str]) -> Path:
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(sha256, ext)
+        if not path.exists():
+            tmp = path.with_suffix(path.suffix + ".part")
+            tmp.write_bytes(content)
+            tmp.replace(path)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images (url, sha256, ext, size, etag, last_modified, validated_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, sha256, ext, len(content), etag, last_modified, now, now),
+            )
+            self._conn.commit()
+        self._evict(keep=sha256)
+        return path
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop least-recently-used blobs until the total size is under max_bytes."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            blobs = self._conn.execute(
+                "SELECT sha256, ext, MAX(size), MAX(last_access) AS la FROM images GROUP BY sha256, ext ORDER BY la ASC"
+            ).fetchall()
+            total = sum(b[2] for b in blobs)
+            for sha256, ext, size, _ in blobs:
+                if total <= self.max_bytes:
+                    break
+                if sha256 == keep:
+                    continue
+                self._blob_path(sha256, ext).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM images WHERE sha256 = ?", (sha256,))
+                total -= size
+                self.evictions += 1
+            self._conn.commit()
+
+    async def fetch(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Path:
+        """Return a local path holding the image at url, downloading only when needed.
+
+        Concurrent requests for the same URL share one download. Raises httpx errors as-is.
+        """
+        pending = self._inflight.get(url)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request that owned the download was cancelled - fetch it ourselves
+                return await self.fetch(url, client)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            path = await self._fetch(url, client or get_http_client())
+            future.set_result(path)
+            return path
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+
+    async def _fetch(self, url: str, client: httpx.AsyncClient) -> Path:
+        entry = self._lookup(url)
+        if entry and time.time() - entry["validated_at"] < self.revalidate_seconds:
+            self.hits += 1
+            self._touch(url)
+            return self._blob_path(entry["sha256"], entry["ext"])
+
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = await client.get(url, headers=headers)
+        if entry and resp.status_code == 304:
+            self.revalidated += 1
+            self._touch(url, validated=True)
+            return self._blob_path(entry["sha256"], entry["ext"])
+        resp.raise_for_status()
+
+        self.downloads += 1
+        ext = Path(url.split("?")[0]).suffix.lower() or ".jpg"
+        return self._store(url, resp.content, ext, resp.headers.get("etag"), resp.headers.get("last-modified"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT sha256, MAX(size) AS size FROM images GROUP BY sha256)"
+            ).fetchone()
+        return {
+            "path": str(self.cache_dir),
+            "blobs": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "downloads": self.downloads,
+            "evictions": self.evictions,
+        }
+
+
+# Global singleton (None when IMAGE_CACHE_ENABLED=0)
+image_cache: Optional[ImageCache] = ImageCache() if IMAGE_CACHE_ENABLED else None
+
+
+def link_or_copy(src: Path, dest: Path) -> Path:
+    """Materialize a cached blob at dest (hard link when possible, else copy)."""
+    try:
+        dest.hardlink_to(src)
+    except OSError:
+        shutil.copyfile(src, dest)
+    return dest
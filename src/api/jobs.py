@@ -0,0 +1,173 @@
+"""In-process registry for asynchronous simulation jobs.
+
+POST /simulations/jobs returns a job id immediately; the pipeline runs as an
+asyncio task in the API process. Jobs record an append-only event log
+(stage changes, partial reactions / journeys,
+live portfolio snapshots) that clients read by polling
+GET /simulations/{id} or streaming GET /simulations/{id}/events (SSE).
+
+At most MAX_CONCURRENT_SIMULATIONS jobs run at once; the rest wait as "queued".
+Finished jobs are kept for SIMULATION_JOB_TTL_SECONDS.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.config import MAX_CONCURRENT_SIMULATIONS, SIMULATION_JOB_TTL_SECONDS
+
+# progress(event, **data): pipeline hook used by the simulation route
+ProgressCallback = Callable[..., None]
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+def _log_jobs(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for the job registry."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[JOBS] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+@dataclass
+class SimulationJob:
+    """One submitted simulation: status, progress counters and event log."""
+
+    job_id: str
+    owner_uid: str
+    kind: str
+    status: str = "queued"  # queued | running | succeeded | failed | cancelled
+    stage: Optional[str] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    portfolio: Optional[Dict[str, Any]] = None  # latest live budget split (ad simulations)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Append an event and wake up stream readers. Used as the pipeline's ProgressCallback."""
+        if event == "stage":
+            self.stage = data.get("stage", self.stage)
+            for key in ("total", "done"):
+                if key in data:
+                    self.progress[f"{self.stage}_{key}"] = data[key]
+        elif event in ("reaction", "journey"):
+            key = f"{event}s_done"
+            self.progress[key] = self.progress.get(key, 0) + 1
+        elif event == "portfolio":
+            self.portfolio = data
+        self.events.append({"seq": len(self.events) + 1, "event": event, "time": time.time(), "data": data})
+        # Swap the event so each waiter sees exactly one wake-up per batch of appends
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def events_after(self, seq: int) -> List[Dict[str, Any]]:
+        return self.events[max(0, seq):]
+
+    async def stream(self, after: int = 0, keepalive_seconds: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield events with seq > after until the job finishes. Yields None as a keep-alive tick."""
+        seq = after
+        while True:
+            pending = self.events_after(seq)
+            for ev in pending:
+                seq = ev["seq"]
+                yield ev
+            if self.done and seq >= len(self.events):
+                return
+            waiter = self._changed
+            if seq < len(self.events):
+                continue
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class SimulationJobManager:
+    """Runs simulation coroutines as background tasks with bounded concurrency."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_SIMULATIONS, ttl_seconds: int = SIMULATION_JOB_TTL_SECONDS):
+        self.max_concurrent = max(1, max_concurrent)
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, SimulationJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the server's running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def submit(
+        self,
+        owner_uid: str,
+        kind: str,
+        runner: Callable[[SimulationJob], Awaitable[Any]],
+    ) -> SimulationJob:
+        """Register a job and schedule runner(job) on the current event loop."""
+        self._prune()
+        job = SimulationJob(job_id=uuid.uuid4().hex, owner_uid=owner_uid, kind=kind)
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, runner))
+        _log_jobs("SUBMIT", "Job queued", job_id=job.job_id, kind=kind, active=self.active_count())
+        return job
+
+    async def _run(self, job: SimulationJob, runner: Callable[[SimulationJob], Awaitable[Any]]) -> None:
+        try:
+            async with self._slots():
+                job.status = "running"
+                job.started_at = time.time()
+                job.emit("status", status="running")
+                _log_jobs("START", "Job running", job_id=job.job_id)
+                job.result = await runner(job)
+            job.status = "succeeded"
+        except Exception as exc:
+            job.status = "failed"
+            # HTTPException carries the user-facing message in .detail
+            job.error = str(getattr(exc, "detail", None) or exc) or type(exc).__name__
+            _log_jobs("FAILED", "Job failed", job_id=job.job_id, error=job.error)
+        except asyncio.CancelledError:
+            # e.g. server shutdown: end the job so status pollers and SSE streams stop waiting
+            job.status = "cancelled"
+            job.error = "Simulation was cancelled"
+            _log_jobs("CANCELLED", "Job cancelled", job_id=job.job_id)
+            raise
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.job_id, None)
+            job.emit("status", status=job.status, error=job.error)
+            if job.status == "succeeded":
+                _log_jobs("DONE", "Job succeeded", job_id=job.job_id,
+                          seconds=round(job.finished_at - (job.started_at or job.created_at), 2))
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        return self._jobs.get(job_id)
+
+    def active_count(self) -> int:
+        return sum(1 for j in self._jobs.values() if not j.done)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention window."""
+        if not self.ttl_seconds:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        expired = [jid for jid, j in self._jobs.items() if j.done and (j.finished_at or 0) < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+
+# Global singleton
+simulation_jobs = SimulationJobManager()
@@ -0,0 +1,148 @@
+"""Content-addressed on-disk cache for LLM responses.
+
+Every request is hashed over (model, system_prompt, prompt, image bytes, temperature,
+max_tokens). Identical requests are served from a local SQLite file instead of
+OpenRouter. Entries expire after a TTL and the store is capped by entry count with
+least-recently-used eviction.
+
+Opt-in: set LLM_CACHE_ENABLED=1 (see src/utils/config.py).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def _log_cache(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for the LLM cache."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[LLM_CACHE] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+def make_cache_key(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    image_data: Optional[bytes] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """SHA-256 over the full request. Image bytes are hashed separately to keep the payload small."""
+    payload = {
+        "model": model,
+        "system_prompt": system_prompt or "",
+        "prompt": prompt,
+        "image_sha256": hashlib.sha256(image_data).hexdigest() if image_data else None,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL, LRU eviction and hit/miss counters."""
+
+    def __init__(self, path: str | Path, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 50_000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response or None. Expired entries are deleted and count as misses."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Store a response and evict least-recently-used entries above max_entries."""
+        if not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            if self.max_entries:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+                overflow = count - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM llm_responses WHERE key IN "
+                        "(SELECT key FROM llm_responses ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop all cached responses (counters are kept)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
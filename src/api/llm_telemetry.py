@@ -0,0 +1,188 @@
+"""Per-call LLM telemetry: tokens, latency, retries, cache hits and cost.
+
+GeminiClient records one LLMCall per request attempt (and per response-cache
+hit). Calls are tagged with the stage that made them via the llm_caller()
+context (tier1, tier2, visual_anchor, hydration, flow_step, screen_analysis,
+monologue, ...); untagged calls count as "other". They are aggregated
+
+  - process-wide, per tier / caller / model (GET /metrics)
+  - per simulation run: every call made inside `with llm_telemetry.run()`,
+    including from tasks started inside it (result.metadata["llm_usage"])
+
+Latency is the provider round trip; wait is time queued for a limiter slot.
+Cost is what the provider reported in usage.cost (OpenRouter usage accounting),
+so it is only summed over calls that reported one.
+"""
+
+import contextvars
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from src.utils.config import LLM_TELEMETRY_LATENCY_SAMPLES
+
+_caller: contextvars.ContextVar[str] = contextvars.ContextVar("llm_caller", default="other")
+_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("llm_attempt", default=1)
+_run: contextvars.ContextVar[Optional["UsageCollector"]] = contextvars.ContextVar("llm_run", default=None)
+
+
+@contextmanager
+def llm_caller(tag: str) -> Iterator[None]:
+    """Tag LLM calls made in this block (and tasks started in it) with a caller name."""
+    token = _caller.set(tag)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def current_caller() -> str:
+    return _caller.get()
+
+
+def set_attempt(attempt: int) -> None:
+    """Attempt number of the current request (set by the client's retry policy)."""
+    _attempt.set(attempt)
+
+
+def current_attempt() -> int:
+    return _attempt.get()
+
+
+@dataclass
+class LLMCall:
+    model: str
+    tier: str
+    caller: str
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    latency_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    attempt: int = 1
+    cache_hit: bool = False
+    error: bool = False
+    cost: Optional[float] = None
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class UsageAggregate:
+    """Running totals of a set of calls (latency percentiles over the last N calls)."""
+
+    def __init__(self, latency_samples: int = LLM_TELEMETRY_LATENCY_SAMPLES):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self.cost = 0.0
+        self.cost_calls = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+
+    def add(self, call: LLMCall) -> None:
+        self.calls += 1
+        self.errors += call.error
+        self.retries += call.attempt > 1
+        self.cache_hits += call.cache_hit
+        self.prompt_tokens += call.prompt_tokens
+        self.cached_tokens += call.cached_tokens
+        self.completion_tokens += call.completion_tokens
+        if call.cost is not None:
+            self.cost += call.cost
+            self.cost_calls += 1
+        if not call.cache_hit:
+            self.latency_seconds += call.latency_seconds
+            self.wait_seconds += call.wait_seconds
+            self.max_latency_seconds = max(self.max_latency_seconds, call.latency_seconds)
+            self._latencies.append(call.latency_seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        requests = self.calls - self.cache_hits
+        latencies = sorted(self._latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "uncached_tokens": self.prompt_tokens - self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_share": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+            "latency_seconds_total": round(self.latency_seconds, 3),
+            "latency_seconds_avg": round(self.latency_seconds / requests, 3) if requests else 0.0,
+            "latency_seconds_p50": round(_percentile(latencies, 0.5), 3),
+            "latency_seconds_p95": round(_percentile(latencies, 0.95), 3),
+            "latency_seconds_max": round(self.max_latency_seconds, 3),
+            "wait_seconds_total": round(self.wait_seconds, 3),
+            "cost": round(self.cost, 6),
+            "cost_reported_calls": self.cost_calls,
+        }
+
+
+class UsageCollector:
+    """Aggregates calls in total and per tier / caller / model."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.total = UsageAggregate()
+        self.by_tier: Dict[str, UsageAggregate] = defaultdict(UsageAggregate)
+        self.by_caller: Dict[str, UsageAggregate] = defaultdict(UsageAggregate)
+        self.by_model: Dict[str, UsageAggregate] = defaultdict(UsageAggregate)
+
+    def record(self, call: LLMCall) -> None:
+        self.total.add(call)
+        self.by_tier[call.tier].add(call)
+        self.by_caller[call.caller].add(call)
+        self.by_model[call.model].add(call)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "since": self.started_at,
+            "total": self.total.summary(),
+            "by_tier": {k: v.summary() for k, v in sorted(self.by_tier.items())},
+            "by_caller": {k: v.summary() for k, v in sorted(self.by_caller.items())},
+            "by_model": {k: v.summary() for k, v in sorted(self.by_model.items())},
+        }
+
+
+class LLMTelemetry:
+    """Process-wide collector plus the collector of the current run, if any."""
+
+    def __init__(self):
+        self.usage = UsageCollector()
+
+    def record(self, call: LLMCall) -> None:
+        self.usage.record(call)
+        run = _run.get()
+        if run is not None:
+            run.record(call)
+
+    @contextmanager
+    def run(self) -> Iterator[UsageCollector]:
+        """Collect the calls of one simulation run (nested runs only see their own calls)."""
+        collector = UsageCollector()
+        token = _run.set(collector)
+        try:
+            yield collector
+        finally:
+            _run.reset(token)
+
+    def reset(self) -> None:
+        self.usage = UsageCollector()
+
+
+# Global singleton
+llm_telemetry = LLMTelemetry()
@@ -47,6 +47,13 @@ class RunSimulationRequest(BaseModel):
         default="general",
         description="Product category context, e.g. 'fintech', 'd2c_fashion', 'healthcare'",
     )
+    monologues: Optional[Literal["eager", "lazy", "off"]] = Field(
+        default=None,
+        description=(
+            "Internal monologues: 'lazy' = generated on GET /simulations/{id}/monologues/{persona_uuid}, "
+            "'eager' = included in the result, 'off' = none. Default: MONOLOGUE_MODE (eager)."
+        ),
+    )
 
     @model_validator(mode="after")
     def require_images_or_local_dir(self):
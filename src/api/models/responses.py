@@ -153,3 +153,36 @@ class SimulationResponse(BaseModel):
     status: str = "success"
     simulation_id: str
     result: Any  # AdSimulationResult | FlowSimulationResult
+
+
+class PersonaMonologuesResponse(BaseModel):
+    """GET /api/v1/simulations/{id}/monologues/{persona_uuid}."""
+    simulation_id: str
+    persona_uuid: str
+    simulation_type: str  # "ad" | "product_flow"
+    monologues: Dict[str, str]  # ad_id / flow_id -> first-person monologue
+
+
+# ---------------------------------------------------------------------------
+# Simulation - async jobs
+# ---------------------------------------------------------------------------
+
+class SimulationJobAccepted(BaseModel):
+    job_id: str
+    status: str  # "queued"
+    status_url: str
+    events_url: str
+
+
+class SimulationJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued | running | succeeded | failed | cancelled
+    stage: Optional[str] = None
+    progress: Dict[str, Any] = {}
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    portfolio: Optional[Dict[str, Any]] = None  # live budget split while an ad simulation runs
+    events: Optional[List[Dict[str, Any]]] = None  # only when ?after=<seq> is given
+    result: Optional[SimulationResponse] = None
@@ -0,0 +1,120 @@
+"""Lazily generated internal monologues for finished simulations.
+
+Monologues cost one Flash call per reaction / journey and feed nothing the
+portfolio or flow insights depend on. In lazy mode the simulation route only
+registers each monologue's prompt here and returns as soon as optimization is
+done; GET /simulations/{id}/monologues/{persona_uuid} generates that persona's
+monologues on first access and caches them. Concurrent requests for the same
+monologue share one call; failed calls return the fallback and are retried
+on the next request.
+
+Entries are kept for SIMULATION_JOB_TTL_SECONDS.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
+from src.utils.config import SIMULATION_JOB_TTL_SECONDS
+
+
+def _log_monologues(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for the monologue store."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[MONOLOGUES] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+async def generate_monologue(prompt: str, fallback: Optional[str] = None) -> str:
+    """One Flash call; on failure the fallback (or an 'unavailable' note)."""
+    try:
+        with llm_caller("monologue"):
+            return await gemini_client.generate_flash(prompt)
+    except Exception as exc:
+        return fallback if fallback is not None else f"[Monologue unavailable: {exc}]"
+
+
+@dataclass
+class MonologueItem:
+    """Prompt of one monologue and, once generated, its text."""
+
+    prompt: str
+    fallback: Optional[str] = None
+    text: Optional[str] = None
+    _pending: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    async def get(self) -> str:
+        if self.text is not None:
+            return self.text
+        if self._pending is None:
+            with llm_caller("monologue"):
+                self._pending = asyncio.ensure_future(gemini_client.generate_flash(self.prompt))
+        pending = self._pending
+        try:
+            self.text = await asyncio.shield(pending)
+            return self.text
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if self._pending is pending:
+                self._pending = None  # retry on the next request
+            return self.fallback if self.fallback is not None else f"[Monologue unavailable: {exc}]"
+
+
+@dataclass
+class SimulationMonologues:
+    """Monologue prompts of one simulation: persona_uuid -> stimulus id (ad_id / flow_id) -> item."""
+
+    simulation_id: str
+    owner_uid: Optional[str]
+    kind: str  # "ad" | "product_flow"
+    items: Dict[str, Dict[str, MonologueItem]] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def add(self, persona_uuid: str, stimulus_id: str, prompt: str, fallback: Optional[str] = None) -> None:
+        self.items.setdefault(persona_uuid, {})[stimulus_id] = MonologueItem(prompt, fallback)
+
+    async def for_persona(self, persona_uuid: str, stimulus_id: Optional[str] = None) -> Dict[str, str]:
+        """stimulus id -> monologue for one persona (generated on first access)."""
+        items = self.items.get(persona_uuid, {})
+        if stimulus_id is not None:
+            items = {stimulus_id: items[stimulus_id]} if stimulus_id in items else {}
+        texts = await asyncio.gather(*(item.get() for item in items.values()))
+        return dict(zip(items.keys(), texts))
+
+
+class MonologueStore:
+    """Registry of lazily generated monologues per simulation id."""
+
+    def __init__(self, ttl_seconds: int = SIMULATION_JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._simulations: Dict[str, SimulationMonologues] = {}
+
+    def register(self, simulation_id: str, owner_uid: Optional[str], kind: str) -> SimulationMonologues:
+        self._prune()
+        entry = SimulationMonologues(simulation_id=simulation_id, owner_uid=owner_uid, kind=kind)
+        self._simulations[simulation_id] = entry
+        return entry
+
+    def get(self, simulation_id: str) -> Optional[SimulationMonologues]:
+        return self._simulations.get(simulation_id)
+
+    def _prune(self) -> None:
+        """Forget simulations older than the retention window."""
+        if not self.ttl_seconds:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        expired = [sid for sid, s in self._simulations.items() if s.created_at < cutoff]
+        for sid in expired:
+            del self._simulations[sid]
+        if expired:
+            _log_monologues("PRUNE", "Dropped expired simulations", count=len(expired))
+
+
+# Global singleton
+monologue_store = MonologueStore()
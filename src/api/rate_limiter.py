@@ -0,0 +1,200 @@
+"""Adaptive (AIMD) concurrency limiter for LLM calls.
+
+Replaces a fixed asyncio.Semaphore. The in-flight limit grows additively while
+requests succeed within the latency target, and shrinks multiplicatively on
+throttling (HTTP 429) or server errors. A Retry-After hint pauses new
+acquisitions for that pool until the deadline passes.
+
+One limiter per model tier (Pro / Flash) so a throttled tier does not starve the other.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+def _log_limiter(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for the limiter."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[LIMITER] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+def classify_error(exc: BaseException) -> tuple[str, Optional[float]]:
+    """Classify an API exception as ("throttle" | "server" | "other", retry_after_seconds).
+
+    Wrapped errors (raise RuntimeError(...) from e) are classified by their cause.
+    """
+    for inner in (exc.__cause__, exc.__context__):
+        if inner is not None:
+            kind, retry_after = _classify_single(inner)
+            if kind != "other":
+                return kind, retry_after
+    return _classify_single(exc)
+
+
+def _classify_single(exc: BaseException) -> tuple[str, Optional[float]]:
+    status_code = getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+
+    retry_after = None
+    headers = getattr(response, "headers", None) if response is not None else None
+    if headers:
+        retry_after = parse_retry_after(headers.get("retry-after"))
+
+    if status_code == 429 or "429" in str(exc) or "rate limit" in str(exc).lower():
+        return "throttle", retry_after
+    if isinstance(status_code, int) and status_code >= 500:
+        return "server", retry_after
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or "timeout" in type(exc).__name__.lower():
+        return "server", retry_after
+    return "other", retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter with Retry-After support and live stats."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_target_seconds: float = 30.0,
+        throttle_decrease: float = 0.5,
+        error_decrease: float = 0.75,
+        decrease_cooldown_seconds: float = 2.0,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_target_seconds = latency_target_seconds
+        self.throttle_decrease = throttle_decrease
+        self.error_decrease = error_decrease
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self._last_decrease = 0.0
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.blocked_until = 0.0
+        self.successes = 0
+        self.throttles = 0
+        self.errors = 0
+        self.ewma_latency: Optional[float] = None
+        self._condition = asyncio.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def _acquire(self) -> None:
+        async with self._condition:
+            self.waiting += 1
+            try:
+                while True:
+                    pause = self.blocked_until - time.monotonic()
+                    if pause > 0:
+                        # Retry-After window: release the lock and sleep it out
+                        self._condition.release()
+                        try:
+                            await asyncio.sleep(pause)
+                        finally:
+                            await self._condition.acquire()
+                        continue
+                    if self.in_flight < self.current_limit:
+                        break
+                    await self._condition.wait()
+                self.in_flight += 1
+            finally:
+                self.waiting -= 1
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot. Outcome is recorded from the exit state:
+        normal exit → success; exception → classified as throttle/server/other."""
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as exc:
+            kind, retry_after = classify_error(exc)
+            if kind == "throttle":
+                self.record_throttle(retry_after)
+            elif kind == "server":
+                self.record_error()
+            raise
+        else:
+            self.record_success(time.monotonic() - started)
+        finally:
+            await self._release()
+
+    def record_success(self, latency: float) -> None:
+        self.successes += 1
+        self.ewma_latency = latency if self.ewma_latency is None else 0.8 * self.ewma_latency + 0.2 * latency
+        if self.ewma_latency <= self.latency_target_seconds:
+            # Additive increase: about +1 slot per window of `limit` healthy completions
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+        else:
+            # Latency above target: the provider is queueing us, shed a little load
+            self.limit = max(self.min_limit, self.limit * 0.95)
+
+    def _decrease(self, factor: float) -> None:
+        # Requests that were already in flight fail together; count one burst as one signal
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown_seconds:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttles += 1
+        old = self.current_limit
+        self._decrease(self.throttle_decrease)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        _log_limiter("THROTTLE", self.name, limit_before=old, limit_after=self.current_limit, retry_after=retry_after)
+
+    def record_error(self) -> None:
+        self.errors += 1
+        self._decrease(self.error_decrease)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "limit": self.current_limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "successes": self.successes,
+            "throttles": self.throttles,
+            "errors": self.errors,
+            "ewma_latency_seconds": round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+        }
@@ -7,6 +7,15 @@ Orchestrates the full simulation pipeline:
 
 Image URLs in the request body are downloaded to a temp directory before simulation.
 After completion the temp directory is cleaned up automatically.
+
+Async variant (long simulations / proxies with short timeouts):
+  POST /api/v1/simulations/jobs           →  202 + job id, pipeline runs in the background
+  GET  /api/v1/simulations/{id}           →  status, stage, progress counters, result when done
+  GET  /api/v1/simulations/{id}/events    →  SSE stream of stage changes, partial reactions and
+                                             live portfolio snapshots (budget split so far)
+
+Internal monologues are part of the result by default; with monologues="lazy" (or MONOLOGUE_MODE):
+  GET  /api/v1/simulations/{id}/monologues/{persona_uuid}  →  generated on first access, then cached
 """
 
 import asyncio
@@ -16,10 +25,11 @@ import time
 import uuid
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from src.api.firebase.client import (
     get_audience_by_id,
@@ -27,6 +37,10 @@ from src.api.firebase.client import (
     get_asset_folder,
     get_user_by_clerk_id,
 )
+from src.api.image_cache import get_http_client, image_cache, link_or_copy
+from src.api.jobs import ProgressCallback, SimulationJob, simulation_jobs
+from src.api.llm_telemetry import llm_telemetry
+from src.api.monologues import SimulationMonologues, generate_monologue, monologue_store
 from src.api.middleware.auth import get_current_user
 from src.api.models.requests import (
     AdPortfolioSimulationRequest,
@@ -40,19 +54,23 @@ from src.api.models.responses import (
     FlowComparisonInsight,
     FlowSimulationResult,
     FlowStepOut,
+    PersonaMonologuesResponse,
     PersonaJourneyOut,
     PersonaSummary,
     PortfolioRecommendationOut,
+    SimulationJobAccepted,
+    SimulationJobStatus,
     SimulationResponse,
 )
 from src.core.ad_simulator import AdSimulator
 from src.core.base import FlowScreen, FlowStimulus
 from src.core.flow_simulator import FlowSimulator, journey_result_to_dict
+from src.core.live_portfolio import LivePortfolio
 from src.core.optimizer import optimizer
 from src.core.persona_hydrator import persona_hydrator
 from src.core.validator import validator
 from src.data.loader import data_loader
-from src.utils.config import BASE_DIR
+from src.utils.config import BASE_DIR, MONOLOGUE_MODE
 
 router = APIRouter(prefix="/simulations", tags=["Simulations"])
 
@@ -89,11 +107,20 @@ def _log_response_before_send(response: SimulationResponse) -> None:
         _log("RESPONSE", "Failed to log response", error=str(e))
 
 
+# Live portfolio snapshots emitted per ad simulation job (spread evenly over its reactions)
+_LIVE_PORTFOLIO_UPDATES = 50
+
+
+def _report(progress: Optional[ProgressCallback], event: str, **data: Any) -> None:
+    """Forward a pipeline event to the async-job progress hook, if any."""
+    if progress is not None:
+        progress(event, **data)
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-_DOWNLOAD_TIMEOUT = 30  # seconds per image
 _IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 
 
@@ -190,13 +217,20 @@ def _resolve_local_image_paths(local_ads_dir: str) -> List[Path]:
 
 
 async def _download_images(urls: List[str], dest_dir: Path) -> List[Path]:
-    """Download all image URLs concurrently into dest_dir. Returns local paths (same order)."""
+    """Download all image URLs concurrently into dest_dir. Returns local paths (same order).
+
+    Uses the shared pooled client; with the image cache enabled, assets seen before are
+    linked from the local content-addressed cache instead of being downloaded again.
+    """
+    client = get_http_client()
+
     async def _fetch(url: str, idx: int) -> Path:
         ext = Path(url.split("?")[0]).suffix or ".jpg"
         local = dest_dir / f"img_{idx:03d}{ext}"
-        async with httpx.AsyncClient(timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
+        if image_cache is not None:
+            return link_or_copy(await image_cache.fetch(url, client), local)
+        resp = await client.get(url)
+        resp.raise_for_status()
         local.write_bytes(resp.content)
         return local
 
@@ -213,6 +247,10 @@ async def _download_images(urls: List[str], dest_dir: Path) -> List[Path]:
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Image download error: {exc}",
         )
+    if image_cache is not None:
+        stats = image_cache.stats()
+        _log("DOWNLOAD", "Image cache", urls=len(urls), hits=stats["hits"],
+             revalidated=stats["revalidated"], downloads=stats["downloads"])
     return list(paths)
 
 
@@ -233,10 +271,8 @@ def _persona_to_summary(persona) -> PersonaSummary:
     )
 
 
-async def _build_ad_reaction_monologue(persona, ad, reaction) -> str:
-    """Generate first-person internal monologue for this persona's reaction to this ad."""
-    from src.api.gemini_client import gemini_client
-
+def _ad_reaction_monologue_prompt(persona, ad, reaction) -> str:
+    """Prompt for a first-person internal monologue of this persona's reaction to this ad."""
     ad_copy_preview = (ad.copy or ad.description or "")[:500]
     prompt = f"""You are {persona.occupation}, {persona.age} years old, {persona.sex}, from {persona.district}, {persona.state} ({persona.zone}).
 Your income is ₹{persona.monthly_income_inr:,}/month. Digital literacy: {persona.digital_literacy}/10. Device: {persona.primary_device}.
@@ -249,11 +285,27 @@ Reasoning: {reaction.reasoning}. Emotional response: {reaction.emotional_respons
 {f"Barriers: {', '.join(reaction.barriers)}" if reaction.barriers else ""}
 
 Write your full internal monologue in first person, as if you are thinking to yourself while looking at this ad. Include your immediate gut reaction, what catches your eye or puts you off, how it fits (or doesn't) your life and budget, and why you would {reaction.action} it. Be specific and in character. Write 3-6 sentences. Return only the monologue text, no labels or quotes."""
+    return prompt
+
+
+MONOLOGUE_MODES = ("eager", "lazy", "off")
+
+
+def _monologue_mode(body) -> str:
+    """eager | lazy | off: request override, else MONOLOGUE_MODE."""
+    mode = getattr(body, "monologues", None) or MONOLOGUE_MODE
+    if mode not in MONOLOGUE_MODES:
+        raise ValueError(f"Unknown monologue mode: {mode}. Use one of {MONOLOGUE_MODES}.")
+    return mode
 
-    try:
-        return await gemini_client.generate_flash(prompt)
-    except Exception as exc:
-        return f"[Monologue unavailable: {exc}]"
+
+def _monologue_metadata(monologues: Optional[SimulationMonologues], mode: str) -> Dict[str, Any]:
+    if monologues is None:
+        return {"monologues": "eager" if mode == "eager" else "off"}
+    return {
+        "monologues": "lazy",
+        "monologues_url": f"/api/v1{router.prefix}/{monologues.simulation_id}/monologues/{{persona_uuid}}",
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -323,18 +375,22 @@ async def _load_and_hydrate_personas(n: int, target_group: str):
 async def _run_ad_simulation(
     body: RunSimulationRequest,
     image_paths: List[Path],
+    progress: Optional[ProgressCallback] = None,
+    monologues: Optional[SimulationMonologues] = None,
 ) -> AdSimulationResult:
     from src.core.simulation_engine import Ad  # local import avoids circular deps
-    from src.utils.ad_copy_extractor import extract_copy_for_all_ads
+    from src.utils.creative_analysis import analyze_creatives
 
-    # Build Ad objects from downloaded images
-    ads_dir = image_paths[0].parent
-    copy_map = await extract_copy_for_all_ads(ads_dir)
+    # Build Ad objects from downloaded images. One combined vision call per image gives
+    # both the copy and the visual anchor (reused by the engine from cache).
+    _report(progress, "stage", stage="creative_analysis", total=len(image_paths))
+    analyses = await analyze_creatives([str(p) for p in image_paths])
 
     ads = []
     for idx, path in enumerate(image_paths, 1):
         ad_id = f"ad_{idx}"
-        extracted_copy = copy_map.get(str(path), "")
+        analysis = analyses.get(str(path))
+        extracted_copy = analysis["ad_copy"] if analysis else ""
         ads.append(
             Ad(
                 ad_id=ad_id,
@@ -346,45 +402,67 @@ async def _run_ad_simulation(
         )
 
     # Load & hydrate personas
+    _report(progress, "stage", stage="persona_hydration", total=body.n)
     personas = await _load_and_hydrate_personas(body.n, body.target_group)
 
     # Run simulation
+    _report(progress, "stage", stage="simulation", total=len(personas) * len(ads))
     sim = AdSimulator(product_category=body.product_category or "general")
-    result = await sim.run(personas, ads)
+    on_reaction = None
+    if progress is not None:
+        live = LivePortfolio(personas, [ad.ad_id for ad in ads])
+        snapshot_every = max(1, len(personas) * len(ads) // _LIVE_PORTFOLIO_UPDATES)
+
+        def on_reaction(r):
+            progress("reaction", **r.model_dump())
+            live.add(r)
+            if live.reactions_seen % snapshot_every == 0:
+                progress("portfolio", **live.snapshot(max_ads=len(ads)))
+
+    result = await sim.run(personas, ads, on_reaction=on_reaction)
     reactions = result.reactions
+    if progress is not None and live.reactions_seen % snapshot_every:
+        progress("portfolio", **live.snapshot(max_ads=len(ads)))
 
     # Validate
+    _report(progress, "stage", stage="validation", total=len(reactions))
     ad_contexts = {
         ad.ad_id: {"copy": ad.copy, "description": ad.description, "scam_indicators": "Unknown"}
         for ad in ads
     }
-    validation = validator.validate_batch(personas, reactions, ad_contexts)
-    valid_reactions = validator.filter_valid_reactions(personas, reactions, ad_contexts)
+    validation, valid_reactions = validator.validate_and_filter(personas, reactions, ad_contexts)
 
     # Optimize
-    optimization = optimizer.optimize_portfolio(valid_reactions, personas, max_ads=len(ads))
+    _report(progress, "stage", stage="optimization")
+    # An early-stopped adaptive run sampled clusters unevenly: weight them back to their size
+    cluster_weights = (result.sampling or {}).get("cluster_weights")
+    optimization = optimizer.optimize_portfolio(
+        valid_reactions, personas, max_ads=len(ads), cluster_weights=cluster_weights
+    )
 
     # Build heatmap
     ad_ids = [ad.ad_id for ad in ads]
     heatmap = optimizer.generate_heatmap_matrix(valid_reactions, personas, ad_ids)
 
-    # Shape response: generate internal monologue for each reaction, then build details
+    # Shape response: internal monologue per reaction (eager: now, lazy: registered for the
+    # monologues endpoint), then build details
     persona_map = {p.uuid: p for p in personas}
     ad_map = {ad.ad_id: ad for ad in ads}
-
-    monologue_tasks = [
-        _build_ad_reaction_monologue(persona_map[r.persona_uuid], ad_map[r.ad_id], r)
-        for r in valid_reactions
-    ]
-    monologues = await asyncio.gather(*monologue_tasks, return_exceptions=True)
-
-    def _mono_for(i: int):
-        m = monologues[i]
-        if isinstance(m, str):
-            return m
-        if isinstance(m, Exception):
-            return f"[Monologue unavailable: {m}]"
-        return None
+    mode = _monologue_mode(body)
+
+    texts: List[Optional[str]] = [None] * len(valid_reactions)
+    if mode == "eager":
+        _report(progress, "stage", stage="monologues", total=len(valid_reactions))
+        texts = await asyncio.gather(*(
+            generate_monologue(_ad_reaction_monologue_prompt(persona_map[r.persona_uuid], ad_map[r.ad_id], r))
+            for r in valid_reactions
+        ))
+    elif monologues is not None:
+        for r in valid_reactions:
+            monologues.add(
+                r.persona_uuid, r.ad_id,
+                _ad_reaction_monologue_prompt(persona_map[r.persona_uuid], ad_map[r.ad_id], r),
+            )
 
     reaction_details = [
         AdReactionDetail(
@@ -397,7 +475,7 @@ async def _run_ad_simulation(
             reasoning=r.reasoning,
             emotional_response=r.emotional_response,
             barriers=r.barriers or [],
-            internal_monologue=_mono_for(i),
+            internal_monologue=texts[i],
         )
         for i, r in enumerate(valid_reactions)
     ]
@@ -449,6 +527,9 @@ async def _run_ad_simulation(
             "num_ads": len(ads),
             "total_reactions": len(reactions),
             "valid_reactions": len(valid_reactions),
+            **({"adaptive_sampling": result.sampling} if result.sampling else {}),
+            **({"tier_split": result.tier_split} if result.tier_split else {}),
+            **_monologue_metadata(monologues, mode),
         },
     )
 
@@ -457,14 +538,12 @@ async def _run_ad_simulation(
 # Product flow simulation pipeline
 # ---------------------------------------------------------------------------
 
-async def _build_persona_monologue(persona, journey_dict: Dict[str, Any]) -> str:
-    """Generate a brief internal-monologue summary for one persona's journey."""
-    from src.api.gemini_client import gemini_client
-
+def _persona_monologue_prompt(persona, journey_dict: Dict[str, Any]) -> tuple:
+    """(prompt, fallback) for a brief internal-monologue summary of one persona's journey."""
     completed = journey_dict.get("completed_flow", False)
     drop_reason = journey_dict.get("drop_off_reason", "")
     decisions_text = "\n".join(
-        f"  Screen {d['view_number']} ({d['view_name']}): {d['decision']} — {d['reasoning']}"
+        f"  Screen {d['view_number']} ({d.get('view_name') or d['view_id']}): {d['decision']} — {d['reasoning']}"
         for d in journey_dict.get("decisions", [])
     )
 
@@ -479,17 +558,18 @@ Result: {"COMPLETED ✅" if completed else f"DROPPED OFF ❌ — {drop_reason}"}
 Write a 2-3 sentence first-person internal monologue capturing your experience, feelings, and key friction point (if any).
 Be specific and stay in character. Return only the monologue text."""
 
-    try:
-        return await gemini_client.generate_flash(prompt)
-    except Exception:
-        if completed:
-            return f"I made it through. The process felt manageable and worth my time."
-        return f"I stopped partway through. {drop_reason or 'It was not clear enough for me.'}"
+    if completed:
+        fallback = "I made it through. The process felt manageable and worth my time."
+    else:
+        fallback = f"I stopped partway through. {drop_reason or 'It was not clear enough for me.'}"
+    return prompt, fallback
 
 
 async def _run_flow_simulation(
     body: RunSimulationRequest,
     image_paths: List[Path],
+    progress: Optional[ProgressCallback] = None,
+    monologues: Optional[SimulationMonologues] = None,
 ) -> FlowSimulationResult:
     # Build a single FlowStimulus from the ordered image list
     flow_id = f"flow_{uuid.uuid4().hex[:6]}"
@@ -507,26 +587,39 @@ async def _run_flow_simulation(
     flow = FlowStimulus(flow_id=flow_id, flow_name="Uploaded Flow", screens=screens)
 
     # Load & hydrate personas
+    _report(progress, "stage", stage="persona_hydration", total=body.n)
     personas = await _load_and_hydrate_personas(body.n, body.target_group)
 
     # Run flow simulation
+    _report(progress, "stage", stage="simulation", total=len(personas))
     flow_sim = FlowSimulator()
-    journey_results = await flow_sim.run_flow(personas, flow, analyze_screens=True, progress=False)
+    on_journey = None
+    if progress is not None:
+        on_journey = lambda j: progress("journey", **journey_result_to_dict(j))
+    journey_results = await flow_sim.run_flow(
+        personas, flow, analyze_screens=True, progress=False, on_journey=on_journey
+    )
 
     # Build persona map
     persona_map = {p.uuid: p for p in personas}
 
-    # Generate monologues concurrently
+    # Monologues: generated now (eager) or registered for the monologues endpoint (lazy)
     journey_dicts = [journey_result_to_dict(j) for j in journey_results]
-    monologue_tasks = [
-        _build_persona_monologue(persona_map[jd["persona_uuid"]], jd)
-        for jd in journey_dicts
-    ]
-    monologues = await asyncio.gather(*monologue_tasks, return_exceptions=True)
+    mode = _monologue_mode(body)
+    texts: List[Optional[str]] = [None] * len(journey_dicts)
+    if mode == "eager":
+        _report(progress, "stage", stage="monologues", total=len(journey_dicts))
+        texts = await asyncio.gather(*(
+            generate_monologue(*_persona_monologue_prompt(persona_map[jd["persona_uuid"]], jd))
+            for jd in journey_dicts
+        ))
+    elif monologues is not None:
+        for jd in journey_dicts:
+            monologues.add(jd["persona_uuid"], flow_id, *_persona_monologue_prompt(persona_map[jd["persona_uuid"]], jd))
 
     # Shape journeys
     journeys_out: List[PersonaJourneyOut] = []
-    for jd, monologue in zip(journey_dicts, monologues):
+    for jd, monologue in zip(journey_dicts, texts):
         persona = persona_map[jd["persona_uuid"]]
         steps = [
             FlowStepOut(
@@ -555,7 +648,7 @@ async def _run_flow_simulation(
                 total_screens_seen=jd["total_screens_seen"],
                 total_time_seconds=jd["total_time_seconds"],
                 steps=steps,
-                monologue=monologue if isinstance(monologue, str) else None,
+                monologue=monologue,
             )
         )
 
@@ -602,6 +695,7 @@ async def _run_flow_simulation(
             "num_screens": len(screens),
             "completion_rate_pct": completion_rate,
             "avg_time_seconds": avg_time,
+            **_monologue_metadata(monologues, mode),
         },
     )
 
@@ -621,43 +715,220 @@ async def _run_flow_simulation(
         "emotional responses, and an optimal budget allocation.\n\n"
         "**simulation_type=1 (Product flow simulation):** URLs are ordered product flow screens. "
         "Personas step through the flow; the engine returns per-screen decisions, "
-        "completion rates, drop-off reasons, and a first-person internal monologue per persona."
+        "completion rates, drop-off reasons, and a first-person internal monologue per persona.\n\n"
+        "Monologues are included in the result by default. With `monologues=lazy` they are "
+        "generated on demand instead: fetch them from "
+        "`GET /simulations/{simulation_id}/monologues/{persona_uuid}`."
     ),
 )
 async def run_simulation(
     body: RunSimulationRequest,
     current_user: dict = Depends(get_current_user),
 ) -> SimulationResponse:
-    simulation_id = uuid.uuid4().hex
+    return await _execute_run_request(body, uuid.uuid4().hex, current_user["uid"])
+
+
+def _register_monologues(
+    body, simulation_type: int, simulation_id: str, owner_uid: Optional[str]
+) -> Optional[SimulationMonologues]:
+    """Monologue store entry for a lazy-monologue run (None for eager / off)."""
+    if _monologue_mode(body) != "lazy":
+        return None
+    kind = "ad" if simulation_type == 0 else "product_flow"
+    return monologue_store.register(simulation_id, owner_uid, kind)
+
+
+async def _execute_run_request(
+    body: RunSimulationRequest,
+    simulation_id: str,
+    run_by_uid: str,
+    progress: Optional[ProgressCallback] = None,
+) -> SimulationResponse:
+    """Full /run pipeline; shared by the synchronous route and the async job worker."""
     start = time.time()
+    monologues = _register_monologues(body, body.simulation_type, simulation_id, run_by_uid)
 
-    if body.local_ads_dir and (not body.image_urls or len(body.image_urls) == 0):
-        # Use local folder: resolve and get sorted image paths
-        image_paths = _resolve_local_image_paths(body.local_ads_dir)
-        if body.simulation_type == 0:
-            result = await _run_ad_simulation(body, image_paths)
-        else:
-            result = await _run_flow_simulation(body, image_paths)
-    else:
-        # Download from URLs into a temp dir (auto-cleaned on exit)
-        with tempfile.TemporaryDirectory(prefix="apriori_sim_") as tmp_dir:
-            tmp_path = Path(tmp_dir)
-            image_paths = await _download_images([str(u) for u in body.image_urls], tmp_path)
+    with llm_telemetry.run() as llm_usage:
+        if body.local_ads_dir and (not body.image_urls or len(body.image_urls) == 0):
+            # Use local folder: resolve and get sorted image paths
+            image_paths = _resolve_local_image_paths(body.local_ads_dir)
             if body.simulation_type == 0:
-                result = await _run_ad_simulation(body, image_paths)
+                result = await _run_ad_simulation(body, image_paths, progress, monologues)
             else:
-                result = await _run_flow_simulation(body, image_paths)
+                result = await _run_flow_simulation(body, image_paths, progress, monologues)
+        else:
+            # Download from URLs into a temp dir (auto-cleaned on exit)
+            with tempfile.TemporaryDirectory(prefix="apriori_sim_") as tmp_dir:
+                tmp_path = Path(tmp_dir)
+                _report(progress, "stage", stage="download", total=len(body.image_urls))
+                image_paths = await _download_images([str(u) for u in body.image_urls], tmp_path)
+                if body.simulation_type == 0:
+                    result = await _run_ad_simulation(body, image_paths, progress, monologues)
+                else:
+                    result = await _run_flow_simulation(body, image_paths, progress, monologues)
 
     elapsed = round(time.time() - start, 2)
     result.metadata["execution_time_seconds"] = elapsed
     result.metadata["simulation_id"] = simulation_id
-    result.metadata["run_by_uid"] = current_user["uid"]
+    result.metadata["llm_usage"] = llm_usage.summary()
+    result.metadata["run_by_uid"] = run_by_uid
 
     response = SimulationResponse(simulation_id=simulation_id, result=result)
     _log_response_before_send(response)
     return response
 
 
+# ---------------------------------------------------------------------------
+# Async jobs: submit, poll, stream
+# ---------------------------------------------------------------------------
+
+def _get_owned_job(job_id: str, current_user: dict) -> SimulationJob:
+    job = simulation_jobs.get(job_id)
+    if job is None or job.owner_uid != current_user["uid"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation job not found: {job_id}",
+        )
+    return job
+
+
+@router.post(
+    "/jobs",
+    response_model=SimulationJobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a simulation job",
+    description=(
+        "Same request body as `/run`, but returns a job id immediately and runs the pipeline "
+        "in the background.\n\n"
+        "Poll `GET /simulations/{job_id}` for status and the final result, or subscribe to "
+        "`GET /simulations/{job_id}/events` (Server-Sent Events) for per-stage progress and "
+        "partial reactions / journeys as they complete."
+    ),
+)
+async def submit_simulation_job(
+    body: RunSimulationRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+) -> SimulationJobAccepted:
+    # Fail fast on a bad local folder instead of failing inside the job
+    if body.local_ads_dir and not body.image_urls:
+        _resolve_local_image_paths(body.local_ads_dir)
+
+    uid = current_user["uid"]
+    kind = "ad" if body.simulation_type == 0 else "product_flow"
+    job = simulation_jobs.submit(
+        owner_uid=uid,
+        kind=kind,
+        runner=lambda job: _execute_run_request(body, job.job_id, uid, job.emit),
+    )
+    _log("JOB", "Simulation job submitted", job_id=job.job_id, kind=kind, n=body.n)
+    return SimulationJobAccepted(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=request.app.url_path_for("get_simulation_job", job_id=job.job_id),
+        events_url=request.app.url_path_for("stream_simulation_job", job_id=job.job_id),
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=SimulationJobStatus,
+    summary="Get simulation job status",
+    description=(
+        "Returns status (queued | running | succeeded | failed | cancelled), the current stage, progress "
+        "counters, and the full SimulationResponse once the job has succeeded. "
+        "Pass `after=<seq>` to also receive events newer than that sequence number."
+    ),
+)
+async def get_simulation_job(
+    job_id: str,
+    after: Optional[int] = Query(default=None, ge=0, description="Return events with seq > after"),
+    current_user: dict = Depends(get_current_user),
+) -> SimulationJobStatus:
+    job = _get_owned_job(job_id, current_user)
+    return SimulationJobStatus(
+        job_id=job.job_id,
+        status=job.status,
+        stage=job.stage,
+        progress=dict(job.progress),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        portfolio=job.portfolio,
+        events=job.events_after(after) if after is not None else None,
+        result=job.result if job.status == "succeeded" else None,
+    )
+
+
+@router.get(
+    "/{job_id}/events",
+    summary="Stream simulation job progress (SSE)",
+    description=(
+        "Server-Sent Events stream. Event types: `status`, `stage`, `reaction` and `portfolio` "
+        "(ad simulation: each reaction, then the budget split so far), `journey` (product flow). Each event's `id` is its sequence number; reconnect with "
+        "`Last-Event-ID` to resume. The stream closes after the final `status` event."
+    ),
+)
+async def stream_simulation_job(
+    job_id: str,
+    last_event_id: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+) -> StreamingResponse:
+    job = _get_owned_job(job_id, current_user)
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    async def _sse():
+        async for ev in job.stream(after=after):
+            if ev is None:
+                yield ": keep-alive\n\n"
+                continue
+            payload = json.dumps(ev["data"], default=str)
+            yield f"id: {ev['seq']}\nevent: {ev['event']}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        _sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/{simulation_id}/monologues/{persona_uuid}",
+    response_model=PersonaMonologuesResponse,
+    summary="Get a persona's internal monologues",
+    description=(
+        "First-person internal monologues of one persona in a finished simulation, keyed by "
+        "ad_id (ad simulation) or flow_id (product flow). Generated on first access and cached "
+        "(only runs started with `monologues=lazy`). Pass `stimulus_id` to fetch a single one."
+    ),
+)
+async def get_persona_monologues(
+    simulation_id: str,
+    persona_uuid: str,
+    stimulus_id: Optional[str] = Query(default=None, description="Only this ad_id / flow_id"),
+    current_user: dict = Depends(get_current_user),
+) -> PersonaMonologuesResponse:
+    entry = monologue_store.get(simulation_id)
+    if entry is None or (entry.owner_uid is not None and entry.owner_uid != current_user["uid"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No lazy monologues for simulation: {simulation_id}",
+        )
+    monologues = await entry.for_persona(persona_uuid, stimulus_id)
+    if not monologues:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No monologue for persona {persona_uuid} in simulation {simulation_id}",
+        )
+    return PersonaMonologuesResponse(
+        simulation_id=simulation_id,
+        persona_uuid=persona_uuid,
+        simulation_type=entry.kind,
+        monologues=monologues,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Frontend contract: product-flow and ad-portfolio (profileId + Firestore)
 # ---------------------------------------------------------------------------
@@ -682,20 +953,21 @@ async def _run_simulation_from_firestore(
     _log("PERSONA", "Target group from audience", target_group_len=len(target_group), preview=target_group[:80] + "..." if len(target_group) > 80 else target_group)
 
     urls = _get_ordered_asset_urls_from_folders(user_doc_id, folder_ids)
-    # Internal body for engine: n=1 (personaDepth low/medium/high all use n=1)
-    body = SimpleNamespace(n=1, target_group=target_group, product_category="general")
+    # Internal body for engine: n=1 (personaDepth low/medium/high all use n=1). Monologues stay
+    # in the response: these routes have no bearer token for the lazy monologue endpoint.
+    body = SimpleNamespace(n=1, target_group=target_group, product_category="general", monologues="eager")
 
     simulation_id = uuid.uuid4().hex
     _log("DOWNLOAD", "Downloading images to temp dir", url_count=len(urls))
-    with tempfile.TemporaryDirectory(prefix="apriori_sim_") as tmp_dir:
+    with tempfile.TemporaryDirectory(prefix="apriori_sim_") as tmp_dir, llm_telemetry.run() as llm_usage:
         tmp_path = Path(tmp_dir)
         image_paths = await _download_images(urls, tmp_path)
         _log("DOWNLOAD", "Download complete", path_count=len(image_paths))
         _log("ENGINE", "Running simulation engine", simulation_type=sim_type_label)
         if simulation_type == 0:
-            result = await _run_ad_simulation(body, image_paths)
+            result = await _run_ad_simulation(body, image_paths, monologues=None)
         else:
-            result = await _run_flow_simulation(body, image_paths)
+            result = await _run_flow_simulation(body, image_paths, monologues=None)
         _log("ENGINE", "Simulation complete", result_type=type(result).__name__)
 
     elapsed = round(time.time() - start, 2)
@@ -707,6 +979,7 @@ async def _run_simulation_from_firestore(
     if optimize_metric:
         result.metadata["optimize_metric"] = optimize_metric
     result.metadata["simulation_id"] = simulation_id
+    result.metadata["llm_usage"] = llm_usage.summary()
 
     response = SimulationResponse(simulation_id=simulation_id, result=result)
     _log_response_before_send(response)
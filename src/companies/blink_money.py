@@ -22,7 +22,9 @@ from tqdm.asyncio import tqdm
 from src.companies.base import CompanyPlugin, CompanyConfig, SimulationMode
 from src.core.base import FlowStimulus, FlowScreen, FlowJourneyResult, FlowStepDecision
 from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
 from src.utils.config import DATA_DIR
+from src.utils.creative_analysis import analyze_image
 
 
 # ---------------------------------------------------------------------------
@@ -631,16 +633,9 @@ RESPOND IN PURE JSON (no markdown, no backticks):
 class BlinkMoneyFlowSimulator:
     """LAMF-specific flow simulator with collateral/loan-context prompts."""
 
-    def __init__(self):
-        self._screen_cache: Dict[str, Dict] = {}
-
     async def _analyze_screen(self, screen: FlowScreen) -> Dict:
-        key = screen.image_path
-        if key in self._screen_cache:
-            return self._screen_cache[key]
+        # Cached by image hash + prompt across runs (src/utils/creative_analysis.py)
         try:
-            with open(screen.image_path, "rb") as f:
-                image_data = f.read()
             prompt = """Analyze this Loan Against Mutual Funds (LAMF) app screen.
 
 Describe exactly what you see:
@@ -654,10 +649,8 @@ Describe exactly what you see:
 
 Return ONLY valid JSON (no newlines inside values):
 {"main_content": "...", "key_information": "...", "required_action": "...", "trust_signals": "...", "collateral_info": "...", "friction_points": "...", "design_quality": "..."}"""
-            response = await gemini_client.generate_pro(prompt, image_data)
-            result = gemini_client.parse_json_response(response)
-            self._screen_cache[key] = result
-            return result
+            with llm_caller("screen_analysis"):
+                return await analyze_image(screen.image_path, prompt)
         except Exception as e:
             return {
                 "main_content": "LAMF app screen", "key_information": "Unknown",
@@ -720,7 +713,8 @@ Return ONLY valid JSON (no newlines inside values):
             ctx = self._build_context(persona, screen, history, view_analyses.get(screen.view_id, {}), len(flow.screens))
             prompt = LAMF_DECISION_PROMPT.format(**ctx)
             try:
-                raw = await gemini_client.generate_pro(prompt, system_prompt=LAMF_SYSTEM_PROMPT)
+                with llm_caller("flow_step"):
+                    raw = await gemini_client.generate_pro(prompt, system_prompt=LAMF_SYSTEM_PROMPT)
                 data = gemini_client.parse_json_response(raw)
             except Exception as e:
                 data = {
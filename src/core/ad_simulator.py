@@ -5,7 +5,7 @@ Wraps the proven TieredSimulationEngine (Pro for visual grounding, Flash for sca
 Output: reactions per persona per ad, used for budget optimization.
 """
 
-from typing import List, Any
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass
 
 # Re-export from existing simulation_engine for backward compatibility
@@ -14,6 +14,7 @@ from src.core.simulation_engine import (
     Ad,
     simulation_engine,
 )
+from src.core.run_journal import RunJournal
 from src.utils.schemas import EnrichedPersona, AdReaction
 
 
@@ -23,6 +24,8 @@ class AdSimulationResult:
     reactions: List[AdReaction]
     persona_count: int
     ad_count: int
+    sampling: Optional[Dict[str, Any]] = None  # early-stopping summary when adaptive sampling ran
+    tier_split: Optional[Dict[str, Any]] = None  # Tier 1 strategy, seed and tier sizes
 
 
 class AdSimulator:
@@ -39,16 +42,35 @@ class AdSimulator:
     async def run(
         self,
         personas: List[EnrichedPersona],
-        ads: List[Ad]
+        ads: List[Ad],
+        on_reaction: Optional[Callable[[AdReaction], None]] = None,
+        adaptive: Optional[bool] = None,
+        journal: Optional[RunJournal] = None,
+        prior_reactions: Optional[List[AdReaction]] = None,
+        calibrate: Optional[bool] = None,
+        prior_personas: Optional[List[EnrichedPersona]] = None
     ) -> AdSimulationResult:
         """
         Run ad simulation: each persona sees each ad, we get their reaction.
+        on_reaction (optional) is called with each reaction as it completes.
+        adaptive (optional) overrides ADAPTIVE_SAMPLING_ENABLED: simulate personas in
+        waves and stop once the winning ad and budget split are settled.
+        journal (optional) checkpoints reactions and skips pairs it already holds.
+        prior_reactions / prior_personas (optional): an earlier run (load_prior_run) for the
+        "uncertainty" / "neyman" Tier 1 assignment strategies.
+        calibrate (optional) overrides TIER_CALIBRATION_ENABLED: correct Flash scores per
+        audience cluster against paired Pro reactions.
         
         Returns AdSimulationResult with all reactions.
         """
-        reactions = await self.engine.run_simulation(personas, ads)
+        reactions = await self.engine.run_simulation(
+            personas, ads, on_reaction=on_reaction, adaptive=adaptive, journal=journal,
+            prior_reactions=prior_reactions, calibrate=calibrate, prior_personas=prior_personas
+        )
         return AdSimulationResult(
             reactions=reactions,
             persona_count=len(personas),
-            ad_count=len(ads)
+            ad_count=len(ads),
+            sampling=getattr(self.engine, "last_sampling_report", None),
+            tier_split=getattr(self.engine, "last_tier_split", None)
         )
@@ -9,13 +9,18 @@ Also supports company-specific simulators (e.g. Loop Health EnhancedFlowSimulato
 """
 
 import asyncio
+import hashlib
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Callable, Awaitable, Protocol
+from typing import List, Dict, Any, Callable, Awaitable, Optional, Protocol
 from tqdm.asyncio import tqdm
 
 from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
 from src.core.base import FlowStimulus, FlowScreen, FlowJourneyResult, FlowStepDecision
+from src.core.run_journal import RunJournal
+from src.utils.creative_analysis import analyze_image
+from src.utils.config import FLOW_CONCURRENT_FLOWS, FLOW_STEP_REUSE_DECISIONS, FLOW_STEP_SINGLE_FLIGHT
 
 
 # Type for context builder: (persona, screen, journey_history, view_analysis) -> dict
@@ -28,6 +33,9 @@ class FlowSimulatorConfig:
     system_prompt: str = ""
     max_concurrent: int = 5
     use_vision_for_analysis: bool = True
+    # Identical concurrent step prompts share one call / finished decisions are reused
+    single_flight: bool = FLOW_STEP_SINGLE_FLIGHT
+    reuse_step_decisions: bool = FLOW_STEP_REUSE_DECISIONS
 
 
 DEFAULT_FLOW_SYSTEM_PROMPT = """You are simulating a real user going through a product flow.
@@ -69,6 +77,18 @@ Return JSON:
 """
 
 
+# drop_off_reason of steps whose LLM call failed (such journeys are not checkpointed)
+TECHNICAL_ERROR_REASON = "Technical error"
+
+
+def _persona_uuid(persona: Any) -> str:
+    return persona.uuid if hasattr(persona, "uuid") else persona.get("uuid", "")
+
+
+def is_error_journey(journey: FlowJourneyResult) -> bool:
+    return bool(journey.decisions) and journey.decisions[-1].drop_off_reason == TECHNICAL_ERROR_REASON
+
+
 class FlowSimulatorProtocol(Protocol):
     """Protocol for flow simulators - core or company-specific."""
 
@@ -97,7 +117,10 @@ class FlowSimulator:
     ):
         self.context_builder = context_builder or self._default_context_builder
         self.config = config or FlowSimulatorConfig()
-        self._screen_analysis_cache: Dict[str, Dict[str, Any]] = {}
+        # Step prompt hash -> in-flight call / finished decision data
+        self._step_inflight: Dict[str, asyncio.Future] = {}
+        self._step_decisions: Dict[str, Dict[str, Any]] = {}
+        self.step_stats: Dict[str, Dict[str, int]] = {}  # flow_id -> llm_calls / coalesced / reused
     
     def _default_context_builder(
         self,
@@ -147,15 +170,12 @@ class FlowSimulator:
         return "\n".join(parts) if parts else "Standard screen"
     
     async def _analyze_screen(self, screen: FlowScreen, flow_name: str = "") -> Dict[str, Any]:
-        """Analyze a flow screen using vision model."""
-        cache_key = f"{screen.view_id}_{screen.image_path}"
-        if cache_key in self._screen_analysis_cache:
-            return self._screen_analysis_cache[cache_key]
-        
+        """
+        Analyze a flow screen using vision model.
+        Cached on disk by image hash + prompt (shared with other simulators and runs);
+        concurrent flows showing the same screen share one call.
+        """
         try:
-            with open(screen.image_path, "rb") as f:
-                image_data = f.read()
-            
             prompt = f"""Analyze this product flow screen (View {screen.view_number}).
 
 Describe:
@@ -168,10 +188,8 @@ Describe:
 Return ONLY valid JSON:
 {{"main_content": "...", "key_information": "...", "required_action": "...", "design_quality": "...", "friction_points": "..."}}
 """
-            response = await gemini_client.generate_pro(prompt, image_data)
-            result = gemini_client.parse_json_response(response)
-            self._screen_analysis_cache[cache_key] = result
-            return result
+            with llm_caller("screen_analysis"):
+                return await analyze_image(screen.image_path, prompt)
         except Exception as e:
             return {
                 "main_content": "Product flow screen",
@@ -199,13 +217,12 @@ Return ONLY valid JSON:
         system = self.config.system_prompt or DEFAULT_FLOW_SYSTEM_PROMPT
         
         try:
-            response = await gemini_client.generate_flash(prompt, system_prompt=system)
-            data = gemini_client.parse_json_response(response)
+            data = await self._decide_step(prompt, system, flow.flow_id)
         except Exception as e:
             data = {
                 "decision": "DROP_OFF",
                 "reasoning": str(e),
-                "drop_off_reason": "Technical error",
+                "drop_off_reason": TECHNICAL_ERROR_REASON,
                 "trust_score": 5,
                 "clarity_score": 5,
                 "value_perception_score": 5,
@@ -238,6 +255,63 @@ Return ONLY valid JSON:
         
         return step_decision, decision == "CONTINUE"
     
+    async def _decide_step(self, prompt: str, system: str, flow_id: str = "") -> Dict[str, Any]:
+        """
+        Parsed step decision for a prompt, deduplicated across personas.
+        
+        The prompt holds everything the decision depends on (profile summary,
+        screen, journey so far) but no persona id, so personas sharing an
+        archetype ask the same question. A later identical prompt of the same flow
+        waits for the in-flight call instead of making its own; with
+        reuse_step_decisions it is answered from earlier results as well. Flows
+        never share decisions, so variants with a common screen stay independent.
+        Failures are not reused.
+        """
+        stats = self.step_stats.setdefault(flow_id, {"llm_calls": 0, "coalesced": 0, "reused": 0})
+        if not (self.config.single_flight or self.config.reuse_step_decisions):
+            return await self._call_step(prompt, system, stats)
+        
+        key = hashlib.sha256(f"{flow_id}\x00{system}\x00{prompt}".encode("utf-8")).hexdigest()
+        if key in self._step_decisions:
+            stats["reused"] += 1
+            return dict(self._step_decisions[key])
+        inflight = self._step_inflight.get(key)
+        if inflight is not None:
+            try:
+                data = await asyncio.shield(inflight)
+                stats["coalesced"] += 1
+                return dict(data)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The persona that owned the call was cancelled - ask ourselves
+        
+        future = asyncio.get_running_loop().create_future()
+        if self.config.single_flight:
+            self._step_inflight.setdefault(key, future)
+        try:
+            data = await self._call_step(prompt, system, stats)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; mark retrieved when there are none
+            raise
+        finally:
+            if self._step_inflight.get(key) is future:
+                del self._step_inflight[key]
+        future.set_result(data)
+        if self.config.reuse_step_decisions:
+            self._step_decisions[key] = data
+        return dict(data)
+    
+    async def _call_step(self, prompt: str, system: str, stats: Dict[str, int]) -> Dict[str, Any]:
+        stats["llm_calls"] += 1
+        with llm_caller("flow_step"):
+            response = await gemini_client.generate_flash(prompt, system_prompt=system)
+        return gemini_client.parse_json_response(response)
+    
     async def simulate_journey(
         self,
         persona: Any,
@@ -264,10 +338,8 @@ Return ONLY valid JSON:
                 drop_reason = step_decision.drop_off_reason or step_decision.reasoning
                 break
         
-        persona_uuid = persona.uuid if hasattr(persona, "uuid") else persona.get("uuid", "")
-        
         return FlowJourneyResult(
-            persona_uuid=persona_uuid,
+            persona_uuid=_persona_uuid(persona),
             flow_id=flow.flow_id,
             total_screens_seen=len(decisions),
             completed_flow=dropped_at is None,
@@ -282,24 +354,51 @@ Return ONLY valid JSON:
         personas: List[Any],
         flow: FlowStimulus,
         analyze_screens: bool = True,
-        progress: bool = True
+        progress: bool = True,
+        on_journey: Optional[Callable[[FlowJourneyResult], None]] = None,
+        journal: Optional[RunJournal] = None
     ) -> List[FlowJourneyResult]:
         """
         Run all personas through one flow.
+        on_journey (optional) is called with each journey as soon as it completes.
+        journal (optional) checkpoints each journey; personas already journaled for
+        this flow are reused instead of simulated again.
         Returns list of FlowJourneyResult.
         """
+        done = journal.completed_journeys(flow.flow_id) if journal is not None else {}
+        pending = [p for p in personas if _persona_uuid(p) not in done]
+        if not pending:
+            return [done[_persona_uuid(p)] for p in personas]
+        
         view_analyses = {}
         if analyze_screens:
             tasks = [self._analyze_screen(s, flow.flow_name) for s in flow.screens]
             analyses = await tqdm.gather(*tasks, desc=f"Analyzing {flow.flow_name}") if progress else await asyncio.gather(*tasks)
             view_analyses = {flow.screens[i].view_id: analyses[i] for i in range(len(flow.screens))}
         
-        tasks = [self.simulate_journey(p, flow, view_analyses) for p in personas]
+        async def _journey(p):
+            result = await self.simulate_journey(p, flow, view_analyses)
+            if journal is not None and not is_error_journey(result):
+                journal.record_journey(result)
+            if on_journey is not None:
+                on_journey(result)
+            return result
+        
+        # step_stats accumulate over the simulator's lifetime: report this run's share
+        before = dict(self.step_stats.get(flow.flow_id, {}))
+        tasks = [_journey(p) for p in pending]
         if progress:
             results = await tqdm.gather(*tasks, desc=f"Simulating {flow.flow_name}")
         else:
             results = await asyncio.gather(*tasks)
+        stats = {k: v - before.get(k, 0) for k, v in self.step_stats.get(flow.flow_id, {}).items()}
+        if stats.get("coalesced") or stats.get("reused"):
+            print(f"   ♻️  {flow.flow_name}: {stats['llm_calls']} step calls, "
+                  f"{stats['coalesced']} shared in-flight, {stats['reused']} reused")
         
+        if done:
+            fresh = {r.persona_uuid: r for r in results}
+            return [done.get(_persona_uuid(p)) or fresh[_persona_uuid(p)] for p in personas]
         return list(results)
     
     async def run_multiple_flows(
@@ -307,21 +406,34 @@ Return ONLY valid JSON:
         personas: List[Any],
         flows: List[FlowStimulus],
         analyze_screens: bool = True,
-        progress: bool = True
+        progress: bool = True,
+        journal: Optional[RunJournal] = None,
+        concurrent: Optional[bool] = None
     ) -> Dict[str, List[FlowJourneyResult]]:
         """
         Run all personas through all flows.
+        concurrent (default FLOW_CONCURRENT_FLOWS) runs every flow's screen analyses
+        and journeys at once; the client's per-tier limiters are the shared bound,
+        so K flows take about as long as the slowest one instead of the sum.
         Returns: flow_id -> list of FlowJourneyResult
         """
-        all_results: Dict[str, List[FlowJourneyResult]] = {}
+        use_concurrent = FLOW_CONCURRENT_FLOWS if concurrent is None else concurrent
         
-        for flow in flows:
-            results = await self.run_flow(
+        def _run(flow: FlowStimulus) -> Awaitable[List[FlowJourneyResult]]:
+            return self.run_flow(
                 personas, flow,
                 analyze_screens=analyze_screens,
-                progress=progress
+                progress=progress,
+                journal=journal
             )
-            all_results[flow.flow_id] = results
+        
+        all_results: Dict[str, List[FlowJourneyResult]] = {}
+        if use_concurrent:
+            for flow, results in zip(flows, await asyncio.gather(*[_run(flow) for flow in flows])):
+                all_results[flow.flow_id] = results
+        else:
+            for flow in flows:
+                all_results[flow.flow_id] = await _run(flow)
         
         return all_results
 
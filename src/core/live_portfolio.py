@@ -0,0 +1,166 @@
+"""Incremental portfolio aggregation while a simulation is still running.
+
+optimize_portfolio() needs every reaction up front. LivePortfolio instead
+takes reactions one at a time (e.g. from run_simulation's on_reaction hook)
+and keeps running sufficient statistics:
+
+  - per ad: impressions, clicks, high-intent count, reach / engaged bitsets
+  - per (cluster, ad): impressions, high-intent count, trust and relevance sums
+
+snapshot() turns them into the current segment owners and budget split in
+O(clusters x ads) using the same scoring and allocation as PortfolioOptimizer,
+so a finished run's live split matches the final one for the same reactions
+(the final one is computed after validation, so it can still differ).
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from src.core.optimizer import PortfolioOptimizer, optimizer as default_optimizer
+from src.utils.schemas import AdPerformance, AdReaction, EnrichedPersona
+
+
+class LivePortfolio:
+    """Running cluster x ad statistics with an on-demand portfolio snapshot."""
+
+    def __init__(
+        self,
+        personas: List[EnrichedPersona],
+        ad_ids: Optional[List[str]] = None,
+        optimizer: PortfolioOptimizer = default_optimizer,
+    ):
+        self.optimizer = optimizer
+        self.clusters = optimizer.fragment_audience_into_clusters(personas)
+        self.cluster_sizes = {cluster_id: len(members) for cluster_id, members in self.clusters.items()}
+        self._cluster_of = {
+            persona.uuid: cluster_id
+            for cluster_id, members in self.clusters.items()
+            for persona in members
+        }
+        # Bit position per persona for audience bitsets (Python ints)
+        self._bit = {persona.uuid: idx for idx, persona in enumerate(personas)}
+
+        self.ad_ids: List[str] = list(ad_ids or [])
+        self.reactions_seen = 0
+        self._ad_stats: Dict[str, Dict[str, int]] = {}
+        self._reach: Dict[str, int] = defaultdict(int)
+        self._engaged: Dict[str, int] = defaultdict(int)
+        self._cells: Dict[tuple, List[int]] = {}  # (cluster, ad) -> [impressions, high, trust_sum, relevance_sum]
+
+    def _persona_bit(self, persona_uuid: str) -> int:
+        idx = self._bit.get(persona_uuid)
+        if idx is None:
+            idx = self._bit[persona_uuid] = len(self._bit)
+        return 1 << idx
+
+    def add(self, reaction: AdReaction) -> None:
+        """Fold one reaction into the running statistics (O(1))."""
+        self.reactions_seen += 1
+        ad_id = reaction.ad_id
+        if ad_id not in self._ad_stats:
+            self._ad_stats[ad_id] = {"impressions": 0, "clicks": 0, "high_intent_leads": 0}
+            if ad_id not in self.ad_ids:
+                self.ad_ids.append(ad_id)
+        is_click = reaction.action == "CLICK"
+        is_high = reaction.intent_level == "High"
+
+        stats = self._ad_stats[ad_id]
+        stats["impressions"] += 1
+        stats["clicks"] += is_click
+        stats["high_intent_leads"] += is_high
+
+        bit = self._persona_bit(reaction.persona_uuid)
+        self._reach[ad_id] |= bit
+        if is_click or reaction.intent_level in ["High", "Medium"]:
+            self._engaged[ad_id] |= bit
+
+        cluster_id = self._cluster_of.get(reaction.persona_uuid)
+        if cluster_id is not None:
+            cell = self._cells.setdefault((cluster_id, ad_id), [0, 0, 0, 0])
+            cell[0] += 1
+            cell[1] += is_high
+            cell[2] += reaction.trust_score
+            cell[3] += reaction.relevance_score
+
+    def add_many(self, reactions: List[AdReaction]) -> None:
+        for reaction in reactions:
+            self.add(reaction)
+
+    def cluster_ad_counts(self) -> Dict[tuple, tuple]:
+        """(cluster, ad) -> (impressions, high-intent count) seen so far."""
+        return {key: (cell[0], cell[1]) for key, cell in self._cells.items()}
+
+    def performances(self) -> Dict[str, AdPerformance]:
+        """Per-ad metrics, same shape as PortfolioOptimizer.calculate_ad_performance."""
+        performances = {}
+        for ad_id, stats in self._ad_stats.items():
+            impressions = stats["impressions"]
+            performances[ad_id] = AdPerformance(
+                ad_id=ad_id,
+                total_impressions=impressions,
+                clicks=stats["clicks"],
+                high_intent_leads=stats["high_intent_leads"],
+                click_rate=round(stats["clicks"] / impressions * 100, 2),
+                conversion_rate=round(stats["high_intent_leads"] / impressions * 100, 2),
+                unique_reach=self._reach[ad_id].bit_count(),
+            )
+        return performances
+
+    def overlap_matrix(self) -> Dict[str, Dict[str, float]]:
+        """Engaged-audience overlap from bitset intersections (O(ads^2))."""
+        matrix = {}
+        for ad_a, audience_a in self._engaged.items():
+            size_a = audience_a.bit_count()
+            matrix[ad_a] = {
+                ad_b: 1.0 if ad_a == ad_b else round((audience_a & audience_b).bit_count() / size_a, 3)
+                for ad_b, audience_b in self._engaged.items()
+            }
+        return matrix
+
+    def segment_owners(self) -> Dict[str, Dict[str, Any]]:
+        """Winning ad per cluster, scored like PortfolioOptimizer.assign_segment_owners."""
+        owners = {}
+        for cluster_id in self.clusters:
+            ad_scores = {
+                ad_id: self.optimizer.score_cluster_ad(*self._cells.get((cluster_id, ad_id), (0, 0, 0, 0)))
+                for ad_id in self.ad_ids
+            }
+            if not ad_scores:
+                continue
+            winning_ad = max(ad_scores.keys(), key=lambda x: ad_scores[x]["score"])
+            metrics = ad_scores[winning_ad]
+            if metrics["score"] == 0:
+                continue
+            owners[cluster_id] = {
+                "winning_ad": winning_ad,
+                # Rounded like assign_segment_owners (numpy rounding), then made JSON-friendly
+                "trust_score": float(round(metrics["trust"], 1)),
+                "relevance_score": float(round(metrics["relevance"], 1)),
+                "conversion_rate": round(metrics["conversion_rate"], 1),
+                "high_intent_count": metrics["high_intent_count"],
+                "size": self.cluster_sizes[cluster_id],
+            }
+        return owners
+
+    def snapshot(self, max_ads: int = 3, cluster_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Current portfolio from the reactions seen so far (JSON-serializable).
+
+        budget_split only lists the ads that would be selected right now;
+        cluster_weights as in PortfolioOptimizer.allocate_budget.
+        """
+        performances = self.performances()
+        owners = self.segment_owners()
+        budget_split: Dict[str, float] = {}
+        if performances:
+            allocation, selected_ads, _ = self.optimizer.allocate_budget(
+                owners, self.ad_ids, performances, max_ads, cluster_weights
+            )
+            budget_split = {ad_id: round(allocation[ad_id]["budget_pct"], 1) for ad_id in selected_ads}
+        return {
+            "reactions_seen": self.reactions_seen,
+            "budget_split": budget_split,
+            "segment_ownership": owners,
+            "all_performances": {ad_id: perf.model_dump() for ad_id, perf in performances.items()},
+            "overlap_matrix": self.overlap_matrix(),
+        }
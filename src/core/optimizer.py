@@ -1,8 +1,15 @@
-"""Portfolio optimizer - Calculates optimal budget allocation across ad creatives."""
+"""Portfolio optimizer - Calculates optimal budget allocation across ad creatives.
 
-from typing import List, Dict, Set, Tuple
+Reactions are joined to persona attributes once into a columnar frame
+(one row per reaction), and per-ad, per-cluster and per-segment metrics are
+computed from it with grouped aggregations instead of rescanning the
+reaction list for every (cluster, ad) or (segment, ad) combination.
+"""
+
+from typing import List, Dict, Set, Tuple, Optional
 from collections import defaultdict, Counter
 import numpy as np
+import pandas as pd
 
 from src.utils.schemas import (
     EnrichedPersona, 
@@ -14,31 +21,74 @@ from src.utils.schemas import (
 
 class PortfolioOptimizer:
     """Sub-segment dominance analyzer for precision media planning."""
-    
+
+    def build_reaction_frame(
+        self,
+        reactions: List[AdReaction],
+        personas: List[EnrichedPersona]
+    ) -> pd.DataFrame:
+        """
+        One row per reaction, joined to the reacting persona's attributes.
+
+        Persona columns are NaN (and has_persona False) for reactions whose
+        persona is not in `personas`; the last persona wins on duplicate UUIDs.
+        """
+        frame = pd.DataFrame({
+            "persona_uuid": pd.Series([r.persona_uuid for r in reactions], dtype=object),
+            "ad_id": pd.Series([r.ad_id for r in reactions], dtype=object),
+            "trust": np.array([r.trust_score for r in reactions], dtype=np.int64),
+            "relevance": np.array([r.relevance_score for r in reactions], dtype=np.int64),
+            "is_click": np.array([r.action == "CLICK" for r in reactions], dtype=bool),
+            "is_high": np.array([r.intent_level == "High" for r in reactions], dtype=bool),
+            "is_medium": np.array([r.intent_level == "Medium" for r in reactions], dtype=bool),
+        })
+        frame["is_engaged"] = frame["is_click"] | frame["is_high"] | frame["is_medium"]
+
+        persona_frame = pd.DataFrame({
+            "persona_uuid": pd.Series([p.uuid for p in personas], dtype=object),
+            "zone": pd.Series([p.zone for p in personas], dtype=object),
+            "tier": pd.Series([p.purchasing_power_tier for p in personas], dtype=object),
+            "digital_literacy": np.array([p.digital_literacy for p in personas], dtype=np.int64),
+            "age": np.array([p.age for p in personas], dtype=np.int64),
+            "device": pd.Series([p.primary_device for p in personas], dtype=object),
+        }).drop_duplicates("persona_uuid", keep="last")
+        persona_frame["has_persona"] = True
+
+        frame = frame.merge(persona_frame, on="persona_uuid", how="left", sort=False)
+        frame["has_persona"] = frame["has_persona"].eq(True)
+        return frame
+
     def identify_specific_segment(
         self,
         leads: List[EnrichedPersona],
         reactions: List[AdReaction]
     ) -> Dict[str, any]:
         """
-        Analyzes a list of converted personas and finds the 'Oddly Specific' 
+        Analyzes a list of converted personas and finds the 'Oddly Specific'
         common denominators using statistical mode analysis.
-        
+
         Returns a dict with:
         - segment_name: Human-readable "oddly specific" target description
         - dominant_attributes: Key characteristics of this segment
         - confidence: How concentrated this segment is (0-1)
         """
+        # Create persona UUID to reaction map for trust scores
+        reaction_map = {r.persona_uuid: r for r in reactions}
+        return self._specific_segment(leads, reaction_map)
+
+    def _specific_segment(
+        self,
+        leads: List[EnrichedPersona],
+        reaction_map: Dict[str, AdReaction]
+    ) -> Dict[str, any]:
+        """identify_specific_segment with a prebuilt persona UUID -> reaction map."""
         if not leads:
             return {
                 "segment_name": "No Data",
                 "dominant_attributes": {},
                 "confidence": 0.0
             }
-        
-        # Create persona UUID to reaction map for trust scores
-        reaction_map = {r.persona_uuid: r for r in reactions}
-        
+
         # 1. Calculate frequency of every attribute
         states = [p.state for p in leads]
         occupations = [p.occupation for p in leads]
@@ -215,10 +265,13 @@ class PortfolioOptimizer:
         self,
         clusters: Dict[str, List[EnrichedPersona]],
         reactions: List[AdReaction],
-        ad_ids: List[str]
+        ad_ids: List[str],
+        frame: Optional[pd.DataFrame] = None
     ) -> Dict[str, Dict]:
         """
         Stage 2: For each cluster, find the ad with the highest Trust Score + Intent.
+
+        `frame` is an optional prebuilt build_reaction_frame() for the same reactions.
         
         Returns: Dict mapping cluster_id -> {
             "winning_ad": ad_id,
@@ -232,65 +285,39 @@ class PortfolioOptimizer:
         for cluster_id, personas in clusters.items():
             for persona in personas:
                 persona_uuid_to_cluster[persona.uuid] = cluster_id
-        
-        # Build reaction lookup
-        reaction_lookup = defaultdict(list)
-        for reaction in reactions:
-            reaction_lookup[reaction.persona_uuid].append(reaction)
-        
+
+        if frame is None:
+            frame = self.build_reaction_frame(reactions, [])
+
+        # Per (cluster, ad) sufficient statistics in one grouped pass
+        clustered = frame.assign(cluster=frame["persona_uuid"].map(persona_uuid_to_cluster))
+        clustered = clustered[clustered["cluster"].notna()]
+        cell_stats = clustered.groupby(["cluster", "ad_id"], sort=False).agg(
+            impressions=("trust", "size"),
+            high_intent=("is_high", "sum"),
+            trust_sum=("trust", "sum"),
+            relevance_sum=("relevance", "sum"),
+        ).to_dict("index")
+
+        reaction_maps = self._reaction_maps_by_ad(reactions)
         segment_ownership = {}
-        
+
         for cluster_id, personas in clusters.items():
             if not personas:
                 continue
-            
+
             # Calculate performance of each ad for this specific cluster
             ad_scores = {}
-            
+
             for ad_id in ad_ids:
-                # Get all reactions for this cluster + ad combo
-                cluster_reactions = []
-                for persona in personas:
-                    persona_reactions = reaction_lookup.get(persona.uuid, [])
-                    cluster_reactions.extend([
-                        r for r in persona_reactions if r.ad_id == ad_id
-                    ])
-                
-                if not cluster_reactions:
-                    ad_scores[ad_id] = {
-                        "score": 0,
-                        "trust": 0,
-                        "relevance": 0,
-                        "conversion_rate": 0,
-                        "high_intent_count": 0,
-                        "total_impressions": 0
-                    }
-                    continue
-                
-                # Calculate metrics for this ad within this cluster
-                high_intent_count = sum(1 for r in cluster_reactions if r.intent_level == "High")
-                clicks = sum(1 for r in cluster_reactions if r.action == "CLICK")
-                avg_trust = np.mean([r.trust_score for r in cluster_reactions])
-                avg_relevance = np.mean([r.relevance_score for r in cluster_reactions])
-                
-                conversion_rate = (high_intent_count / len(cluster_reactions)) if cluster_reactions else 0
-                
-                # Score = Trust * Relevance * Conversion Rate * Volume
-                # Prioritize INTENSITY over VOLUME
-                intensity_score = avg_trust * avg_relevance * (conversion_rate * 100)
-                volume_bonus = min(high_intent_count, 10)  # Cap volume bonus at 10
-                
-                final_score = intensity_score * (1 + volume_bonus / 20)
-                
-                ad_scores[ad_id] = {
-                    "score": final_score,
-                    "trust": avg_trust,
-                    "relevance": avg_relevance,
-                    "conversion_rate": conversion_rate * 100,
-                    "high_intent_count": high_intent_count,
-                    "total_impressions": len(cluster_reactions)
-                }
-            
+                cell = cell_stats.get((cluster_id, ad_id), {})
+                ad_scores[ad_id] = self.score_cluster_ad(
+                    int(cell.get("impressions", 0)),
+                    int(cell.get("high_intent", 0)),
+                    int(cell.get("trust_sum", 0)),
+                    int(cell.get("relevance_sum", 0))
+                )
+
             # Find winning ad for this cluster
             if not ad_scores:
                 continue
@@ -304,11 +331,11 @@ class PortfolioOptimizer:
             
             # Generate reasoning for why this ad owns this segment
             reasoning = self._generate_segment_reasoning(
-                cluster_id, 
-                personas, 
-                winning_ad, 
+                cluster_id,
+                personas,
+                winning_ad,
                 winning_metrics,
-                reactions
+                reaction_maps.get(winning_ad, {})
             )
             
             segment_ownership[cluster_id] = {
@@ -331,19 +358,63 @@ class PortfolioOptimizer:
         
         return segment_ownership
     
+    def score_cluster_ad(
+        self,
+        impressions: int,
+        high_intent_count: int,
+        trust_sum: int,
+        relevance_sum: int
+    ) -> Dict[str, float]:
+        """Score one ad within one cluster from its sufficient statistics."""
+        if not impressions:
+            return {
+                "score": 0,
+                "trust": 0,
+                "relevance": 0,
+                "conversion_rate": 0,
+                "high_intent_count": 0,
+                "total_impressions": 0
+            }
+
+        avg_trust = np.float64(trust_sum) / impressions
+        avg_relevance = np.float64(relevance_sum) / impressions
+        conversion_rate = high_intent_count / impressions
+
+        # Score = Trust * Relevance * Conversion Rate * Volume
+        # Prioritize INTENSITY over VOLUME
+        intensity_score = avg_trust * avg_relevance * (conversion_rate * 100)
+        volume_bonus = min(high_intent_count, 10)  # Cap volume bonus at 10
+
+        final_score = intensity_score * (1 + volume_bonus / 20)
+
+        return {
+            "score": final_score,
+            "trust": avg_trust,
+            "relevance": avg_relevance,
+            "conversion_rate": conversion_rate * 100,
+            "high_intent_count": high_intent_count,
+            "total_impressions": impressions
+        }
+
+    def _reaction_maps_by_ad(self, reactions: List[AdReaction]) -> Dict[str, Dict[str, AdReaction]]:
+        """ad_id -> {persona_uuid: reaction} in one pass (last reaction wins, as in identify_specific_segment)."""
+        maps = defaultdict(dict)
+        for reaction in reactions:
+            maps[reaction.ad_id][reaction.persona_uuid] = reaction
+        return maps
+
     def _generate_segment_reasoning(
         self,
         cluster_id: str,
         personas: List[EnrichedPersona],
         winning_ad: str,
         metrics: Dict,
-        reactions: List[AdReaction]
+        reaction_map: Dict[str, AdReaction]
     ) -> str:
         """Generate human-readable reasoning for why this ad owns this segment."""
-        
-        # Get specific segment description
-        ad_reactions = [r for r in reactions if r.ad_id == winning_ad]
-        segment_info = self.identify_specific_segment(personas, ad_reactions)
+
+        # Get specific segment description (reaction_map: this ad's reactions by persona)
+        segment_info = self._specific_segment(personas, reaction_map)
         
         trust = metrics["trust"]
         conversion = metrics["conversion_rate"]
@@ -373,116 +444,110 @@ class PortfolioOptimizer:
     def calculate_ad_performance(
         self,
         reactions: List[AdReaction],
-        personas: List[EnrichedPersona]
+        personas: List[EnrichedPersona],
+        frame: Optional[pd.DataFrame] = None
     ) -> Dict[str, AdPerformance]:
         """Aggregate performance metrics per ad."""
-        persona_map = {p.uuid: p for p in personas}
-        ad_stats = defaultdict(lambda: {
-            "impressions": 0,
-            "clicks": 0,
-            "high_intent_leads": 0,
-            "reached_personas": set()
-        })
-        
-        for reaction in reactions:
-            ad_id = reaction.ad_id
-            ad_stats[ad_id]["impressions"] += 1
-            
-            if reaction.action == "CLICK":
-                ad_stats[ad_id]["clicks"] += 1
-            
-            if reaction.intent_level == "High":
-                ad_stats[ad_id]["high_intent_leads"] += 1
-            
-            ad_stats[ad_id]["reached_personas"].add(reaction.persona_uuid)
-        
+        if frame is None:
+            frame = self.build_reaction_frame(reactions, personas)
+
+        ad_stats = frame.groupby("ad_id", sort=False).agg(
+            impressions=("persona_uuid", "size"),
+            clicks=("is_click", "sum"),
+            high_intent_leads=("is_high", "sum"),
+            unique_reach=("persona_uuid", "nunique"),
+        )
+
         # Convert to AdPerformance objects
         performances = {}
-        for ad_id, stats in ad_stats.items():
-            click_rate = stats["clicks"] / stats["impressions"] if stats["impressions"] > 0 else 0
-            conversion_rate = stats["high_intent_leads"] / stats["impressions"] if stats["impressions"] > 0 else 0
-            
+        for ad_id, stats in zip(ad_stats.index, ad_stats.itertuples(index=False)):
+            impressions = int(stats.impressions)
+            clicks = int(stats.clicks)
+            high_intent_leads = int(stats.high_intent_leads)
+            click_rate = clicks / impressions if impressions > 0 else 0
+            conversion_rate = high_intent_leads / impressions if impressions > 0 else 0
+
             performances[ad_id] = AdPerformance(
                 ad_id=ad_id,
-                total_impressions=stats["impressions"],
-                clicks=stats["clicks"],
-                high_intent_leads=stats["high_intent_leads"],
+                total_impressions=impressions,
+                clicks=clicks,
+                high_intent_leads=high_intent_leads,
                 click_rate=round(click_rate * 100, 2),
                 conversion_rate=round(conversion_rate * 100, 2),
-                unique_reach=len(stats["reached_personas"])
+                unique_reach=int(stats.unique_reach)
             )
-        
+
         return performances
-    
+
     def calculate_audience_overlap(
         self,
-        reactions: List[AdReaction]
+        reactions: List[AdReaction],
+        frame: Optional[pd.DataFrame] = None
     ) -> Dict[str, Dict[str, float]]:
         """Calculate overlap between ad audiences."""
-        # Build persona sets for each ad
-        ad_audiences = defaultdict(set)
-        for reaction in reactions:
-            if reaction.action == "CLICK" or reaction.intent_level in ["High", "Medium"]:
-                ad_audiences[reaction.ad_id].add(reaction.persona_uuid)
-        
-        # Calculate pairwise overlaps
-        ad_ids = list(ad_audiences.keys())
+        if frame is None:
+            frame = self.build_reaction_frame(reactions, [])
+
+        # Persona x ad membership matrix of engaged audiences
+        engaged = frame[frame["is_engaged"]]
+        ad_codes, ad_ids = pd.factorize(engaged["ad_id"])
+        persona_codes, persona_uuids = pd.factorize(engaged["persona_uuid"])
+        membership = np.zeros((len(persona_uuids), len(ad_ids)), dtype=np.int64)
+        membership[persona_codes, ad_codes] = 1
+
+        # shared[a, b] = |audience_a & audience_b|; diagonal is each audience size
+        shared = membership.T @ membership
         overlap_matrix = {}
-        
-        for ad_a in ad_ids:
+
+        for a, ad_a in enumerate(ad_ids):
             overlap_matrix[ad_a] = {}
-            audience_a = ad_audiences[ad_a]
-            
-            for ad_b in ad_ids:
-                if ad_a == ad_b:
+            audience_size = int(shared[a, a])
+
+            for b, ad_b in enumerate(ad_ids):
+                if a == b:
                     overlap_matrix[ad_a][ad_b] = 1.0
-                    continue
-                
-                audience_b = ad_audiences[ad_b]
-                if len(audience_a) == 0:
+                elif audience_size == 0:
                     overlap_matrix[ad_a][ad_b] = 0.0
                 else:
-                    overlap = len(audience_a & audience_b)
-                    overlap_pct = overlap / len(audience_a)
-                    overlap_matrix[ad_a][ad_b] = round(overlap_pct, 3)
-        
+                    overlap_matrix[ad_a][ad_b] = round(int(shared[a, b]) / audience_size, 3)
+
         return overlap_matrix
-    
+
     def identify_audience_segments(
         self,
         reactions: List[AdReaction],
-        personas: List[EnrichedPersona]
+        personas: List[EnrichedPersona],
+        frame: Optional[pd.DataFrame] = None
     ) -> Dict[str, Dict[str, int]]:
         """Identify dominant audience segments per ad dynamically from actual data."""
-        persona_map = {p.uuid: p for p in personas}
-        ad_segments = defaultdict(lambda: defaultdict(int))
-        
-        for reaction in reactions:
-            if reaction.action == "CLICK" or reaction.intent_level in ["High", "Medium"]:
-                persona = persona_map.get(reaction.persona_uuid)
-                if not persona:
-                    continue
-                
-                # Create dynamic segment keys based on persona characteristics
-                # We'll create multiple segment dimensions
-                
-                # 1. Geographic + Income segment
-                geo_income = f"{persona.zone}_{persona.purchasing_power_tier}"
-                ad_segments[reaction.ad_id][geo_income] += 1
-                
-                # 2. Digital literacy segment
-                literacy_segment = f"Digital_{self._categorize_literacy(persona.digital_literacy)}"
-                ad_segments[reaction.ad_id][literacy_segment] += 1
-                
-                # 3. Age group segment
-                age_segment = self._categorize_age(persona.age)
-                ad_segments[reaction.ad_id][age_segment] += 1
-                
-                # 4. Device segment
-                ad_segments[reaction.ad_id][f"Device_{persona.primary_device}"] += 1
-        
+        if frame is None:
+            frame = self.build_reaction_frame(reactions, personas)
+
+        engaged = frame[frame["is_engaged"] & frame["has_persona"]]
+        if engaged.empty:
+            return {}
+
+        # Each engaged reaction counts once in four segment dimensions:
+        # geographic + income, digital literacy, age group, device
+        segment_keys = np.column_stack([
+            (engaged["zone"] + "_" + engaged["tier"]).to_numpy(),
+            "Digital_" + self._categorize_literacy_array(engaged["digital_literacy"].to_numpy()),
+            self._categorize_age_array(engaged["age"].to_numpy()),
+            ("Device_" + engaged["device"]).to_numpy(),
+        ])
+        long = pd.DataFrame({
+            "ad_id": np.repeat(engaged["ad_id"].to_numpy(), segment_keys.shape[1]),
+            "segment": segment_keys.ravel(),
+        })
+        # sort=False keeps first-seen order for ads and for segments within an ad
+        counts = long.groupby(["ad_id", "segment"], sort=False).size()
+
+        ad_segments = defaultdict(dict)
+        for (ad_id, segment), count in counts.items():
+            ad_segments[ad_id][segment] = int(count)
+
         return dict(ad_segments)
-    
+
     def _categorize_literacy(self, score: int) -> str:
         """Categorize digital literacy score into segment."""
         if score >= 8:
@@ -502,6 +567,18 @@ class PortfolioOptimizer:
             return "Middle_Age_35-49"
         else:
             return "Senior_50+"
+
+    def _categorize_literacy_array(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorized _categorize_literacy."""
+        return np.select([scores >= 8, scores >= 5], ["High", "Medium"], default="Low").astype(object)
+
+    def _categorize_age_array(self, ages: np.ndarray) -> np.ndarray:
+        """Vectorized _categorize_age."""
+        return np.select(
+            [ages < 25, ages < 35, ages < 50],
+            ["Youth_18-24", "Young_Adults_25-34", "Middle_Age_35-49"],
+            default="Senior_50+"
+        ).astype(object)
     
     def detect_clickbait_traps(
         self,
@@ -522,41 +599,29 @@ class PortfolioOptimizer:
         
         return traps
     
-    def optimize_portfolio(
+    def allocate_budget(
         self,
-        reactions: List[AdReaction],
-        personas: List[EnrichedPersona],
-        max_ads: int = 3
-    ) -> Dict:
+        segment_ownership: Dict[str, Dict],
+        ad_ids: List[str],
+        performances: Dict[str, AdPerformance],
+        max_ads: int = 3,
+        cluster_weights: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, Dict], List[str], Dict[str, float]]:
         """
-        Generate optimal ad portfolio using Sub-Segment Dominance Analysis.
-        
-        Instead of "Winner-Take-All", this finds which ad owns which niche,
-        allocating budget based on segment value and intensity of intent.
+        Stage 3: Split budget across ads in proportion to the value of the segments they own.
+
+        Only needs each owner's winning_ad, high_intent_count, trust_score and
+        relevance_score. cluster_weights (cluster size / personas simulated, from an
+        early-stopped adaptive run) scale each segment's high-intent count up to the
+        whole cluster, so clusters sampled more heavily don't get a larger share.
+        Returns (ad_budget_allocation, selected_ads, segment_values).
         """
-        
-        # Calculate basic performance metrics (for reference)
-        performances = self.calculate_ad_performance(reactions, personas)
-        overlaps = self.calculate_audience_overlap(reactions)
-        old_segments = self.identify_audience_segments(reactions, personas)
-        clickbait_alerts = self.detect_clickbait_traps(performances)
-        
-        # NEW LOGIC: Sub-Segment Dominance Analysis
-        
-        # Stage 1: Fragment the audience into logical clusters
-        clusters = self.fragment_audience_into_clusters(personas)
-        
-        # Stage 2: Assign Segment Owners (which ad owns which cluster?)
-        ad_ids = list(performances.keys())
-        segment_ownership = self.assign_segment_owners(clusters, reactions, ad_ids)
-        
-        # Stage 3: Allocate Budget Proportionally to Segment Value
-        
         # Calculate the "value" of each segment (high-intent count * avg trust * avg relevance)
         segment_values = {}
         for cluster_id, ownership in segment_ownership.items():
+            weight = cluster_weights.get(cluster_id, 1.0) if cluster_weights else 1.0
             value = (
-                ownership["high_intent_count"] * 
+                ownership["high_intent_count"] * weight *
                 ownership["trust_score"] * 
                 ownership["relevance_score"] / 10  # Normalize
             )
@@ -611,9 +676,51 @@ class PortfolioOptimizer:
                 ad_budget_allocation[ad]["budget_pct"] = (
                     ad_budget_allocation[ad]["budget_pct"] / total_allocated * 100
                 )
+
+        return ad_budget_allocation, selected_ads, segment_values
+
+    def optimize_portfolio(
+        self,
+        reactions: List[AdReaction],
+        personas: List[EnrichedPersona],
+        max_ads: int = 3,
+        cluster_weights: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """
+        Generate optimal ad portfolio using Sub-Segment Dominance Analysis.
+        
+        Instead of "Winner-Take-All", this finds which ad owns which niche,
+        allocating budget based on segment value and intensity of intent.
+        cluster_weights: see allocate_budget (adaptive_sampling["cluster_weights"]).
+        """
+        
+        # One columnar pass over reactions + persona attributes, shared by every aggregation
+        frame = self.build_reaction_frame(reactions, personas)
+
+        # Calculate basic performance metrics (for reference)
+        performances = self.calculate_ad_performance(reactions, personas, frame=frame)
+        overlaps = self.calculate_audience_overlap(reactions, frame=frame)
+        old_segments = self.identify_audience_segments(reactions, personas, frame=frame)
+        clickbait_alerts = self.detect_clickbait_traps(performances)
+        
+        # NEW LOGIC: Sub-Segment Dominance Analysis
+        
+        # Stage 1: Fragment the audience into logical clusters
+        clusters = self.fragment_audience_into_clusters(personas)
+        
+        # Stage 2: Assign Segment Owners (which ad owns which cluster?)
+        ad_ids = list(performances.keys())
+        segment_ownership = self.assign_segment_owners(clusters, reactions, ad_ids, frame=frame)
         
+        # Stage 3: Allocate Budget Proportionally to Segment Value
+        
+        ad_budget_allocation, selected_ads, segment_values = self.allocate_budget(
+            segment_ownership, ad_ids, performances, max_ads, cluster_weights
+        )
+
         # Build recommendations with "oddly specific" target segments
         recommendations = []
+        reaction_maps = self._reaction_maps_by_ad(reactions)
         
         for ad_id in selected_ads:
             allocation = ad_budget_allocation[ad_id]
@@ -629,10 +736,10 @@ class PortfolioOptimizer:
             personas_in_segment = ownership["personas"]
             
             # Get reactions for this ad
-            ad_reactions = [r for r in reactions if r.ad_id == ad_id]
-            
+            reaction_map = reaction_maps.get(ad_id, {})
+
             # Generate "oddly specific" segment description
-            segment_info = self.identify_specific_segment(personas_in_segment, ad_reactions)
+            segment_info = self._specific_segment(personas_in_segment, reaction_map)
             target_segment = segment_info["segment_name"]
             
             # Determine role based on segment characteristics and performance
@@ -641,7 +748,7 @@ class PortfolioOptimizer:
                 ownership, 
                 segment_info, 
                 performances[ad_id],
-                ad_reactions,
+                list(reaction_map.values()),
                 personas_in_segment
             )
             
@@ -742,20 +849,16 @@ class PortfolioOptimizer:
         ad_ids: List[str]
     ) -> Dict:
         """Generate visual heatmap data for UI with dynamically discovered segments."""
-        persona_map = {p.uuid: p for p in personas}
-        
+        frame = self.build_reaction_frame(reactions, personas)
+        known = frame[frame["has_persona"]]
+
         # Dynamically discover all unique segments from actual data
-        discovered_segments = set()
-        for reaction in reactions:
-            if reaction.action == "CLICK" or reaction.intent_level in ["High", "Medium"]:
-                persona = persona_map.get(reaction.persona_uuid)
-                if persona:
-                    segment = f"{persona.zone}_{persona.purchasing_power_tier}"
-                    discovered_segments.add(segment)
-        
+        engaged = known[known["is_engaged"]]
+        discovered_segments = set(zip(engaged["zone"], engaged["tier"]))
+
         # Sort segments for consistent ordering
-        segments = sorted(list(discovered_segments))
-        
+        segments = sorted(f"{zone}_{tier}" for zone, tier in discovered_segments)
+
         if not segments:
             # If no segments discovered, return empty heatmap
             return {
@@ -763,36 +866,27 @@ class PortfolioOptimizer:
                 "cols": ad_ids,
                 "matrix": [["⚪" for _ in ad_ids]]
             }
-        
+
+        # Conversion rate per (zone, tier, ad) over all reactions of known personas
+        cell_stats = known.groupby(["zone", "tier", "ad_id"], sort=False).agg(
+            impressions=("is_high", "size"),
+            high_intent=("is_high", "sum"),
+        ).to_dict("index")
+
         # Build matrix
         matrix = []
         for segment in segments:
+            zone, tier = segment.split("_")[:2]
             row = []
             for ad_id in ad_ids:
-                # Filter reactions for this segment + ad
-                segment_parts = segment.split("_")
-                if len(segment_parts) < 2:
-                    row.append("⚪")
-                    continue
-                    
-                zone, tier = segment_parts[0], segment_parts[1]
-                
-                matching_reactions = [
-                    r for r in reactions
-                    if r.ad_id == ad_id
-                    and persona_map.get(r.persona_uuid)
-                    and persona_map[r.persona_uuid].zone == zone
-                    and persona_map[r.persona_uuid].purchasing_power_tier == tier
-                ]
-                
-                if not matching_reactions:
+                cell = cell_stats.get((zone, tier, ad_id))
+                if cell is None:
                     row.append("⚪")  # No data
                     continue
-                
+
                 # Calculate conversion rate
-                high_intent = sum(1 for r in matching_reactions if r.intent_level == "High")
-                conv_rate = high_intent / len(matching_reactions)
-                
+                conv_rate = int(cell["high_intent"]) / int(cell["impressions"])
+
                 # Map to emoji
                 if conv_rate >= 0.3:
                     row.append("🟢")  # Strong
@@ -802,9 +896,9 @@ class PortfolioOptimizer:
                     row.append("🟠")  # Weak
                 else:
                     row.append("🔴")  # Poor
-            
+
             matrix.append(row)
-        
+
         return {
             "rows": segments,
             "cols": ad_ids,
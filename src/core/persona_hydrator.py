@@ -1,12 +1,16 @@
 """Persona hydration layer - enriches raw personas with psychographic data."""
 
 import asyncio
+import hashlib
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tqdm.asyncio import tqdm
 
 from src.utils.schemas import RawPersona, EnrichedPersona
 from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
+from src.data.persona_store import hydrated_persona_store
+from src.utils.config import HYDRATION_STORE_ENABLED
 
 
 class PersonaHydrator:
@@ -47,8 +51,23 @@ Guidelines:
 - Risk tolerance HIGH if: Young + Mid-High income + Urban
 """
     
+    def __init__(self, store=hydrated_persona_store, use_store: bool = HYDRATION_STORE_ENABLED):
+        self.store = store
+        self.use_store = use_store
+    
+    @property
+    def prompt_version(self) -> str:
+        """Hash of hydration prompt + model; stored personas are only reused for the same version."""
+        blob = f"{gemini_client.flash_model}\n{self.HYDRATION_PROMPT_TEMPLATE}".encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()[:16]
+    
     async def hydrate_persona(self, persona: RawPersona) -> EnrichedPersona:
         """Enrich a single persona with psychographic data, preserving rich narratives."""
+        enriched = await self._hydrate_with_llm(persona)
+        return enriched if enriched is not None else self._fallback_enrichment(persona)
+    
+    async def _hydrate_with_llm(self, persona: RawPersona) -> Optional[EnrichedPersona]:
+        """LLM enrichment; returns None on failure so callers can tell it apart from the fallback."""
         prompt = self.HYDRATION_PROMPT_TEMPLATE.format(
             occupation=persona.occupation,
             district=persona.district,
@@ -61,7 +80,8 @@ Guidelines:
         )
         
         try:
-            response = await gemini_client.generate_flash(prompt)
+            with llm_caller("hydration"):
+                response = await gemini_client.generate_flash(prompt)
             enriched_data = gemini_client.parse_json_response(response)
             
             # Merge raw and enriched data - PRESERVE all rich narrative fields
@@ -90,8 +110,8 @@ Guidelines:
                 **enriched_data
             )
         except Exception as e:
-            # Fallback to heuristic enrichment
-            return self._fallback_enrichment(persona)
+            # Caller falls back to heuristic enrichment
+            return None
     
     def _fallback_enrichment(self, persona: RawPersona) -> EnrichedPersona:
         """Rule-based fallback if LLM fails."""
@@ -133,9 +153,35 @@ Guidelines:
         )
     
     async def hydrate_batch(self, personas: list[RawPersona]) -> list[EnrichedPersona]:
-        """Hydrate multiple personas concurrently."""
-        tasks = [self.hydrate_persona(p) for p in personas]
-        return await tqdm.gather(*tasks, desc="Hydrating personas")
+        """Hydrate multiple personas concurrently.
+        
+        Personas already hydrated with the current prompt version are served from the
+        persistent store; only misses go to the LLM. Heuristic fallbacks are never stored.
+        """
+        version = self.prompt_version
+        cached: Dict[str, EnrichedPersona] = {}
+        if self.use_store and self.store is not None:
+            cached = self.store.get_many([p.uuid for p in personas], version)
+        
+        misses = [p for p in personas if p.uuid not in cached]
+        if cached:
+            print(f"💾 Hydration store: {len(personas) - len(misses)} cached, {len(misses)} to hydrate")
+        
+        fresh: Dict[str, EnrichedPersona] = {}
+        if misses:
+            tasks = [self._hydrate_with_llm(p) for p in misses]
+            results = await tqdm.gather(*tasks, desc="Hydrating personas")
+            to_store = []
+            for persona, enriched in zip(misses, results):
+                if enriched is None:
+                    fresh[persona.uuid] = self._fallback_enrichment(persona)
+                else:
+                    fresh[persona.uuid] = enriched
+                    to_store.append(enriched)
+            if self.use_store and self.store is not None:
+                self.store.put_many(to_store, version)
+        
+        return [cached.get(p.uuid) or fresh[p.uuid] for p in personas]
 
 
 # Global singleton
@@ -0,0 +1,281 @@
+"""Precompiled reaction prompts assembled from cached segments.
+
+A template is parsed once into segments by what its fields depend on:
+
+  static   - product-category constants (action thresholds ...), rendered once
+  persona  - the persona's own fields, rendered once per persona
+  ad       - ad copy and visual anchor, rendered once per ad
+  call     - everything else (batch labels, item lists), rendered per call
+
+Literal text between two fields of the same persona / ad scope belongs to that
+segment, so a prompt is a join of a handful of cached strings instead of a
+str.format over the whole template. Rendered prompts are identical to
+template.format(**fields).
+
+Layouts (PROMPT_LAYOUT):
+
+  inline        - system prompt + the rendered template (the original prompts)
+  static_first  - the template goes into the system prompt with every per-call
+                  value left as a [[field]] placeholder, and the user message only
+                  carries the values. (Templates already use <...> for answer slots
+                  in their JSON schema, so placeholders need a syntax of their own.) The whole system message is then the same
+                  for every persona and ad of a category, so provider-side
+                  prompt caching can reuse it.
+"""
+
+import string
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.config import PROMPT_LAYOUT, PROMPT_SEGMENT_CACHE_SIZE
+
+STATIC, PERSONA, AD, CALL = "static", "persona", "ad", "call"
+PLACEHOLDER = "[[{}]]"
+PROMPT_LAYOUTS = ("inline", "static_first")
+
+# Piece = (field name or None for literal text, literal text)
+Piece = Tuple[Optional[str], str]
+
+
+class PromptTemplate:
+    """A template split into (scope, pieces) segments."""
+
+    def __init__(self, template: str, scope_of: Callable[[str], str]):
+        pieces: List[Tuple[Optional[str], Piece]] = []  # (scope, piece)
+        self.fields: Dict[str, str] = {}
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if literal:
+                pieces.append((None, (None, literal)))
+            if field is not None:
+                if spec or conversion or not field.isidentifier():
+                    raise ValueError(f"Unsupported prompt field: {{{field}}}")
+                scope = scope_of(field)
+                self.fields.setdefault(field, scope)
+                pieces.append((scope, (field, "")))
+
+        # Literal text takes the scope of its neighbours when both are the same
+        # persona / ad scope, everything else between fields is static
+        scopes = [scope for scope, _ in pieces]
+        for i, (scope, _) in enumerate(pieces):
+            if scope is not None:
+                continue
+            before = next((s for s in reversed(scopes[:i]) if s is not None), None)
+            after = next((s for s in scopes[i + 1:] if s is not None), None)
+            scopes[i] = before if before == after and before in (PERSONA, AD) else STATIC
+
+        self.segments: List[Tuple[str, List[Piece]]] = []
+        for scope, (_, piece) in zip(scopes, pieces):
+            if self.segments and self.segments[-1][0] == scope:
+                self.segments[-1][1].append(piece)
+            else:
+                self.segments.append((scope, [piece]))
+
+    def scope_segments(self, scope: str) -> List[int]:
+        return [i for i, (s, _) in enumerate(self.segments) if s == scope]
+
+    @staticmethod
+    def render_pieces(pieces: List[Piece], values: Dict[str, Any], placeholders: bool = False) -> str:
+        return "".join(
+            text if field is None else (PLACEHOLDER.format(field) if placeholders else str(values[field]))
+            for field, text in pieces
+        )
+
+
+class _LRU(OrderedDict):
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get_entry(self, key):
+        entry = self.get(key)
+        if entry is not None:
+            self.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class _Entry:
+    """Cached values and rendered segments of one persona / ad."""
+
+    __slots__ = ("refs", "values", "rendered")
+
+    def __init__(self, refs: tuple, values: Dict[str, Any]):
+        self.refs = refs  # objects the entry was built from; reused only for the same objects
+        self.values = values
+        self.rendered: Dict[Any, Any] = {}  # template -> segments, ("values", template) -> values block
+
+
+class PromptBuilder:
+    """Renders prompts from compiled templates, caching per-persona / per-ad segments.
+
+    persona_fields(persona) and ad_fields(ad, anchor) return the values of the
+    persona_keys / ad_keys fields; static_fields(key) those of a product category.
+    Any other template field is passed per call.
+    """
+
+    def __init__(
+        self,
+        persona_keys: Iterable[str],
+        persona_fields: Callable[[Any], Dict[str, Any]],
+        ad_keys: Iterable[str],
+        ad_fields: Callable[[Any, Any], Dict[str, Any]],
+        static_fields: Callable[[str], Dict[str, Any]],
+        cache_size: int = PROMPT_SEGMENT_CACHE_SIZE,
+    ):
+        self.persona_keys = frozenset(persona_keys)
+        self.ad_keys = frozenset(ad_keys)
+        self.persona_fields = persona_fields
+        self.ad_fields = ad_fields
+        self.static_fields = static_fields
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._static: Dict[Tuple[str, str], Dict[str, Any]] = {}  # (template, static key) -> rendered parts
+        self._personas = _LRU(cache_size)  # uuid -> _Entry
+        self._ads = _LRU(cache_size)  # ad_id -> _Entry
+        self.stats = {"persona_hits": 0, "persona_misses": 0, "ad_hits": 0, "ad_misses": 0}
+
+    def _compile(self, template: str, static_key: str) -> PromptTemplate:
+        compiled = self._templates.get(template)
+        if compiled is None:
+            static_keys = self.static_fields(static_key).keys()
+
+            def scope_of(field: str) -> str:
+                if field in self.persona_keys:
+                    return PERSONA
+                if field in self.ad_keys:
+                    return AD
+                return STATIC if field in static_keys else CALL
+
+            compiled = self._templates[template] = PromptTemplate(template, scope_of)
+        return compiled
+
+    def _persona_entry(self, persona) -> _Entry:
+        entry = self._personas.get_entry(persona.uuid)
+        if entry is None or entry.refs[0] is not persona:
+            self.stats["persona_misses"] += 1
+            entry = _Entry((persona,), self.persona_fields(persona))
+            self._personas.put(persona.uuid, entry)
+        else:
+            self.stats["persona_hits"] += 1
+        return entry
+
+    def _ad_entry(self, ad, anchor) -> _Entry:
+        entry = self._ads.get_entry(ad.ad_id)
+        if entry is None or entry.refs[0] is not ad or entry.refs[1] is not anchor:
+            self.stats["ad_misses"] += 1
+            entry = _Entry((ad, anchor), self.ad_fields(ad, anchor))
+            self._ads.put(ad.ad_id, entry)
+        else:
+            self.stats["ad_hits"] += 1
+        return entry
+
+    def _static_parts(self, template: str, compiled: PromptTemplate, static_key: str) -> Dict[str, Any]:
+        key = (template, static_key)
+        parts = self._static.get(key)
+        if parts is None:
+            values = self.static_fields(static_key)
+            parts = self._static[key] = {
+                "segments": {
+                    i: PromptTemplate.render_pieces(pieces, values)
+                    for i, (scope, pieces) in enumerate(compiled.segments) if scope == STATIC
+                },
+                # static_first: static values filled in, everything else a [[field]] placeholder
+                "skeleton": "".join(
+                    PromptTemplate.render_pieces(pieces, values, placeholders=scope != STATIC)
+                    for scope, pieces in compiled.segments
+                ),
+            }
+        return parts
+
+    @staticmethod
+    def _segments(entry: _Entry, template: str, compiled: PromptTemplate, scope: str) -> Dict[int, str]:
+        segments = entry.rendered.get(template)
+        if segments is None:
+            segments = entry.rendered[template] = {
+                i: PromptTemplate.render_pieces(compiled.segments[i][1], entry.values)
+                for i in compiled.scope_segments(scope)
+            }
+        return segments
+
+    def render(self, template: str, static_key: str, persona=None, ad=None, anchor=None, **call_fields: Any) -> str:
+        """template.format(...) with persona, ad, static and per-call fields, from cached segments."""
+        compiled = self._compile(template, static_key)
+        static = self._static_parts(template, compiled, static_key)["segments"]
+        persona_segments = ad_segments = {}
+        if persona is not None:
+            persona_segments = self._segments(self._persona_entry(persona), template, compiled, PERSONA)
+        if ad is not None:
+            ad_segments = self._segments(self._ad_entry(ad, anchor), template, compiled, AD)
+
+        parts = []
+        for i, (scope, pieces) in enumerate(compiled.segments):
+            if scope == STATIC:
+                parts.append(static[i])
+            elif scope == PERSONA:
+                parts.append(persona_segments[i])
+            elif scope == AD:
+                parts.append(ad_segments[i])
+            else:
+                parts.append(PromptTemplate.render_pieces(pieces, call_fields))
+        return "".join(parts)
+
+    def build(
+        self,
+        template: str,
+        system_prompt: str,
+        static_key: str,
+        persona=None,
+        ad=None,
+        anchor=None,
+        layout: Optional[str] = None,
+        **call_fields: Any,
+    ) -> Tuple[str, str]:
+        """(system prompt, user prompt) in the given layout (default PROMPT_LAYOUT)."""
+        layout = layout or PROMPT_LAYOUT
+        if layout == "inline":
+            return system_prompt, self.render(template, static_key, persona, ad, anchor, **call_fields)
+        if layout != "static_first":
+            raise ValueError(f"Unknown prompt layout: {layout}. Use one of {PROMPT_LAYOUTS}.")
+
+        compiled = self._compile(template, static_key)
+        skeleton = self._static_parts(template, compiled, static_key)["skeleton"]
+        system = (
+            f"{system_prompt}\n\n"
+            "═══ REACTION BRIEF (the user message gives the value of every [[placeholder]]) ═══\n"
+            f"{skeleton}"
+        )
+        blocks = []
+        if persona is not None:
+            blocks.append(self._values_block(self._persona_entry(persona), template, compiled, PERSONA))
+        if ad is not None:
+            blocks.append(self._values_block(self._ad_entry(ad, anchor), template, compiled, AD))
+        call_values = {f: call_fields[f] for f, scope in compiled.fields.items() if scope == CALL}
+        if call_values:
+            blocks.append(self._format_values(call_values))
+        return system, "VALUES FOR THIS REACTION:\n\n" + "\n".join(blocks)
+
+    def _values_block(self, entry: _Entry, template: str, compiled: PromptTemplate, scope: str) -> str:
+        key = ("values", template)
+        block = entry.rendered.get(key)
+        if block is None:
+            block = entry.rendered[key] = self._format_values(
+                {f: entry.values[f] for f, s in compiled.fields.items() if s == scope}
+            )
+        return block
+
+    @staticmethod
+    def _format_values(values: Dict[str, Any]) -> str:
+        lines = []
+        for field, value in values.items():
+            text = str(value)
+            name = PLACEHOLDER.format(field)
+            lines.append(f"{name}:\n{text.strip()}\n" if "\n" in text else f"{name}: {text}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        self._personas.clear()
+        self._ads.clear()
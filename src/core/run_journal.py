@@ -0,0 +1,135 @@
+"""Durable checkpoint journal for long simulation runs.
+
+Each completed reaction / journey is appended to a JSONL file as soon as it
+finishes, keyed by (persona, stimulus). Restarting with the same run id reads
+the journal back, so only the missing pairs are simulated again:
+
+  <RUN_JOURNAL_DIR>/<run_id>/journal.jsonl   one record per line
+  <RUN_JOURNAL_DIR>/<run_id>/personas.json   optional persona snapshot, so a resumed
+                                             run sees the same (hydrated) personas
+
+Lines are flushed after every write; a line cut short by a crash is ignored
+on load. Fallback results (LLM errors) are not journaled so they get retried.
+"""
+
+import json
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from src.core.base import FlowJourneyResult, FlowStepDecision
+from src.utils.config import RUN_JOURNAL_DIR
+from src.utils.schemas import AdReaction
+
+
+def _log_journal(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for the run journal."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[JOURNAL] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+def new_run_id(prefix: str = "run") -> str:
+    return f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def journey_from_dict(data: Dict[str, Any]) -> FlowJourneyResult:
+    fields = dict(data)
+    fields["decisions"] = [FlowStepDecision(**d) for d in fields.get("decisions", [])]
+    return FlowJourneyResult(**fields)
+
+
+class RunJournal:
+    """Append-only record of completed (persona, stimulus) results for one run id."""
+
+    def __init__(self, run_id: str, directory: str | Path = RUN_JOURNAL_DIR):
+        self.run_id = run_id
+        self.run_dir = Path(directory) / run_id
+        self.path = self.run_dir / "journal.jsonl"
+        self.personas_path = self.run_dir / "personas.json"
+        self.meta: Dict[str, Any] = {}
+        self._reactions: Dict[Tuple[str, str], AdReaction] = {}
+        self._journeys: Dict[Tuple[str, str], FlowJourneyResult] = {}
+        self._load()
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self._reactions or self._journeys or self.meta)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        skipped = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    kind, data = record["kind"], record["data"]
+                    if kind == "reaction":
+                        reaction = AdReaction(**data)
+                        self._reactions[(reaction.persona_uuid, reaction.ad_id)] = reaction
+                    elif kind == "journey":
+                        journey = journey_from_dict(data)
+                        self._journeys[(journey.persona_uuid, journey.flow_id)] = journey
+                    elif kind == "meta":
+                        self.meta.update(data)
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1  # torn last line from a crash
+        _log_journal("LOAD", "Resuming run", run_id=self.run_id, reactions=len(self._reactions),
+                     journeys=len(self._journeys), skipped_lines=skipped)
+
+    def _append(self, kind: str, data: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps({"kind": kind, "time": time.time(), "data": data}, ensure_ascii=False, default=str) + "\n")
+        self._fh.flush()
+
+    def set_meta(self, **data: Any) -> None:
+        self.meta.update(data)
+        self._append("meta", data)
+
+    def record_reaction(self, reaction: AdReaction) -> None:
+        self._reactions[(reaction.persona_uuid, reaction.ad_id)] = reaction
+        self._append("reaction", reaction.model_dump())
+
+    def record_journey(self, journey: FlowJourneyResult) -> None:
+        self._journeys[(journey.persona_uuid, journey.flow_id)] = journey
+        self._append("journey", asdict(journey))
+
+    def completed_reactions(self) -> Dict[Tuple[str, str], AdReaction]:
+        """(persona_uuid, ad_id) -> reaction."""
+        return dict(self._reactions)
+
+    def completed_journeys(self, flow_id: str) -> Dict[str, FlowJourneyResult]:
+        """persona_uuid -> journey for one flow."""
+        return {p: j for (p, f), j in self._journeys.items() if f == flow_id}
+
+    def save_personas(self, personas: List[Any]) -> None:
+        tmp = self.personas_path.with_suffix(".json.part")
+        tmp.write_text(json.dumps([p.model_dump() for p in personas], ensure_ascii=False, default=str), encoding="utf-8")
+        tmp.replace(self.personas_path)
+
+    def load_personas(self, model: Type[Any]) -> Optional[List[Any]]:
+        """Persona snapshot from an earlier attempt of this run, or None."""
+        if not self.personas_path.exists():
+            return None
+        return [model(**p) for p in json.loads(self.personas_path.read_text(encoding="utf-8"))]
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+
+def load_prior_run(run_id: str, persona_model: Type[Any], directory: str | Path = RUN_JOURNAL_DIR) -> Tuple[List[AdReaction], List[Any]]:
+    """Reactions and personas of an earlier run, as priors for a new run (e.g. Tier 1 assignment)."""
+    if not (Path(directory) / run_id / "journal.jsonl").exists():
+        raise FileNotFoundError(f"No run journal for {run_id} in {directory}")
+    journal = RunJournal(run_id, directory)
+    try:
+        return list(journal.completed_reactions().values()), journal.load_personas(persona_model) or []
+    finally:
+        journal.close()
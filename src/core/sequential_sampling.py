@@ -0,0 +1,211 @@
+"""Sequential early stopping for ad simulations.
+
+With adaptive sampling on, Tier 2 personas are simulated in randomized waves
+instead of all at once. After each wave SequentialStopper looks at:
+
+  - intervals of each ad's high-intent rate; the ranking is settled when the
+    leader's lower bound clears every other ad's upper bound
+  - the live budget split (LivePortfolio); it is stable once no ad's share
+    moved more than the tolerance for the configured number of waves
+  - per-cluster intervals; clusters whose owner is not yet separated from the
+    runner-up are sampled first in the next wave
+
+Because unsettled clusters (and the Tier 1 strategy) over-sample some clusters,
+both the ad rates and the split are post-stratified: an ad's rate is the mean of
+its per-cluster rates weighted by cluster share of the audience (Wilson interval
+at the Kish effective sample size), and each cluster's high-intent count in the
+split is scaled by cluster size / personas simulated (cluster_weights, also
+passed to the final optimize_portfolio). For a full run every weight is 1.
+
+The ranking is tested after every wave, so the confidence level is spent over
+the looks (O'Brien-Fleming-type alpha spending on the fraction of personas
+simulated): early looks need a much wider margin, and the chance of ever
+stopping on a wrong leader stays within the level of ADAPTIVE_CONFIDENCE_Z.
+
+The run stops once the ranking is settled, the split is stable and at least
+min_personas personas have been simulated. Remaining personas are skipped.
+"""
+
+import math
+import random
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.core.live_portfolio import LivePortfolio
+from src.utils.config import (
+    ADAPTIVE_CONFIDENCE_Z,
+    ADAPTIVE_MIN_PERSONAS,
+    ADAPTIVE_SPLIT_TOLERANCE,
+    ADAPTIVE_STABLE_WAVES,
+    ADAPTIVE_WAVE_SIZE,
+)
+from src.utils.schemas import AdReaction, EnrichedPersona
+
+
+def wilson_interval(successes: int, n: int, z: float = ADAPTIVE_CONFIDENCE_Z) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion ((0, 1) when n == 0)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def spent_alpha(alpha: float, fraction: float) -> float:
+    """O'Brien-Fleming-type spending function (Lan-DeMets): alpha used by information fraction."""
+    if fraction <= 0:
+        return 0.0
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    return min(alpha, 2 * (1 - NormalDist().cdf(z / math.sqrt(min(1.0, fraction)))))
+
+
+def _separated(intervals: Dict[str, Tuple[float, float, float]]) -> Tuple[Optional[str], bool]:
+    """(leader by point estimate, whether its interval clears every other one)."""
+    if not intervals:
+        return None, False
+    leader = max(intervals, key=lambda k: intervals[k][2])
+    if len(intervals) == 1:
+        return leader, True
+    lower = intervals[leader][0]
+    return leader, all(lower > hi for k, (_, hi, _) in intervals.items() if k != leader)
+
+
+class SequentialStopper:
+    """Decides after each wave whether more personas would change the decision."""
+
+    def __init__(
+        self,
+        personas: List[EnrichedPersona],
+        ad_ids: List[str],
+        max_ads: Optional[int] = None,
+        wave_size: int = ADAPTIVE_WAVE_SIZE,
+        min_personas: int = ADAPTIVE_MIN_PERSONAS,
+        tolerance: float = ADAPTIVE_SPLIT_TOLERANCE,
+        stable_waves: int = ADAPTIVE_STABLE_WAVES,
+        z: float = ADAPTIVE_CONFIDENCE_Z,
+    ):
+        self.live = LivePortfolio(personas, ad_ids)
+        self.max_ads = max_ads or len(ad_ids)
+        self.wave_size = max(1, wave_size)
+        self.min_personas = min_personas
+        self.tolerance = tolerance
+        self.stable_waves = max(1, stable_waves)
+        self.z = z
+        self.alpha = 2 * (1 - NormalDist().cdf(z))
+        self.look_z = math.inf  # z of the latest look (set by end_wave)
+        self._alpha_spent = 0.0
+        self.total_personas = len(personas)
+        self.personas_seen: Set[str] = set()
+        self._cluster_of = {p.uuid: cid for cid, members in self.live.clusters.items() for p in members}
+        self._cluster_seen: Dict[str, int] = {cid: 0 for cid in self.live.clusters}
+        self.waves = 0
+        self.stable_count = 0
+        self.stopped_early = False
+        self._last_split: Optional[Dict[str, float]] = None
+
+    def add(self, reaction: AdReaction) -> None:
+        self.live.add(reaction)
+        if reaction.persona_uuid not in self.personas_seen:
+            self.personas_seen.add(reaction.persona_uuid)
+            cluster_id = self._cluster_of.get(reaction.persona_uuid)
+            if cluster_id is not None:
+                self._cluster_seen[cluster_id] += 1
+
+    def cluster_weights(self) -> Dict[str, float]:
+        """cluster_id -> cluster size / personas simulated in it (1.0 once fully covered)."""
+        return {
+            cluster_id: self.live.cluster_sizes[cluster_id] / seen
+            for cluster_id, seen in self._cluster_seen.items() if seen
+        }
+
+    def ad_intervals(self, z: Optional[float] = None) -> Dict[str, Tuple[float, float, float]]:
+        """ad_id -> (lower, upper, rate) for the post-stratified high-intent rate."""
+        z = self.z if z is None else z
+        by_ad: Dict[str, List[Tuple[int, int, int]]] = {}
+        for (cluster_id, ad_id), (n, high) in self.live.cluster_ad_counts().items():
+            by_ad.setdefault(ad_id, []).append((self.live.cluster_sizes[cluster_id], n, high))
+        intervals = {}
+        for ad_id, cells in by_ad.items():
+            size = sum(s for s, _, _ in cells)
+            rate = sum(s * high / n for s, n, high in cells) / size
+            n_eff = 1 / sum((s / size) ** 2 / n for s, n, _ in cells)  # Kish: n when sampled proportionally
+            lo, hi = wilson_interval(rate * n_eff, n_eff, z)
+            intervals[ad_id] = (lo, hi, rate)
+        return intervals
+
+    def _next_look_z(self) -> float:
+        """z for this look from the alpha spent since the previous one."""
+        spent = spent_alpha(self.alpha, len(self.personas_seen) / max(1, self.total_personas))
+        increment, self._alpha_spent = spent - self._alpha_spent, max(spent, self._alpha_spent)
+        if increment <= 1e-12:
+            return math.inf
+        return NormalDist().inv_cdf(1 - increment / 2)
+
+    def unsettled_clusters(self) -> Set[str]:
+        """Clusters whose leading ad is not yet separated from the runner-up."""
+        per_cluster: Dict[str, Dict[str, Tuple[float, float, float]]] = {}
+        for (cluster_id, ad_id), (n, high) in self.live.cluster_ad_counts().items():
+            lo, hi = wilson_interval(high, n, self.z)
+            per_cluster.setdefault(cluster_id, {})[ad_id] = (lo, hi, high / n)
+        unsettled = set(self.live.clusters) - set(per_cluster)
+        for cluster_id, intervals in per_cluster.items():
+            if not _separated(intervals)[1]:
+                unsettled.add(cluster_id)
+        return unsettled
+
+    def order_remaining(self, personas: List[EnrichedPersona], rng: random.Random) -> List[EnrichedPersona]:
+        """Shuffle remaining personas, putting members of unsettled clusters first."""
+        remaining = list(personas)
+        rng.shuffle(remaining)
+        if self.waves == 0:
+            return remaining
+        unsettled = self.unsettled_clusters()
+        cluster_of = {p.uuid: cid for cid, members in self.live.clusters.items() for p in members}
+        return sorted(remaining, key=lambda p: cluster_of.get(p.uuid) not in unsettled)
+
+    def _ranking(self) -> Tuple[Optional[str], bool]:
+        """(leader, settled) at the latest look's z (never settled before the first look)."""
+        if not math.isfinite(self.look_z):
+            return _separated(self.ad_intervals())[0], False
+        return _separated(self.ad_intervals(self.look_z))
+
+    def end_wave(self) -> bool:
+        """Record a finished wave; True when sampling can stop."""
+        self.waves += 1
+        split = self.live.snapshot(max_ads=self.max_ads, cluster_weights=self.cluster_weights())["budget_split"]
+        if self._last_split is not None:
+            ads = set(split) | set(self._last_split)
+            drift = max((abs(split.get(a, 0.0) - self._last_split.get(a, 0.0)) for a in ads), default=0.0)
+            self.stable_count = self.stable_count + 1 if drift <= self.tolerance else 0
+        self._last_split = split
+
+        self.look_z = self._next_look_z()
+        _, ranking_settled = self._ranking()
+        return (
+            len(self.personas_seen) >= self.min_personas
+            and ranking_settled
+            and self.stable_count >= self.stable_waves
+        )
+
+    def report(self) -> Dict[str, Any]:
+        leader, ranking_settled = self._ranking()
+        return {
+            "stopped_early": self.stopped_early,
+            "waves": self.waves,
+            "personas_simulated": len(self.personas_seen),
+            "personas_total": self.total_personas,
+            "reactions": self.live.reactions_seen,
+            "leader": leader,
+            "ranking_settled": ranking_settled,
+            "budget_split": self._last_split or {},
+            "look_z": round(self.look_z, 3) if math.isfinite(self.look_z) else None,
+            "cluster_weights": {k: round(v, 4) for k, v in sorted(self.cluster_weights().items())},
+            "unsettled_clusters": sorted(self.unsettled_clusters()),
+            "high_intent_intervals": {
+                ad_id: [round(lo, 4), round(hi, 4)] for ad_id, (lo, hi, _) in self.ad_intervals(
+                    self.look_z if math.isfinite(self.look_z) else None
+                ).items()
+            },
+        }
@@ -2,12 +2,30 @@
 
 import asyncio
 import random
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from tqdm.asyncio import tqdm
 
 from src.utils.schemas import EnrichedPersona, VisualAnchor, AdReaction
 from src.api.gemini_client import gemini_client
-from src.utils.config import TIER1_SAMPLE_SIZE, TIER2_SAMPLE_SIZE
+from src.api.llm_telemetry import llm_caller
+from src.utils.config import (
+    TIER1_SAMPLE_SIZE,
+    TIER2_SAMPLE_SIZE,
+    TIER2_BATCH_SIZE,
+    TIER2_BATCH_MODE,
+    ADAPTIVE_SAMPLING_ENABLED,
+    TIER_ASSIGNMENT_STRATEGY,
+    TIER_ASSIGNMENT_SEED,
+    TIER_CALIBRATION_ENABLED,
+    TIER_CALIBRATION_PAIRS,
+)
+from src.utils.creative_analysis import analyze_creative, analyze_image
+from src.core.sequential_sampling import SequentialStopper
+from src.core.run_journal import RunJournal
+from src.core.tier_assignment import get_tier_strategy
+from src.core.tier_calibration import TierCalibration, select_calibration_personas
+from src.core.optimizer import optimizer
+from src.core.prompt_builder import PromptBuilder
 
 
 class Ad:
@@ -25,14 +43,33 @@ class Ad:
 class TieredSimulationEngine:
     """10/90 split: Pro for visual grounding, Flash for scale."""
     
-    def __init__(self, product_category: str = "fintech"):
+    def __init__(
+        self,
+        product_category: str = "fintech",
+        tier_strategy: Optional[str] = None,
+        tier_seed: Optional[int] = None
+    ):
         """
         Initialize with product category to adjust thresholds.
         
         Args:
             product_category: "fintech" (B2B), "d2c_fashion" (consumer), "d2c_wellness", etc.
+            tier_strategy: Tier 1 persona assignment, see src/core/tier_assignment.py
+                (default TIER_ASSIGNMENT_STRATEGY).
+            tier_seed: seed of the tier split / wave order (default TIER_ASSIGNMENT_SEED,
+                else a fresh seed per run).
         """
         self.product_category = product_category
+        self.tier_strategy = tier_strategy or TIER_ASSIGNMENT_STRATEGY
+        self.tier_seed = tier_seed if tier_seed is not None else TIER_ASSIGNMENT_SEED
+        get_tier_strategy(self.tier_strategy)  # fail fast on a typo
+        self.last_sampling_report: Optional[Dict[str, Any]] = None
+        self.last_tier_split: Optional[Dict[str, Any]] = None
+        self.prompts = PromptBuilder(
+            self.PERSONA_PROMPT_FIELDS, self._persona_prompt_fields,
+            self.AD_PROMPT_FIELDS, self._ad_prompt_fields,
+            lambda product_category: self._get_action_threshold_guidance(),
+        )
     
     # System prompt for persona simulation - REFLEXIVE SELF-CORRECTION ARCHITECTURE
     PERSONA_SIMULATION_SYSTEM_PROMPT = """You are a hyper-realistic persona simulator running dual-process cognition.
@@ -53,6 +90,9 @@ EXECUTION MODE: Dual-Process Thinking
 
 You MUST run both and let System 2 override System 1 when constraints demand it."""
     
+    # Reasoning of heuristic reactions used when a call fails (not checkpointed, so resume retries them)
+    FALLBACK_REASONING = "Fallback heuristic"
+    
     VISUAL_GROUNDING_PROMPT = """You are an expert in visual design and advertising psychology.
 
 Analyze this ad creative image carefully.
@@ -285,6 +325,96 @@ Return as JSON:
     
     CRITICAL: If your scam_vulnerability is "High" AND the ad has red flags, your trust_score CANNOT exceed 5, even if you want to believe it. Trauma overrides optimism."""
     
+    # TIER 2 BATCHED: several people × ads in one Flash call (same cognition as REACTION_PROMPT_TIER2)
+    TIER2_BATCH_PERSONA_BLOCK = """[{label}] {occupation}, {age}yo {sex}, living in {district}, {state} ({zone})
+    LIVED EXPERIENCE:
+    {persona_narrative}
+    CONSTRAINTS: Education: {education_level} | Digital comfort: {digital_literacy}/10 | Device: {primary_device} | Monthly earnings: ₹{monthly_income_inr} | Scam trauma: {scam_vulnerability} | Family to answer to: {family_structure}"""
+    
+    TIER2_BATCH_AD_BLOCK = """[{label}] VISUAL CUES:
+    {visual_anchor}
+    AD MESSAGE: "{ad_copy}" (end of ad {label})"""
+    
+    REACTION_PROMPT_TIER2_BATCH = """╔══════════════════════════════════════════════════════════╗
+    ║  IDENTITY LOCK: YOU BECOME EACH PERSON, ONE AT A TIME   ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    📅 TODAY'S DATE: Monday, January 27, 2026
+    
+    You will react AS EACH person listed below, independently. When you are one person
+    you know NOTHING about the others — never let one person's reaction leak into another's.
+    
+    ╔══════════════════════════════════════════════════════════╗
+    ║                      THE PEOPLE                          ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    {personas_block}
+    
+    ╔══════════════════════════════════════════════════════════╗
+    ║                       THE ADS                            ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    {ads_block}
+    
+    ╔══════════════════════════════════════════════════════════╗
+    ║  DUAL-PROCESS REACTION (Fast but thorough, per person)  ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    For EACH item:
+    STEP 1: GUT INSTINCT (System 1) - excited, curious, suspicious or annoyed?
+    STEP 2: REALITY AUDIT (System 2) - run the person's own filters:
+    - SCAM PARANOIA: "High" scam trauma means they've been burned before
+    - INCOME: ₹500+ is significant money on a small monthly income
+    - LANGUAGE: English-heavy ads are friction for non-fluent readers
+    - DEVICE/LITERACY: low digital comfort or a basic phone blocks app/web sign-ups
+    - SOCIAL ACCEPTANCE: would their family have concerns about this purchase?
+    STEP 3: THE FINAL CALL
+    
+    ⚠️  ACTION THRESHOLD - BE REALISTIC FOR THIS PRODUCT:
+    {action_threshold_guidance}
+    
+    {click_criteria}
+    
+    Otherwise:
+    • If it's interesting but not urgent → "IGNORE" (most common!)
+    • If it's irrelevant or suspicious → "IGNORE"
+    • If it's a clear scam → "REPORT"
+    
+    Remember: Seeing something doesn't mean clicking it. Most ads are ignored.
+    
+    {skeptical_overrides}
+    
+    CRITICAL: If a person's scam trauma is "High" AND the ad has red flags, their trust_score CANNOT exceed 5.
+    
+    ╔══════════════════════════════════════════════════════════╗
+    ║  ITEMS TO REACT TO ({item_count})                              ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    {items_block}
+    
+    ╔══════════════════════════════════════════════════════════╗
+    ║  RESPONSE FORMAT (Pure JSON, no markdown)              ║
+    ╚══════════════════════════════════════════════════════════╝
+    
+    Return exactly one entry per item, echoing its item_id:
+    {{
+        "reactions": [
+            {{
+                "item_id": "<e.g. P1xA1>",
+                "gut_reaction": "<What System 1 felt immediately, in this person's voice>",
+                "critical_audit": "<What System 2 questioned about the gut reaction>",
+                "constraint_hits": ["<Which of THIS person's constraints blocked this>"],
+                "trust_score": <0-10, AFTER audit>,
+                "relevance_score": <0-10>,
+                "action": "CLICK|IGNORE|REPORT",
+                "intent_level": "High|Medium|Low|None",
+                "reasoning": "<Did System 2 confirm or override System 1? Why?>",
+                "emotional_response": "<1-2 words>",
+                "primary_barrier": "<THE main reason they didn't click, if applicable>"
+            }}
+        ]
+    }}"""
+    
     def _get_action_threshold_guidance(self) -> dict:
         """Get product-category specific action thresholds."""
         if self.product_category == "d2c_fashion" or self.product_category == "d2c_wellness":
@@ -336,6 +466,49 @@ Return as JSON:
     - Family might disapprove = IGNORE (even if you want it)"""
             }
     
+    # Prompt fields that only depend on the persona / on the ad (cached by self.prompts)
+    PERSONA_PROMPT_FIELDS = (
+        "occupation", "age", "sex", "district", "state", "zone", "persona_narrative",
+        "education_level", "digital_literacy", "primary_device", "monthly_income_inr",
+        "scam_vulnerability", "economic_weight", "peer_group", "family_structure", "your_identity",
+    )
+    AD_PROMPT_FIELDS = ("visual_anchor", "ad_copy", "technical_term_from_ad")
+    
+    def _persona_prompt_fields(self, persona: EnrichedPersona) -> Dict[str, Any]:
+        return {
+            "occupation": persona.occupation,
+            "age": persona.age,
+            "sex": persona.sex,
+            "district": persona.district,
+            "state": persona.state,
+            "zone": persona.zone,
+            "persona_narrative": self._build_persona_narrative(persona),
+            "education_level": persona.education_level,
+            "digital_literacy": persona.digital_literacy,
+            "primary_device": persona.primary_device,
+            "monthly_income_inr": persona.monthly_income_inr,
+            "scam_vulnerability": persona.scam_vulnerability,
+            "economic_weight": self._calculate_economic_weight(persona),
+            "peer_group": self._infer_peer_group(persona),
+            "family_structure": self._infer_family_structure(persona),
+            "your_identity": self._infer_identity_label(persona),
+        }
+    
+    def _ad_prompt_fields(self, ad: Ad, visual_anchor: VisualAnchor) -> Dict[str, Any]:
+        return {
+            "visual_anchor": self._format_anchor_text(visual_anchor),
+            "ad_copy": ad.copy,
+            "technical_term_from_ad": self._extract_technical_term(ad.copy),
+        }
+    
+    def _reaction_prompt(self, template: str, persona: EnrichedPersona, ad: Ad,
+                         visual_anchor: VisualAnchor) -> Tuple[str, str]:
+        """(system prompt, prompt) for one persona seeing one ad, from cached segments."""
+        return self.prompts.build(
+            template, self.PERSONA_SIMULATION_SYSTEM_PROMPT, self.product_category,
+            persona=persona, ad=ad, anchor=visual_anchor
+        )
+    
     def _build_persona_narrative(self, persona: EnrichedPersona) -> str:
         """Build rich narrative from all available persona fields (Issue #3: Use ALL data)."""
         narrative_parts = []
@@ -436,8 +609,34 @@ Return as JSON:
         else:
             return "middle-class Indian"
     
+    def _format_anchor_text(self, visual_anchor: VisualAnchor) -> str:
+        """Render a visual anchor as the prompt block personas 'see'."""
+        return f"""
+Trust Signals: {visual_anchor.trust_signals}
+Visual Quality: {visual_anchor.visual_quality}
+Colors: {visual_anchor.color_psychology}
+Brand Feel: {visual_anchor.brand_perception}
+Red Flags: {visual_anchor.scam_indicators}
+"""
+    
     async def create_visual_anchor(self, ad: Ad) -> VisualAnchor:
-        """Tier 1: Use Gemini Pro to analyze ad visual."""
+        """Tier 1: Use Gemini Pro to analyze ad visual.
+        
+        Ads with an image reuse the combined copy + anchor analysis (one Pro call per
+        image, cached by image hash); the standalone prompt is only used without an image.
+        """
+        if ad.image_path:
+            analysis = await analyze_creative(ad.image_path)
+            if analysis is not None:
+                return VisualAnchor(
+                    ad_id=ad.ad_id,
+                    trust_signals=analysis["trust_signals"] or "Unknown",
+                    visual_quality=analysis["visual_quality"] or "Unknown",
+                    color_psychology=analysis["color_psychology"] or "Unknown",
+                    brand_perception=analysis["brand_perception"] or "Unknown",
+                    scam_indicators=analysis["scam_indicators"] or "Unknown"
+                )
+        
         prompt = self.VISUAL_GROUNDING_PROMPT.format(copy=ad.copy)
         
         # Load image if available
@@ -454,8 +653,13 @@ Return as JSON:
             prompt += f"\n\nNote: No image available. Use this description: {ad.description}"
         
         try:
-            response = await gemini_client.generate_pro(prompt, image_data)
-            anchor_data = gemini_client.parse_json_response(response)
+            with llm_caller("visual_anchor"):
+                if image_data:
+                    # Same on-disk cache as the combined analysis (keyed by image hash + this prompt)
+                    anchor_data = await analyze_image(ad.image_path, prompt)
+                else:
+                    response = await gemini_client.generate_pro(prompt, image_data)
+                    anchor_data = gemini_client.parse_json_response(response)
             
             return VisualAnchor(
                 ad_id=ad.ad_id,
@@ -483,55 +687,14 @@ Return as JSON:
         visual_anchor: VisualAnchor
     ) -> AdReaction:
         """Tier 1: High-fidelity simulation with Gemini Pro using reflexive self-correction."""
-        anchor_text = f"""
-Trust Signals: {visual_anchor.trust_signals}
-Visual Quality: {visual_anchor.visual_quality}
-Colors: {visual_anchor.color_psychology}
-Brand Feel: {visual_anchor.brand_perception}
-Red Flags: {visual_anchor.scam_indicators}
-"""
-        
-        # Build rich persona narrative with contextual enrichment
-        persona_narrative = self._build_persona_narrative(persona)
-        
-        # Calculate contextual variables for prompt
-        economic_weight = self._calculate_economic_weight(persona)
-        family_structure = self._infer_family_structure(persona)
-        peer_group = self._infer_peer_group(persona)
-        technical_term = self._extract_technical_term(ad.copy)
-        identity_label = self._infer_identity_label(persona)
-        
-        # Get product-category specific thresholds
-        threshold_config = self._get_action_threshold_guidance()
-        
-        prompt = self.REACTION_PROMPT_TIER1.format(
-            occupation=persona.occupation,
-            age=persona.age,
-            sex=persona.sex,
-            district=persona.district,
-            state=persona.state,
-            zone=persona.zone,
-            persona_narrative=persona_narrative,
-            education_level=persona.education_level,
-            digital_literacy=persona.digital_literacy,
-            primary_device=persona.primary_device,
-            monthly_income_inr=persona.monthly_income_inr,
-            scam_vulnerability=persona.scam_vulnerability,
-            visual_anchor=anchor_text,
-            ad_copy=ad.copy,
-            economic_weight=economic_weight,
-            technical_term_from_ad=technical_term,
-            peer_group=peer_group,
-            family_structure=family_structure,
-            your_identity=identity_label,
-            **threshold_config
-        )
+        system_prompt, prompt = self._reaction_prompt(self.REACTION_PROMPT_TIER1, persona, ad, visual_anchor)
         
         try:
-            response = await gemini_client.generate_pro(
-                prompt=prompt,
-                system_prompt=self.PERSONA_SIMULATION_SYSTEM_PROMPT
-            )
+            with llm_caller("tier1"):
+                response = await gemini_client.generate_pro(
+                    prompt=prompt,
+                    system_prompt=system_prompt
+                )
             reaction_data = gemini_client.parse_json_response(response)
             
             # Map new response format to AdReaction schema
@@ -581,87 +744,130 @@ Red Flags: {visual_anchor.scam_indicators}
         visual_anchor: VisualAnchor
     ) -> AdReaction:
         """Tier 2: Fast simulation with Gemini Flash using reflexive self-correction."""
-        anchor_text = f"""
-Trust Signals: {visual_anchor.trust_signals}
-Visual Quality: {visual_anchor.visual_quality}
-Colors: {visual_anchor.color_psychology}
-Brand Feel: {visual_anchor.brand_perception}
-Red Flags: {visual_anchor.scam_indicators}
-"""
-        
-        # Build rich persona narrative with contextual enrichment
-        persona_narrative = self._build_persona_narrative(persona)
-        
-        # Calculate contextual variables
-        family_structure = self._infer_family_structure(persona)
-        
-        # Get product-category specific thresholds
-        threshold_config = self._get_action_threshold_guidance()
-        
-        prompt = self.REACTION_PROMPT_TIER2.format(
-            occupation=persona.occupation,
-            age=persona.age,
-            sex=persona.sex,
-            district=persona.district,
-            state=persona.state,
-            zone=persona.zone,
-            persona_narrative=persona_narrative,
-            education_level=persona.education_level,
-            digital_literacy=persona.digital_literacy,
-            primary_device=persona.primary_device,
-            monthly_income_inr=persona.monthly_income_inr,
-            scam_vulnerability=persona.scam_vulnerability,
-            visual_anchor=anchor_text,
-            ad_copy=ad.copy,
-            family_structure=family_structure,
-            **threshold_config
-        )
+        system_prompt, prompt = self._reaction_prompt(self.REACTION_PROMPT_TIER2, persona, ad, visual_anchor)
         
         try:
-            response = await gemini_client.generate_flash(
-                prompt=prompt,
-                system_prompt=self.PERSONA_SIMULATION_SYSTEM_PROMPT
-            )
+            with llm_caller("tier2"):
+                response = await gemini_client.generate_flash(
+                    prompt=prompt,
+                    system_prompt=system_prompt
+                )
             reaction_data = gemini_client.parse_json_response(response)
-            
-            # Map new response format to AdReaction schema
-            trust_score = reaction_data.get("trust_score", 5)
-            relevance_score = reaction_data.get("relevance_score", 5)
-            action = reaction_data.get("action", "IGNORE")
-            
-            # Build enhanced reasoning that includes dual-process thinking
-            reasoning_parts = []
-            if "gut_reaction" in reaction_data:
-                reasoning_parts.append(f"[Gut] {reaction_data['gut_reaction']}")
-            if "critical_audit" in reaction_data:
-                reasoning_parts.append(f"[Audit] {reaction_data['critical_audit']}")
-            if "reasoning" in reaction_data:
-                reasoning_parts.append(f"[Decision] {reaction_data['reasoning']}")
-            
-            final_reasoning = " | ".join(reasoning_parts) if reasoning_parts else reaction_data.get("reasoning", "No reasoning provided")
-            
-            # Combine barriers
-            barriers = reaction_data.get("barriers", [])
-            if "constraint_hits" in reaction_data:
-                barriers.extend(reaction_data["constraint_hits"])
-            if "primary_barrier" in reaction_data and reaction_data["primary_barrier"]:
-                barriers.append(f"PRIMARY: {reaction_data['primary_barrier']}")
-            
-            return AdReaction(
-                persona_uuid=persona.uuid,
-                ad_id=ad.ad_id,
-                trust_score=trust_score,
-                relevance_score=relevance_score,
-                action=action,
-                intent_level=reaction_data.get("intent_level", "Low"),
-                reasoning=final_reasoning,
-                emotional_response=reaction_data.get("emotional_response", "Neutral"),
-                barriers=list(set(barriers))  # Remove duplicates
-            )
+            return self._reaction_from_tier2_data(persona, ad, reaction_data)
         except Exception as e:
             print(f"⚠️  Tier 2 API Error for persona {persona.uuid[:8]}... ad {ad.ad_id}: {str(e)}")
             return self._create_fallback_reaction(persona, ad)
     
+    def _reaction_from_tier2_data(self, persona: EnrichedPersona, ad: Ad, reaction_data: Dict[str, Any]) -> AdReaction:
+        """Map a Tier 2 JSON reaction onto the AdReaction schema (raises if malformed)."""
+        trust_score = reaction_data.get("trust_score", 5)
+        relevance_score = reaction_data.get("relevance_score", 5)
+        action = reaction_data.get("action", "IGNORE")
+        
+        # Build enhanced reasoning that includes dual-process thinking
+        reasoning_parts = []
+        if "gut_reaction" in reaction_data:
+            reasoning_parts.append(f"[Gut] {reaction_data['gut_reaction']}")
+        if "critical_audit" in reaction_data:
+            reasoning_parts.append(f"[Audit] {reaction_data['critical_audit']}")
+        if "reasoning" in reaction_data:
+            reasoning_parts.append(f"[Decision] {reaction_data['reasoning']}")
+        
+        final_reasoning = " | ".join(reasoning_parts) if reasoning_parts else reaction_data.get("reasoning", "No reasoning provided")
+        
+        # Combine barriers
+        barriers = list(reaction_data.get("barriers", []))
+        if "constraint_hits" in reaction_data:
+            barriers.extend(reaction_data["constraint_hits"])
+        if "primary_barrier" in reaction_data and reaction_data["primary_barrier"]:
+            barriers.append(f"PRIMARY: {reaction_data['primary_barrier']}")
+        
+        return AdReaction(
+            persona_uuid=persona.uuid,
+            ad_id=ad.ad_id,
+            trust_score=trust_score,
+            relevance_score=relevance_score,
+            action=action,
+            intent_level=reaction_data.get("intent_level", "Low"),
+            reasoning=final_reasoning,
+            emotional_response=reaction_data.get("emotional_response", "Neutral"),
+            barriers=list(set(barriers))  # Remove duplicates
+        )
+    
+    async def simulate_reactions_tier2_batch(
+        self,
+        pairs: List[Tuple[EnrichedPersona, Ad]],
+        anchor_map: Dict[str, VisualAnchor]
+    ) -> List[AdReaction]:
+        """Tier 2 batched: several (persona, ad) reactions in one Flash call.
+        
+        Shared scaffolding (system prompt, thresholds, each ad's visual anchor and each
+        persona's narrative) is sent once per batch instead of once per pair. Entries
+        that are missing or malformed fall back to _create_fallback_reaction individually.
+        """
+        personas: Dict[str, EnrichedPersona] = {}
+        ads: Dict[str, Ad] = {}
+        for persona, ad in pairs:
+            personas.setdefault(persona.uuid, persona)
+            ads.setdefault(ad.ad_id, ad)
+        persona_labels = {uuid: f"P{i}" for i, uuid in enumerate(personas, 1)}
+        ad_labels = {ad_id: f"A{i}" for i, ad_id in enumerate(ads, 1)}
+        
+        personas_block = "\n\n".join(
+            self.prompts.render(
+                self.TIER2_BATCH_PERSONA_BLOCK, self.product_category, persona=p, label=persona_labels[p.uuid]
+            )
+            for p in personas.values()
+        )
+        ads_block = "\n\n".join(
+            self.prompts.render(
+                self.TIER2_BATCH_AD_BLOCK, self.product_category, ad=a, anchor=anchor_map[a.ad_id],
+                label=ad_labels[a.ad_id]
+            )
+            for a in ads.values()
+        )
+        item_ids = [f"{persona_labels[p.uuid]}x{ad_labels[a.ad_id]}" for p, a in pairs]
+        items_block = "\n".join(
+            f"- {item_id}: person {persona_labels[p.uuid]} seeing ad {ad_labels[a.ad_id]}"
+            for item_id, (p, a) in zip(item_ids, pairs)
+        )
+        
+        system_prompt, prompt = self.prompts.build(
+            self.REACTION_PROMPT_TIER2_BATCH, self.PERSONA_SIMULATION_SYSTEM_PROMPT, self.product_category,
+            personas_block=personas_block,
+            ads_block=ads_block,
+            items_block=items_block,
+            item_count=len(pairs),
+        )
+        
+        entries: Dict[str, Any] = {}
+        try:
+            with llm_caller("tier2"):
+                response = await gemini_client.generate_flash(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=min(400 * len(pairs) + 256, 16384)
+                )
+            data = gemini_client.parse_json_response(response)
+            items = data.get("reactions", []) if isinstance(data, dict) else data
+            for entry in items or []:
+                if isinstance(entry, dict) and entry.get("item_id"):
+                    entries[str(entry["item_id"]).strip()] = entry
+        except Exception as e:
+            print(f"⚠️  Tier 2 batch API Error ({len(pairs)} items): {str(e)}")
+        
+        reactions = []
+        for item_id, (persona, ad) in zip(item_ids, pairs):
+            entry = entries.get(item_id)
+            try:
+                if entry is None:
+                    raise ValueError("missing from batch response")
+                reactions.append(self._reaction_from_tier2_data(persona, ad, entry))
+            except Exception as e:
+                print(f"⚠️  Tier 2 batch item {item_id} (persona {persona.uuid[:8]}... ad {ad.ad_id}) unusable: {str(e)[:120]}")
+                reactions.append(self._create_fallback_reaction(persona, ad))
+        return reactions
+    
     def _create_fallback_reaction(self, persona: EnrichedPersona, ad: Ad) -> AdReaction:
         """Heuristic-based fallback reaction."""
         # Simple heuristics
@@ -689,7 +895,7 @@ Red Flags: {visual_anchor.scam_indicators}
             relevance_score=relevance,
             action=action,
             intent_level=intent,
-            reasoning="Fallback heuristic",
+            reasoning=self.FALLBACK_REASONING,
             emotional_response="Neutral",
             barriers=[]
         )
@@ -697,10 +903,62 @@ Red Flags: {visual_anchor.scam_indicators}
     async def run_simulation(
         self, 
         personas: List[EnrichedPersona], 
-        ads: List[Ad]
+        ads: List[Ad],
+        tier2_batch_size: Optional[int] = None,
+        tier2_batch_mode: Optional[str] = None,
+        on_reaction: Optional[Callable[[AdReaction], None]] = None,
+        adaptive: Optional[bool] = None,
+        journal: Optional[RunJournal] = None,
+        prior_reactions: Optional[List[AdReaction]] = None,
+        calibrate: Optional[bool] = None,
+        prior_personas: Optional[List[EnrichedPersona]] = None
     ) -> List[AdReaction]:
-        """Execute 10/90 tiered simulation."""
-        all_reactions = []
+        """Execute 10/90 tiered simulation.
+        
+        Args:
+            tier2_batch_size: >1 packs that many Tier 2 reactions into one Flash call
+                (default TIER2_BATCH_SIZE).
+            tier2_batch_mode: "per_ad" (N personas against one ad) or "per_persona"
+                (one persona against up to N ads). Default TIER2_BATCH_MODE.
+            on_reaction: called with each reaction as soon as it completes
+                (used for streaming partial results).
+            adaptive: run Tier 2 in waves and stop once the decision is settled
+                (default ADAPTIVE_SAMPLING_ENABLED). The stopping summary is left in
+                self.last_sampling_report (None for a full run).
+            journal: checkpoint each reaction; (persona, ad) pairs already in the
+                journal are reused instead of simulated again (resume).
+            prior_reactions: reactions of an earlier run (load_prior_run), used by the
+                "uncertainty" and "neyman" tier strategies; prior_personas are that
+                run's personas, so its reactions map to clusters of a new audience.
+            calibrate: re-run a few Tier 1 personas per cluster with Flash and shift
+                Tier 2 trust / relevance by the cluster's Pro - Flash offset (default
+                TIER_CALIBRATION_ENABLED). Applied once all tiers finished, so
+                on_reaction, the journal and adaptive stopping see raw Flash scores.
+        
+        Each reaction's tier (1 / 2) is recorded in AdReaction.tier; the split used is
+        left in self.last_tier_split.
+        """
+        use_adaptive = ADAPTIVE_SAMPLING_ENABLED if adaptive is None else adaptive
+        stopper = SequentialStopper(personas, [ad.ad_id for ad in ads]) if use_adaptive else None
+        
+        done = journal.completed_reactions() if journal is not None else {}
+        if done:
+            print(f"\n♻️  Resuming: {len(done)} reactions already in journal {journal.run_id}")
+            if stopper is not None:
+                for r in done.values():
+                    stopper.add(r)
+        
+        async def _notify(coro, tier: int):
+            result = await coro
+            for r in (result if isinstance(result, list) else [result]):
+                r.tier = tier
+                if journal is not None and r.reasoning != self.FALLBACK_REASONING:
+                    journal.record_reaction(r)
+                if stopper is not None:
+                    stopper.add(r)
+                if on_reaction is not None:
+                    on_reaction(r)
+            return result
         
         # Step 1: Create visual anchors for all ads using Pro
         print(f"\n🎨 Creating visual anchors for {len(ads)} ads...")
@@ -708,37 +966,198 @@ Red Flags: {visual_anchor.scam_indicators}
         visual_anchors = await tqdm.gather(*anchor_tasks, desc="Visual grounding")
         anchor_map = {va.ad_id: va for va in visual_anchors}
         
-        # Step 2: Split personas into Tier 1 (Pro) and Tier 2 (Flash)
+        # Step 2: Split personas into Tier 1 (Pro) and Tier 2 (Flash) by index, seeded
         tier1_size = min(TIER1_SAMPLE_SIZE, len(personas) // 10)
-        tier1_personas = random.sample(personas, tier1_size)
-        tier2_personas = [p for p in personas if p not in tier1_personas]
+        strategy = self.tier_strategy
+        if journal is not None and "tier1_personas" in journal.meta:
+            # Resume keeps the original split so the Pro sample is not redrawn
+            tier1_uuids = set(journal.meta["tier1_personas"])
+            tier1_idx = {i for i, p in enumerate(personas) if p.uuid in tier1_uuids}
+            seed = journal.meta.get("tier_seed", self.tier_seed)
+            strategy = journal.meta.get("tier_strategy", strategy)
+        else:
+            seed = self.tier_seed if self.tier_seed is not None else random.randrange(2 ** 32)
+            tier1_idx = set(get_tier_strategy(strategy)(
+                personas, tier1_size, random.Random(seed), prior_reactions, prior_personas=prior_personas
+            ))
+            if journal is not None:
+                journal.set_meta(
+                    tier1_personas=[personas[i].uuid for i in sorted(tier1_idx)],
+                    tier_strategy=strategy,
+                    tier_seed=seed,
+                )
+        tier1_personas = [p for i, p in enumerate(personas) if i in tier1_idx]
+        tier2_personas = [p for i, p in enumerate(personas) if i not in tier1_idx]
+        rng = random.Random(seed)  # adaptive wave order
+        self.last_tier_split = {
+            "strategy": strategy,
+            "seed": seed,
+            "tier1_personas": len(tier1_personas),
+            "tier2_personas": len(tier2_personas),
+            "prior_reactions": len(prior_reactions or []),
+        }
         
-        print(f"\n⚡ Tier 1 (Pro): {len(tier1_personas)} personas")
+        print(f"\n⚡ Tier 1 (Pro): {len(tier1_personas)} personas ({strategy}, seed {seed})")
         print(f"🚀 Tier 2 (Flash): {len(tier2_personas)} personas")
         
-        # Step 3: Run Tier 1 simulations (Pro - high fidelity)
+        use_calibration = TIER_CALIBRATION_ENABLED if calibrate is None else calibrate
+        calibration = None
+        calibration_future = None
+        if use_calibration and tier1_personas and tier2_personas:
+            cluster_of = {
+                p.uuid: cluster_id
+                for cluster_id, members in optimizer.fragment_audience_into_clusters(personas).items()
+                for p in members
+            }
+            calibration = TierCalibration(cluster_of)
+            overlap = select_calibration_personas(tier1_personas, cluster_of, TIER_CALIBRATION_PAIRS, random.Random(seed))
+            print(f"📐 Calibration: {len(overlap)} Tier 1 personas also simulated with Flash")
+            # Not journaled / reported: these pairs already have their Pro reaction
+            calibration_future = asyncio.ensure_future(asyncio.gather(*[
+                self.simulate_reaction_tier2(persona, ad, anchor_map[ad.ad_id])
+                for persona in overlap
+                for ad in ads
+            ]))
+        
+        # Step 3: Start Tier 1 (Pro - high fidelity) in the background. Both tiers share
+        # one pool of work; the per-model limiters in gemini_client are the separate
+        # Pro / Flash budgets, so Flash calls flow while the slow Pro calls are in flight
+        # and reactions are reported in completion order via on_reaction.
         tier1_tasks = []
         for persona in tier1_personas:
             for ad in ads:
+                if (persona.uuid, ad.ad_id) in done:
+                    continue
                 tier1_tasks.append(
-                    self.simulate_reaction_tier1(persona, ad, anchor_map[ad.ad_id])
+                    _notify(self.simulate_reaction_tier1(persona, ad, anchor_map[ad.ad_id]), tier=1)
                 )
+        tier1_future = asyncio.ensure_future(tqdm.gather(*tier1_tasks, desc="Tier 1 (Pro)"))
         
-        tier1_reactions = await tqdm.gather(*tier1_tasks, desc="Tier 1 (Pro)")
-        all_reactions.extend(tier1_reactions)
+        # Step 4: Run Tier 2 simulations (Flash - high throughput) alongside Tier 1
+        tier2_reactions = []
+        try:
+            if stopper is not None:
+                # Personas fully covered by the journal are already folded into the stopper
+                remaining = [p for p in tier2_personas if any((p.uuid, ad.ad_id) not in done for ad in ads)]
+                while remaining:
+                    ordered = stopper.order_remaining(remaining, rng)
+                    wave, remaining = ordered[:stopper.wave_size], ordered[stopper.wave_size:]
+                    tier2_reactions.extend(await self._run_tier2(
+                        wave, ads, anchor_map, _notify, tier2_batch_size, tier2_batch_mode,
+                        desc=f"Tier 2 wave {stopper.waves + 1}", done=done
+                    ))
+                    if stopper.end_wave() and remaining:
+                        stopper.stopped_early = True
+                        print(f"🛑 Early stop after {stopper.waves} waves: "
+                              f"{len(remaining)} personas skipped, leader {stopper.report()['leader']}")
+                        break
+            else:
+                tier2_reactions = await self._run_tier2(
+                    tier2_personas, ads, anchor_map, _notify, tier2_batch_size, tier2_batch_mode,
+                    done=done
+                )
+            tier1_reactions = await tier1_future
+            calibration_flash = await calibration_future if calibration_future is not None else []
+        except BaseException:
+            tier1_future.cancel()
+            if calibration_future is not None:
+                calibration_future.cancel()
+            raise
         
-        # Step 4: Run Tier 2 simulations (Flash - high throughput)
+        self.last_sampling_report = stopper.report() if stopper is not None else None
+        # Tier 1 first, then Tier 2 (same order as the sequential two-phase run)
+        reactions = list(tier1_reactions) + list(tier2_reactions)
+        if done:
+            reactions = self._merge_resumed(done, reactions, tier1_personas + tier2_personas, ads)
+        
+        if calibration is not None:
+            calibration.fit(
+                [r for r in reactions if r.tier == 1 and r.reasoning != self.FALLBACK_REASONING],
+                [r for r in calibration_flash if r.reasoning != self.FALLBACK_REASONING],
+            )
+            adjusted = calibration.apply(reactions)
+            self.last_tier_split["calibration"] = calibration.report()
+            offset = calibration.global_offset
+            print(f"📐 Calibrated {adjusted} Tier 2 reactions from {sum(calibration.pairs.values())} Pro/Flash pairs "
+                  f"(overall offset trust {offset['trust_score']:+.2f}, relevance {offset['relevance_score']:+.2f})")
+        return reactions
+    
+    def _merge_resumed(
+        self,
+        done: Dict[Tuple[str, str], AdReaction],
+        fresh: List[AdReaction],
+        personas: List[EnrichedPersona],
+        ads: List[Ad]
+    ) -> List[AdReaction]:
+        """Journaled + newly simulated reactions in the usual tier / persona / ad order."""
+        by_pair = dict(done)
+        by_pair.update({(r.persona_uuid, r.ad_id): r for r in fresh})
+        return [
+            by_pair[(p.uuid, ad.ad_id)]
+            for p in personas
+            for ad in ads
+            if (p.uuid, ad.ad_id) in by_pair
+        ]
+    
+    async def _run_tier2(
+        self,
+        personas: List[EnrichedPersona],
+        ads: List[Ad],
+        anchor_map: Dict[str, VisualAnchor],
+        notify: Callable,
+        tier2_batch_size: Optional[int] = None,
+        tier2_batch_mode: Optional[str] = None,
+        desc: str = "Tier 2",
+        done: Optional[Dict[Tuple[str, str], AdReaction]] = None
+    ) -> List[AdReaction]:
+        """Flash reactions for every (persona, ad) pair not in done, in persona-major / ad-minor order."""
+        done = done or {}
+        batch_size = tier2_batch_size or TIER2_BATCH_SIZE
+        if batch_size > 1:
+            batches = self._build_tier2_batches(personas, ads, batch_size, tier2_batch_mode or TIER2_BATCH_MODE)
+            if done:
+                batches = [b for b in ([(p, ad) for p, ad in batch if (p.uuid, ad.ad_id) not in done] for batch in batches) if b]
+            print(f"📦 Tier 2 batched: {len(batches)} Flash calls (batch size {batch_size})")
+            batch_tasks = [notify(self.simulate_reactions_tier2_batch(batch, anchor_map), tier=2) for batch in batches]
+            batch_results = await tqdm.gather(*batch_tasks, desc=f"{desc} (Flash, batched)")
+            # Restore persona-major / ad-minor order so output matches the unbatched path
+            ad_order = {ad.ad_id: i for i, ad in enumerate(ads)}
+            persona_order = {p.uuid: i for i, p in enumerate(personas)}
+            return sorted(
+                (r for batch in batch_results for r in batch),
+                key=lambda r: (persona_order[r.persona_uuid], ad_order[r.ad_id])
+            )
+
         tier2_tasks = []
-        for persona in tier2_personas:
+        for persona in personas:
             for ad in ads:
+                if (persona.uuid, ad.ad_id) in done:
+                    continue
                 tier2_tasks.append(
-                    self.simulate_reaction_tier2(persona, ad, anchor_map[ad.ad_id])
+                    notify(self.simulate_reaction_tier2(persona, ad, anchor_map[ad.ad_id]), tier=2)
                 )
-        
-        tier2_reactions = await tqdm.gather(*tier2_tasks, desc="Tier 2 (Flash)")
-        all_reactions.extend(tier2_reactions)
-        
-        return all_reactions
+        return await tqdm.gather(*tier2_tasks, desc=f"{desc} (Flash)")
+
+    def _build_tier2_batches(
+        self,
+        personas: List[EnrichedPersona],
+        ads: List[Ad],
+        batch_size: int,
+        mode: str = "per_ad"
+    ) -> List[List[Tuple[EnrichedPersona, Ad]]]:
+        """Group (persona, ad) pairs into batches for simulate_reactions_tier2_batch."""
+        batches = []
+        if mode == "per_persona":
+            for persona in personas:
+                for i in range(0, len(ads), batch_size):
+                    batches.append([(persona, ad) for ad in ads[i:i + batch_size]])
+        elif mode == "per_ad":
+            for ad in ads:
+                for i in range(0, len(personas), batch_size):
+                    batches.append([(persona, ad) for persona in personas[i:i + batch_size]])
+        else:
+            raise ValueError(f"Unknown tier2 batch mode: {mode}. Use 'per_ad' or 'per_persona'.")
+        return batches
 
 
 # Global singleton (default to fintech for backwards compatibility)
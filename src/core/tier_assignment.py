@@ -0,0 +1,169 @@
+"""Tier 1 / Tier 2 persona assignment for TieredSimulationEngine.
+
+Strategies pick the indices of the personas simulated with Pro (Tier 1); the
+rest go to Flash. Everything works on list positions and a caller-supplied
+random.Random, so a split is O(n) and reproducible from its seed:
+
+  random       - uniform sample (previous behaviour)
+  stratified   - proportional to the optimizer's audience clusters, so every
+                 cluster gets Pro-quality reactions in line with its size
+  uncertainty  - proportional to cluster size x width of the high-intent
+                 Wilson interval in prior reactions: clusters whose outcome is
+                 least certain get more Pro calls.
+  neyman       - Neyman allocation: one Pro persona per cluster first (when the
+                 budget allows), the rest proportional to cluster size x standard
+                 deviation of the high-intent rate in prior reactions (smoothed;
+                 p = 0.5 for clusters without any). Minimizes the variance of the
+                 per-cluster estimates for a fixed Pro budget.
+
+Prior reactions come from an earlier run (load_prior_run, --prior-run on the
+CLIs). Cluster ids are derived from persona attributes, so with the earlier
+run's personas (prior_personas) its reactions count towards the matching
+clusters of a different audience too. Without prior reactions, "uncertainty"
+is plain stratified and "neyman" is stratified with a one-per-cluster floor.
+"""
+
+import math
+
+import random
+from typing import Dict, List, Optional, Protocol, Sequence
+
+from src.core.optimizer import optimizer
+from src.core.sequential_sampling import wilson_interval
+from src.utils.schemas import AdReaction, EnrichedPersona
+
+
+class TierAssignmentStrategy(Protocol):
+    """Returns the indices (into personas) of the Tier 1 personas."""
+
+    def __call__(
+        self,
+        personas: Sequence[EnrichedPersona],
+        tier1_size: int,
+        rng: random.Random,
+        prior_reactions: Optional[List[AdReaction]] = None,
+        prior_personas: Optional[Sequence[EnrichedPersona]] = None,
+    ) -> List[int]:
+        ...
+
+
+def _cluster_indices(personas: Sequence[EnrichedPersona]) -> Dict[str, List[int]]:
+    """Optimizer cluster id -> persona indices."""
+    position = {id(p): i for i, p in enumerate(personas)}
+    return {
+        cluster_id: [position[id(p)] for p in members]
+        for cluster_id, members in optimizer.fragment_audience_into_clusters(list(personas)).items()
+    }
+
+
+def _allocate(weights: Dict[str, float], capacity: Dict[str, int], total: int) -> Dict[str, int]:
+    """Split total across keys in proportion to weights, capped by capacity."""
+    alloc = {k: 0 for k in weights}
+    remaining = min(total, sum(capacity.values()))
+    while remaining > 0:
+        open_keys = [k for k in weights if alloc[k] < capacity[k]]
+        weight_sum = sum(weights[k] for k in open_keys)
+        shares = {
+            k: remaining * (weights[k] / weight_sum if weight_sum > 0 else 1 / len(open_keys))
+            for k in open_keys
+        }
+        granted = 0
+        for k in open_keys:
+            add = min(int(shares[k]), capacity[k] - alloc[k])
+            alloc[k] += add
+            granted += add
+        if granted == 0:
+            # Only fractional shares left: one seat to the largest
+            alloc[max(open_keys, key=lambda k: shares[k])] += 1
+            granted = 1
+        remaining -= granted
+    return alloc
+
+
+def _sample_clusters(
+    clusters: Dict[str, List[int]], weights: Dict[str, float], tier1_size: int, rng: random.Random
+) -> List[int]:
+    alloc = _allocate(weights, {k: len(v) for k, v in clusters.items()}, tier1_size)
+    chosen: List[int] = []
+    for cluster_id in sorted(clusters):
+        chosen.extend(rng.sample(clusters[cluster_id], alloc[cluster_id]))
+    return sorted(chosen)
+
+
+def _prior_counts(
+    personas: Sequence[EnrichedPersona],
+    clusters: Dict[str, List[int]],
+    prior_reactions: List[AdReaction],
+    prior_personas: Optional[Sequence[EnrichedPersona]] = None,
+) -> Dict[str, List[int]]:
+    """Cluster id -> [reactions, high intent] in prior reactions (clusters of this audience only)."""
+    cluster_of: Dict[str, str] = {}
+    if prior_personas:
+        cluster_of = {
+            p.uuid: cluster_id
+            for cluster_id, members in optimizer.fragment_audience_into_clusters(list(prior_personas)).items()
+            for p in members
+        }
+    cluster_of.update({personas[i].uuid: cluster_id for cluster_id, idx in clusters.items() for i in idx})
+    counts = {cluster_id: [0, 0] for cluster_id in clusters}
+    for r in prior_reactions:
+        cluster_id = cluster_of.get(r.persona_uuid)
+        if cluster_id in counts:  # prior clusters absent from this audience carry no information
+            counts[cluster_id][0] += 1
+            counts[cluster_id][1] += r.intent_level == "High"
+    return counts
+
+
+def random_assignment(personas, tier1_size, rng, prior_reactions=None, prior_personas=None) -> List[int]:
+    return sorted(rng.sample(range(len(personas)), min(tier1_size, len(personas))))
+
+
+def stratified_assignment(personas, tier1_size, rng, prior_reactions=None, prior_personas=None) -> List[int]:
+    clusters = _cluster_indices(personas)
+    return _sample_clusters(clusters, {k: float(len(v)) for k, v in clusters.items()}, tier1_size, rng)
+
+
+def uncertainty_assignment(personas, tier1_size, rng, prior_reactions=None, prior_personas=None) -> List[int]:
+    clusters = _cluster_indices(personas)
+    if not prior_reactions:
+        return _sample_clusters(clusters, {k: float(len(v)) for k, v in clusters.items()}, tier1_size, rng)
+
+    counts = _prior_counts(personas, clusters, prior_reactions, prior_personas)
+    weights = {}
+    for cluster_id, idx in clusters.items():
+        lo, hi = wilson_interval(counts[cluster_id][1], counts[cluster_id][0])
+        weights[cluster_id] = len(idx) * (hi - lo)  # unseen clusters: full width
+    return _sample_clusters(clusters, weights, tier1_size, rng)
+
+
+def neyman_assignment(personas, tier1_size, rng, prior_reactions=None, prior_personas=None) -> List[int]:
+    clusters = _cluster_indices(personas)
+    counts = _prior_counts(personas, clusters, prior_reactions or [], prior_personas)
+    weights = {}
+    for cluster_id, idx in clusters.items():
+        n, high = counts[cluster_id]
+        p = (high + 1) / (n + 2)  # Laplace smoothing: 0.5 without prior reactions
+        weights[cluster_id] = len(idx) * math.sqrt(p * (1 - p))
+
+    floor = 1 if tier1_size >= len(clusters) else 0
+    alloc = _allocate(weights, {k: len(v) - floor for k, v in clusters.items()}, tier1_size - floor * len(clusters))
+    chosen: List[int] = []
+    for cluster_id in sorted(clusters):
+        chosen.extend(rng.sample(clusters[cluster_id], alloc[cluster_id] + floor))
+    return sorted(chosen)
+
+
+TIER_ASSIGNMENT_STRATEGIES: Dict[str, TierAssignmentStrategy] = {
+    "random": random_assignment,
+    "stratified": stratified_assignment,
+    "uncertainty": uncertainty_assignment,
+    "neyman": neyman_assignment,
+}
+
+
+def get_tier_strategy(name: str) -> TierAssignmentStrategy:
+    if name not in TIER_ASSIGNMENT_STRATEGIES:
+        raise ValueError(
+            f"Unknown tier assignment strategy: {name}. Use one of {sorted(TIER_ASSIGNMENT_STRATEGIES)}."
+        )
+    return TIER_ASSIGNMENT_STRATEGIES[name]
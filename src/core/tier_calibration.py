@@ -0,0 +1,110 @@
+"""Per-cluster calibration of Flash (Tier 2) scores against Pro (Tier 1).
+
+A few Tier 1 personas per audience cluster are also simulated with Flash. The
+paired (Pro, Flash) reactions to the same ad give each cluster's Flash bias on
+trust and relevance. Clusters with few pairs are shrunk towards the overall
+bias, clusters without pairs use it as is. The offsets are then added to the
+cluster's Tier 2 scores (rounded, clamped to 0-10).
+
+Intent and action are categorical and left as Flash produced them.
+"""
+
+import random
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence
+
+from src.utils.config import TIER_CALIBRATION_SHRINKAGE
+from src.utils.schemas import AdReaction, EnrichedPersona
+
+SCORE_FIELDS = ("trust_score", "relevance_score")
+
+
+def select_calibration_personas(
+    tier1_personas: Sequence[EnrichedPersona],
+    cluster_of: Dict[str, str],
+    per_cluster: int,
+    rng: random.Random,
+) -> List[EnrichedPersona]:
+    """Up to per_cluster Tier 1 personas of every cluster, to re-run with Flash."""
+    by_cluster: Dict[str, List[EnrichedPersona]] = defaultdict(list)
+    for persona in tier1_personas:
+        by_cluster[cluster_of.get(persona.uuid, "unclustered")].append(persona)
+    chosen = []
+    for cluster_id in sorted(by_cluster):
+        members = by_cluster[cluster_id]
+        chosen.extend(rng.sample(members, min(per_cluster, len(members))))
+    return chosen
+
+
+class TierCalibration:
+    """Flash - Pro score offsets per cluster, fitted on paired reactions."""
+
+    def __init__(self, cluster_of: Dict[str, str], shrinkage: float = TIER_CALIBRATION_SHRINKAGE):
+        self.cluster_of = cluster_of
+        self.shrinkage = shrinkage
+        self.pairs: Dict[str, int] = {}
+        self.global_offset: Dict[str, float] = {f: 0.0 for f in SCORE_FIELDS}
+        self.offsets: Dict[str, Dict[str, float]] = {}
+        self.adjusted = 0
+
+    def fit(self, pro: List[AdReaction], flash: List[AdReaction]) -> "TierCalibration":
+        """Fit offsets (Pro - Flash) from reactions of the same (persona, ad)."""
+        pro_by_pair = {(r.persona_uuid, r.ad_id): r for r in pro}
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: {f: 0.0 for f in SCORE_FIELDS})
+        counts: Dict[str, int] = defaultdict(int)
+        for f_reaction in flash:
+            p_reaction = pro_by_pair.get((f_reaction.persona_uuid, f_reaction.ad_id))
+            if p_reaction is None:
+                continue
+            cluster_id = self.cluster_of.get(f_reaction.persona_uuid, "unclustered")
+            counts[cluster_id] += 1
+            for field in SCORE_FIELDS:
+                sums[cluster_id][field] += getattr(p_reaction, field) - getattr(f_reaction, field)
+
+        total = sum(counts.values())
+        if total:
+            self.global_offset = {
+                field: sum(s[field] for s in sums.values()) / total for field in SCORE_FIELDS
+            }
+        k = self.shrinkage
+        self.pairs = dict(counts)
+        self.offsets = {
+            cluster_id: {
+                field: (sums[cluster_id][field] + k * self.global_offset[field]) / (n + k)
+                for field in SCORE_FIELDS
+            }
+            for cluster_id, n in counts.items()
+        }
+        return self
+
+    def offset(self, persona_uuid: str) -> Dict[str, float]:
+        return self.offsets.get(self.cluster_of.get(persona_uuid, "unclustered"), self.global_offset)
+
+    def apply(self, reactions: List[AdReaction]) -> int:
+        """Shift Tier 2 scores in place by their cluster's offset; returns how many changed."""
+        adjusted = 0
+        for reaction in reactions:
+            if reaction.tier != 2:
+                continue
+            offset = self.offset(reaction.persona_uuid)
+            changed = False
+            for field in SCORE_FIELDS:
+                value = getattr(reaction, field)
+                calibrated = min(10, max(0, round(value + offset[field])))
+                if calibrated != value:
+                    setattr(reaction, field, calibrated)
+                    changed = True
+            adjusted += changed
+        self.adjusted += adjusted
+        return adjusted
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "pairs": sum(self.pairs.values()),
+            "reactions_adjusted": self.adjusted,
+            "global_offset": {f: round(v, 3) for f, v in self.global_offset.items()},
+            "cluster_offsets": {
+                cluster_id: {f: round(v, 3) for f, v in offsets.items()} | {"pairs": self.pairs[cluster_id]}
+                for cluster_id, offsets in sorted(self.offsets.items())
+            },
+        }
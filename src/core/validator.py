@@ -1,151 +1,208 @@
-"""Validator - Anti-hallucination layer to catch LLM inconsistencies."""
+"""Validator - Anti-hallucination layer to catch LLM inconsistencies.
+
+Reactions are validated in one pass: ad copy is lowercased and scanned for
+keywords once per ad (AdContextFlags), reactions are laid out as columns
+joined to persona and ad attributes, and every rule is a boolean predicate
+over those columns. Flag messages are only formatted for the rows a rule hits.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
-from typing import List
 from src.utils.schemas import EnrichedPersona, AdReaction, ValidationResult
 from src.utils.config import TRUST_SCORE_THRESHOLD, MIN_LITERACY_FOR_COMPLEX_FORM
 
 
+IOS_KEYWORDS = ("ios", "app store", "iphone")
+APP_INSTALL_KEYWORDS = ("download app", "install now")
+FORM_KEYWORDS = ("fill", "form", "register", "sign up", "apply now", "details")
+LUXURY_KEYWORDS = ("premium", "luxury", "exclusive", "₹50", "₹1 lakh", "₹2 lakh")
+
+
+@dataclass(frozen=True)
+class AdContextFlags:
+    """Keyword checks of one ad's copy, computed once per ad."""
+    requires_ios: bool = False
+    requires_smartphone: bool = False
+    requires_form: bool = False
+    is_luxury: bool = False
+    has_red_flags: bool = False  # only when the context carries scam_indicators
+
+    @classmethod
+    def from_context(cls, ad_context: Optional[dict]) -> "AdContextFlags":
+        if not ad_context:
+            return cls()
+        copy = (ad_context.get("copy") or "").lower()
+        return cls(
+            requires_ios=any(word in copy for word in IOS_KEYWORDS),
+            requires_smartphone=any(word in copy for word in APP_INSTALL_KEYWORDS),
+            requires_form=any(word in copy for word in FORM_KEYWORDS),
+            is_luxury=any(word in copy for word in LUXURY_KEYWORDS),
+            has_red_flags="scam_indicators" in ad_context and ad_context["scam_indicators"] != "None detected",
+        )
+
+
+NO_AD_CONTEXT = AdContextFlags()
+
+
+def _reaction_columns(
+    rows: List[Tuple[EnrichedPersona, AdReaction, AdContextFlags]]
+) -> Dict[str, np.ndarray]:
+    """Columnar view of (persona, reaction, ad flags) rows for the rule predicates."""
+    def col(values, dtype=object):
+        return np.array(values, dtype=dtype)
+
+    return {
+        "trust": col([r.trust_score for _, r, _ in rows], np.int64),
+        "relevance": col([r.relevance_score for _, r, _ in rows], np.int64),
+        "action": col([r.action for _, r, _ in rows]),
+        "intent": col([r.intent_level for _, r, _ in rows]),
+        "device": col([p.primary_device for p, _, _ in rows]),
+        "literacy": col([p.digital_literacy for p, _, _ in rows], np.int64),
+        "power_tier": col([p.purchasing_power_tier for p, _, _ in rows]),
+        "vulnerability": col([p.scam_vulnerability for p, _, _ in rows]),
+        "requires_ios": col([f.requires_ios for _, _, f in rows], bool),
+        "requires_smartphone": col([f.requires_smartphone for _, _, f in rows], bool),
+        "requires_form": col([f.requires_form for _, _, f in rows], bool),
+        "is_luxury": col([f.is_luxury for _, _, f in rows], bool),
+        "has_red_flags": col([f.has_red_flags for _, _, f in rows], bool),
+        # Barrier text is only consulted where the ad needs a form / is a luxury product
+        "mentions_form_barrier": col([
+            f.requires_form and any("literacy" in b.lower() or "form" in b.lower() for b in r.barriers)
+            for _, r, f in rows
+        ], bool),
+        "mentions_price_barrier": col([
+            f.is_luxury and any("afford" in b.lower() or "expensive" in b.lower() for b in r.barriers)
+            for _, r, f in rows
+        ], bool),
+    }
+
+
+Columns = Dict[str, np.ndarray]
+
+# (predicate over columns -> bool mask, message for one flagged row), in check order
+VALIDATION_RULES: List[Tuple[Callable[[Columns], np.ndarray], Callable[[Columns, int], str]]] = [
+    # CHECK 1: The "Scam Paradox" - user says "this looks sketchy" but still clicks
+    (
+        lambda c: (c["trust"] < TRUST_SCORE_THRESHOLD) & (c["action"] == "CLICK"),
+        lambda c, i: f"SUSPICIOUS_CLICK_DESPITE_LOW_TRUST: trust={c['trust'][i]}, action={c['action'][i]}",
+    ),
+    # CHECK 2: The "Device Mismatch" - iOS app ad converting an Android / Feature Phone user
+    (
+        lambda c: c["requires_ios"] & np.isin(c["device"], ["Android", "Feature Phone"])
+        & (c["action"] == "CLICK") & np.isin(c["intent"], ["High", "Medium"]),
+        lambda c, i: f"IMPOSSIBLE_CONVERSION_DEVICE_MISMATCH: ad_requires=iOS, user_device={c['device'][i]}",
+    ),
+    # ... and an app install ad clicked from a Feature Phone
+    (
+        lambda c: c["requires_smartphone"] & (c["device"] == "Feature Phone") & (c["action"] == "CLICK"),
+        lambda c, i: "IMPOSSIBLE_ACTION_FEATURE_PHONE: ad_requires=smartphone, user_device=Feature Phone",
+    ),
+    # CHECK 3: The "Literacy Barrier" - complex form converting a low-literacy user without a stated barrier
+    (
+        lambda c: c["requires_form"] & (c["literacy"] < MIN_LITERACY_FOR_COMPLEX_FORM)
+        & (c["action"] == "CLICK") & (c["intent"] == "High") & ~c["mentions_form_barrier"],
+        lambda c, i: f"UNREALISTIC_CONVERSION_LOW_LITERACY: literacy={c['literacy'][i]}, requires_form=True",
+    ),
+    # CHECK 4: The "Affordability Paradox" - high intent for a luxury product from a low-income user
+    (
+        lambda c: c["is_luxury"] & (c["power_tier"] == "Low") & (c["intent"] == "High") & ~c["mentions_price_barrier"],
+        lambda c, i: "UNLIKELY_HIGH_INTENT_LOW_INCOME: income_tier=Low, product=luxury, intent=High",
+    ),
+    # CHECK 5: The "Scam Vulnerability Mismatch" - vulnerable persona fully trusts an ad with red flags
+    (
+        lambda c: (c["vulnerability"] == "High") & c["has_red_flags"] & (c["trust"] >= 7),
+        lambda c, i: f"UNREALISTIC_TRUST_HIGH_VULNERABILITY: vulnerability=High, scam_indicators=Yes, trust={c['trust'][i]}",
+    ),
+    # CHECK 6: The "Relevance-Action Mismatch" - very low relevance but still high intent
+    (
+        lambda c: (c["relevance"] <= 2) & (c["intent"] == "High"),
+        lambda c, i: f"INCONSISTENT_INTENT: relevance={c['relevance'][i]}, intent=High",
+    ),
+    # CHECK 7: The "Report Action Validation" - reports the ad despite high trust / relevance
+    (
+        lambda c: (c["action"] == "REPORT") & ((c["trust"] >= 6) | (c["relevance"] >= 7)),
+        lambda c, i: f"CONTRADICTORY_REPORT: action=REPORT, trust={c['trust'][i]}, relevance={c['relevance'][i]}",
+    ),
+]
+
+
 class ReactionValidator:
     """Cross-checks LLM reactions for logical consistency."""
-    
+
+    def _flag_rows(self, rows: List[Tuple[EnrichedPersona, AdReaction, AdContextFlags]]) -> List[List[str]]:
+        """Flag messages per row (empty list = valid), one vectorized pass per rule."""
+        flags: List[List[str]] = [[] for _ in rows]
+        if not rows:
+            return flags
+        columns = _reaction_columns(rows)
+        for predicate, message in VALIDATION_RULES:
+            for i in np.flatnonzero(predicate(columns)):
+                flags[i].append(message(columns, i))
+        return flags
+
     def validate_reaction(self, persona: EnrichedPersona, reaction: AdReaction, ad_context: dict = None) -> ValidationResult:
         """Run multiple validation checks on a single reaction."""
-        flags = []
-        
-        # CHECK 1: The "Scam Paradox"
-        # User says "This looks sketchy" but still clicks
-        if reaction.trust_score < TRUST_SCORE_THRESHOLD and reaction.action == "CLICK":
-            flags.append(
-                f"SUSPICIOUS_CLICK_DESPITE_LOW_TRUST: trust={reaction.trust_score}, action={reaction.action}"
-            )
-        
-        # CHECK 2: The "Device Mismatch"
-        # iOS app ad shown to Android/Feature Phone user
-        if ad_context:
-            ad_copy_lower = ad_context.get("copy", "").lower()
-            
-            if "ios" in ad_copy_lower or "app store" in ad_copy_lower or "iphone" in ad_copy_lower:
-                if persona.primary_device in ["Android", "Feature Phone"]:
-                    if reaction.action == "CLICK" and reaction.intent_level in ["High", "Medium"]:
-                        flags.append(
-                            f"IMPOSSIBLE_CONVERSION_DEVICE_MISMATCH: ad_requires=iOS, user_device={persona.primary_device}"
-                        )
-            
-            # Android app to Feature Phone user
-            if "download app" in ad_copy_lower or "install now" in ad_copy_lower:
-                if persona.primary_device == "Feature Phone":
-                    if reaction.action == "CLICK":
-                        flags.append(
-                            f"IMPOSSIBLE_ACTION_FEATURE_PHONE: ad_requires=smartphone, user_device=Feature Phone"
-                        )
-        
-        # CHECK 3: The "Literacy Barrier"
-        # Complex form/action for low-literacy user
-        if ad_context:
-            ad_copy_lower = ad_context.get("copy", "").lower()
-            requires_form = any(word in ad_copy_lower for word in [
-                "fill", "form", "register", "sign up", "apply now", "details"
-            ])
-            
-            if requires_form and persona.digital_literacy < MIN_LITERACY_FOR_COMPLEX_FORM:
-                if reaction.action == "CLICK" and reaction.intent_level == "High":
-                    # Check if barriers were mentioned
-                    if not any("literacy" in b.lower() or "form" in b.lower() for b in reaction.barriers):
-                        flags.append(
-                            f"UNREALISTIC_CONVERSION_LOW_LITERACY: literacy={persona.digital_literacy}, requires_form=True"
-                        )
-        
-        # CHECK 4: The "Affordability Paradox"
-        # High-intent for luxury product by low-income user
-        if ad_context:
-            ad_copy_lower = ad_context.get("copy", "").lower()
-            
-            # Detect luxury/high-price indicators
-            is_luxury = any(word in ad_copy_lower for word in [
-                "premium", "luxury", "exclusive", "₹50", "₹1 lakh", "₹2 lakh"
-            ])
-            
-            if is_luxury and persona.purchasing_power_tier == "Low":
-                if reaction.intent_level == "High":
-                    if not any("afford" in b.lower() or "expensive" in b.lower() for b in reaction.barriers):
-                        flags.append(
-                            f"UNLIKELY_HIGH_INTENT_LOW_INCOME: income_tier=Low, product=luxury, intent=High"
-                        )
-        
-        # CHECK 5: The "Scam Vulnerability Mismatch"
-        # High scam vulnerability person shows no suspicion of suspicious ad
-        if persona.scam_vulnerability == "High":
-            if ad_context and "scam_indicators" in ad_context:
-                has_red_flags = ad_context["scam_indicators"] != "None detected"
-                
-                if has_red_flags and reaction.trust_score >= 7:
-                    flags.append(
-                        f"UNREALISTIC_TRUST_HIGH_VULNERABILITY: vulnerability=High, scam_indicators=Yes, trust={reaction.trust_score}"
-                    )
-        
-        # CHECK 6: The "Relevance-Action Mismatch"
-        # Very low relevance but still high intent
-        if reaction.relevance_score <= 2 and reaction.intent_level == "High":
-            flags.append(
-                f"INCONSISTENT_INTENT: relevance={reaction.relevance_score}, intent=High"
-            )
-        
-        # CHECK 7: The "Report Action Validation"
-        # User reports ad but has high trust/relevance
-        if reaction.action == "REPORT":
-            if reaction.trust_score >= 6 or reaction.relevance_score >= 7:
-                flags.append(
-                    f"CONTRADICTORY_REPORT: action=REPORT, trust={reaction.trust_score}, relevance={reaction.relevance_score}"
-                )
-        
+        flags = self._flag_rows([(persona, reaction, AdContextFlags.from_context(ad_context))])[0]
         if flags:
             return ValidationResult(status="FLAGGED", reasons=flags)
-        
+
         return ValidationResult(status="VALID", reasons=[])
-    
-    def validate_batch(
-        self, 
-        personas: List[EnrichedPersona], 
+
+    def validate_and_filter(
+        self,
+        personas: List[EnrichedPersona],
         reactions: List[AdReaction],
         ad_contexts: dict = None
-    ) -> dict:
-        """Validate all reactions and return summary."""
+    ) -> Tuple[dict, List[AdReaction]]:
+        """
+        Validate all reactions once: (summary as in validate_batch, valid reactions).
+        Reactions whose persona is unknown count towards total but are neither valid nor flagged.
+        """
         persona_map = {p.uuid: p for p in personas}
-        
-        valid_count = 0
-        flagged_count = 0
-        flagged_reactions = []
-        
+        ad_flags = {ad_id: AdContextFlags.from_context(ctx) for ad_id, ctx in (ad_contexts or {}).items()}
+
+        rows = []
         for reaction in reactions:
             persona = persona_map.get(reaction.persona_uuid)
-            if not persona:
-                continue
-            
-            ad_ctx = ad_contexts.get(reaction.ad_id) if ad_contexts else None
-            
-            validation = self.validate_reaction(persona, reaction, ad_ctx)
-            
-            if validation.status == "VALID":
-                valid_count += 1
+            if persona:
+                rows.append((persona, reaction, ad_flags.get(reaction.ad_id, NO_AD_CONTEXT)))
+
+        valid_reactions = []
+        flagged_reactions = []
+        for (_, reaction, _), flags in zip(rows, self._flag_rows(rows)):
+            if not flags:
+                valid_reactions.append(reaction)
             else:
-                flagged_count += 1
                 flagged_reactions.append({
                     "persona_uuid": reaction.persona_uuid,
                     "ad_id": reaction.ad_id,
-                    "flags": validation.reasons,
+                    "flags": flags,
                     "reaction": reaction
                 })
-        
-        flagged_percentage = (flagged_count / len(reactions) * 100) if reactions else 0
-        
-        return {
+
+        flagged_percentage = (len(flagged_reactions) / len(reactions) * 100) if reactions else 0
+
+        summary = {
             "total": len(reactions),
-            "valid": valid_count,
-            "flagged": flagged_count,
+            "valid": len(valid_reactions),
+            "flagged": len(flagged_reactions),
             "flagged_percentage": flagged_percentage,
             "flagged_reactions": flagged_reactions
         }
-    
+        return summary, valid_reactions
+
+    def validate_batch(
+        self,
+        personas: List[EnrichedPersona],
+        reactions: List[AdReaction],
+        ad_contexts: dict = None
+    ) -> dict:
+        """Validate all reactions and return summary."""
+        return self.validate_and_filter(personas, reactions, ad_contexts)[0]
+
     def filter_valid_reactions(
         self,
         personas: List[EnrichedPersona],
@@ -153,21 +210,7 @@ class ReactionValidator:
         ad_contexts: dict = None
     ) -> List[AdReaction]:
         """Return only valid reactions, discarding flagged ones."""
-        persona_map = {p.uuid: p for p in personas}
-        valid_reactions = []
-        
-        for reaction in reactions:
-            persona = persona_map.get(reaction.persona_uuid)
-            if not persona:
-                continue
-            
-            ad_ctx = ad_contexts.get(reaction.ad_id) if ad_contexts else None
-            validation = self.validate_reaction(persona, reaction, ad_ctx)
-            
-            if validation.status == "VALID":
-                valid_reactions.append(reaction)
-        
-        return valid_reactions
+        return self.validate_and_filter(personas, reactions, ad_contexts)[1]
 
 
 # Global singleton
@@ -7,11 +7,24 @@ from pathlib import Path
 
 from src.utils.schemas import RawPersona
 from src.utils.config import DATA_DIR, DB_PATH
+from src.data.search_index import PersonaSearchIndex, tokenize_query
 
 
 class PersonaDataLoader:
     """Load and manage persona data using DuckDB."""
     
+    # All RawPersona columns of the Nemotron personas table
+    PERSONA_COLUMNS = (
+        "uuid, occupation, first_language, second_language, third_language, "
+        "sex, age, marital_status, education_level, education_degree, "
+        "state, district, zone, country, "
+        "professional_persona, linguistic_persona, cultural_background, "
+        "sports_persona, arts_persona, travel_persona, culinary_persona, persona, "
+        "hobbies_and_interests_list, skills_and_expertise_list, "
+        "hobbies_and_interests, skills_and_expertise, "
+        "career_goals_and_ambitions, linguistic_background"
+    )
+    
     def __init__(self):
         self.db_path = DB_PATH
         self.conn = None
@@ -20,11 +33,49 @@ class PersonaDataLoader:
         """Connect to DuckDB."""
         self.conn = duckdb.connect(self.db_path)
     
+    def _ensure_connected(self):
+        """Reconnect if there is no connection or the previous one was closed."""
+        if self.conn is not None:
+            try:
+                self.conn.execute("SELECT 1")
+                return
+            except Exception:
+                pass
+        self.connect()
+    
+    def build_search_index(self):
+        """Build the BM25 persona search index (see src/data/search_index.py)."""
+        try:
+            PersonaSearchIndex(self.conn).build()
+        except Exception as e:
+            print(f"⚠️ Could not build persona search index: {e}")
+    
     def close(self):
         """Close connection."""
         if self.conn:
             self.conn.close()
     
+    def _sampled_select(self, columns: str, count: int, where: str = "", seed: Optional[int] = None) -> str:
+        """
+        Build a query that picks `count` random personas without sorting the wide table.
+        
+        Sampling runs over the narrow uuid column only; the rich narrative columns are
+        then fetched for the chosen uuids via a join. With a seed the pick is a
+        deterministic hash top-N (reproducible across runs and thread counts);
+        without one it is a DuckDB reservoir sample.
+        """
+        source = f"SELECT uuid FROM personas WHERE {where}" if where else "SELECT uuid FROM personas"
+        if seed is not None:
+            picked = f"SELECT uuid FROM ({source}) ORDER BY hash(uuid, {int(seed)}) LIMIT {int(count)}"
+        else:
+            picked = f"SELECT uuid FROM ({source}) USING SAMPLE reservoir({int(count)} ROWS)"
+        return f"""
+            WITH picked AS ({picked})
+            SELECT {columns}
+            FROM personas JOIN picked USING (uuid)
+            ORDER BY uuid
+            """
+    
     def load_from_csv(self, csv_path: str, limit: int = None):
         """Load personas from CSV file."""
         self.connect()
@@ -41,6 +92,7 @@ class PersonaDataLoader:
         self.conn.execute("CREATE TABLE personas AS SELECT * FROM df")
         
         print(f"✅ Loaded {len(df)} personas into DuckDB")
+        self.build_search_index()
         
         self.close()
         return df
@@ -57,6 +109,7 @@ class PersonaDataLoader:
             self.conn.execute("DROP TABLE IF EXISTS personas")
             self.conn.execute("CREATE TABLE personas AS SELECT * FROM df")
             print(f"✅ Loaded {len(df)} personas from HuggingFace into DuckDB")
+            self.build_search_index()
             # Do not close() here so filter_by_keywords / load_sample_personas can reuse this connection
             return df
         except ImportError:
@@ -66,7 +119,7 @@ class PersonaDataLoader:
             print(f"⚠️ Error loading from HuggingFace: {e}")
             raise
     
-    def filter_exporters_freelancers_smes(self, count: int = 10) -> List[RawPersona]:
+    def filter_exporters_freelancers_smes(self, count: int = 10, seed: Optional[int] = None) -> List[RawPersona]:
         """Filter personas for B2B fintech: business owners, managers, professionals doing international business/payments."""
         print("\n🎯 FILTERING FOR B2B FINTECH PERSONAS")
         print("="*80)
@@ -128,8 +181,8 @@ class PersonaDataLoader:
             business_filter = " OR ".join([f"LOWER(professional_persona) LIKE '%{kw}%'" for kw in business_keywords])
             skills_business_filter = " OR ".join([f"LOWER(skills_and_expertise) LIKE '%{kw}%'" for kw in business_keywords])
             
-            query = f"""
-            SELECT 
+            query = self._sampled_select(
+                columns="""
                 uuid, occupation, first_language, second_language, third_language,
                 sex, age, marital_status, education_level, education_degree,
                 state, district, zone, country,
@@ -138,29 +191,29 @@ class PersonaDataLoader:
                 hobbies_and_interests_list, skills_and_expertise_list,
                 hobbies_and_interests, skills_and_expertise, 
                 career_goals_and_ambitions, linguistic_background
-            FROM personas 
-            WHERE ({occupation_filter})
+                """,
+                count=count * 3,
+                where=f"""({occupation_filter})
                 AND ({education_filter})
-                AND (({business_filter}) OR ({skills_business_filter}) OR LOWER(occupation) LIKE '%export%' OR LOWER(occupation) LIKE '%import%')
-            ORDER BY RANDOM() 
-            LIMIT {count * 3}
-            """
+                AND (({business_filter}) OR ({skills_business_filter}) OR LOWER(occupation) LIKE '%export%' OR LOWER(occupation) LIKE '%import%')""",
+                seed=seed,
+            )
         else:
             skills_business_filter = " OR ".join([f"LOWER(skills_and_expertise_list) LIKE '%{kw}%'" for kw in business_keywords])
             
-            query = f"""
-            SELECT 
+            query = self._sampled_select(
+                columns="""
                 uuid, occupation, first_language, second_language, third_language,
                 sex, age, marital_status, education_level, education_degree,
                 state, district, zone, country,
                 hobbies_and_interests_list, skills_and_expertise_list
-            FROM personas 
-            WHERE ({occupation_filter})
+                """,
+                count=count * 3,
+                where=f"""({occupation_filter})
                 AND ({education_filter})
-                AND ({skills_business_filter} OR LOWER(occupation) LIKE '%export%' OR LOWER(occupation) LIKE '%import%')
-            ORDER BY RANDOM() 
-            LIMIT {count * 3}
-            """
+                AND ({skills_business_filter} OR LOWER(occupation) LIKE '%export%' OR LOWER(occupation) LIKE '%import%')""",
+                seed=seed,
+            )
         
         try:
             print(f"\n⏳ Querying database for relevant personas...")
@@ -404,15 +457,18 @@ class PersonaDataLoader:
             personas.append(RawPersona(**persona_data))
         return personas
 
-    def load_sample_personas(self, count: int = 1000) -> List[RawPersona]:
-        """Load a random sample of personas with full narrative context."""
+    def load_sample_personas(self, count: int = 1000, seed: Optional[int] = None) -> List[RawPersona]:
+        """Load a random sample of personas with full narrative context.
+        
+        Pass a seed for a reproducible sample.
+        """
         self.connect()
         
         # Check if table exists
         try:
             # Try to get all rich fields if they exist
-            query = f"""
-            SELECT 
+            query = self._sampled_select(
+                columns="""
                 uuid, occupation, first_language, second_language, third_language,
                 sex, age, marital_status, education_level, education_degree,
                 state, district, zone, country,
@@ -421,10 +477,10 @@ class PersonaDataLoader:
                 hobbies_and_interests_list, skills_and_expertise_list,
                 hobbies_and_interests, skills_and_expertise, 
                 career_goals_and_ambitions, linguistic_background
-            FROM personas 
-            ORDER BY RANDOM() 
-            LIMIT {count}
-            """
+                """,
+                count=count,
+                seed=seed,
+            )
             
             df = self.conn.execute(query).df()
             
@@ -489,15 +545,43 @@ class PersonaDataLoader:
             self.close()
             return self._generate_synthetic_personas(count)
     
-    def filter_by_keywords(self, keywords: List[str], count: int = 10) -> List[RawPersona]:
+    def filter_by_keywords(self, keywords: List[str], count: int = 10, seed: Optional[int] = None) -> List[RawPersona]:
         """
-        Filter personas from the DB whose occupation or professional_persona
-        matches any of the provided keywords (case-insensitive LIKE).
-        Falls back to load_sample_personas if no matches found.
+        Return the personas most relevant to the keywords, best match first.
+        
+        Ranks occupation / professional_persona / skills_and_expertise with the BM25
+        search index (built at load time, or lazily here if missing). Falls back to a
+        LIKE scan if the index is unavailable, and to load_sample_personas if nothing matches.
         """
-        if not self.conn:
-            self.connect()
+        self._ensure_connected()
+
+        terms = tokenize_query(" ".join(keywords))
+        try:
+            index = PersonaSearchIndex(self.conn)
+            index.ensure()
+            hits = index.search(terms, limit=count)
+            if not hits:
+                self.close()
+                return self.load_sample_personas(count=count, seed=seed)
+
+            ranked_uuids = [uuid for uuid, _ in hits]
+            df = self.conn.execute(
+                f"SELECT {self.PERSONA_COLUMNS} FROM personas "
+                f"WHERE CAST(uuid AS VARCHAR) IN (SELECT UNNEST(?::VARCHAR[]))",
+                [ranked_uuids],
+            ).df()
+            rank = {uuid: i for i, uuid in enumerate(ranked_uuids)}
+            df = df.assign(_rank=df["uuid"].astype(str).map(rank)).sort_values("_rank")
+            personas = self._rows_to_personas(df)
+            self.close()
+            return personas if personas else self.load_sample_personas(count=count, seed=seed)
+        except Exception as exc:
+            print(f"[PERSONA] [filter_by_keywords] Search index unavailable, using LIKE scan | error={exc!r}")
+            self._ensure_connected()
+            return self._filter_by_keywords_like(keywords, count=count, seed=seed)
 
+    def _filter_by_keywords_like(self, keywords: List[str], count: int = 10, seed: Optional[int] = None) -> List[RawPersona]:
+        """Unindexed fallback: case-insensitive LIKE over the text columns, random pick of matches."""
         # Build LIKE clauses across occupation and professional_persona
         conditions = []
         for kw in keywords[:10]:  # cap to avoid overly large queries
@@ -531,47 +615,52 @@ class PersonaDataLoader:
 
             if df.empty:
                 self.close()
-                return self.load_sample_personas(count=count)
+                return self.load_sample_personas(count=count, seed=seed)
 
-            df = df.sample(min(count, len(df))).reset_index(drop=True)
-            personas = []
-            for _, row in df.iterrows():
-                try:
-                    persona_data = {
-                        "uuid": str(row["uuid"]),
-                        "occupation": row["occupation"],
-                        "first_language": row["first_language"],
-                        "second_language": row.get("second_language"),
-                        "third_language": row.get("third_language"),
-                        "sex": row["sex"],
-                        "age": int(row["age"]),
-                        "marital_status": row["marital_status"],
-                        "education_level": row["education_level"],
-                        "education_degree": row.get("education_degree"),
-                        "state": row["state"],
-                        "district": row["district"],
-                        "zone": row["zone"],
-                        "country": row.get("country", "India"),
-                    }
-                    for field in (
-                        "professional_persona", "linguistic_persona", "cultural_background",
-                        "sports_persona", "arts_persona", "travel_persona", "culinary_persona",
-                        "persona", "hobbies_and_interests_list", "skills_and_expertise_list",
-                        "hobbies_and_interests", "skills_and_expertise",
-                        "career_goals_and_ambitions", "linguistic_background",
-                    ):
-                        if field in row and pd.notna(row[field]):
-                            persona_data[field] = row[field]
-                    personas.append(RawPersona(**persona_data))
-                except Exception:
-                    continue
+            df = df.sample(min(count, len(df)), random_state=seed).reset_index(drop=True)
+            personas = self._rows_to_personas(df)
             self.close()
-            return personas if personas else self.load_sample_personas(count=count)
+            return personas if personas else self.load_sample_personas(count=count, seed=seed)
         except Exception as exc:
             print(f"[PERSONA] [filter_by_keywords] FAILED | error={exc!r} | error_type={type(exc).__name__}")
             self.close()
             print(f"[PERSONA] [filter_by_keywords] Falling back to load_sample_personas(count={count})")
-            return self.load_sample_personas(count=count)
+            return self.load_sample_personas(count=count, seed=seed)
+
+    def _rows_to_personas(self, df: pd.DataFrame) -> List[RawPersona]:
+        """Convert persona rows to RawPersona, skipping rows that fail validation."""
+        personas = []
+        for _, row in df.iterrows():
+            try:
+                persona_data = {
+                    "uuid": str(row["uuid"]),
+                    "occupation": row["occupation"],
+                    "first_language": row["first_language"],
+                    "second_language": row.get("second_language"),
+                    "third_language": row.get("third_language"),
+                    "sex": row["sex"],
+                    "age": int(row["age"]),
+                    "marital_status": row["marital_status"],
+                    "education_level": row["education_level"],
+                    "education_degree": row.get("education_degree"),
+                    "state": row["state"],
+                    "district": row["district"],
+                    "zone": row["zone"],
+                    "country": row.get("country", "India"),
+                }
+                for field in (
+                    "professional_persona", "linguistic_persona", "cultural_background",
+                    "sports_persona", "arts_persona", "travel_persona", "culinary_persona",
+                    "persona", "hobbies_and_interests_list", "skills_and_expertise_list",
+                    "hobbies_and_interests", "skills_and_expertise",
+                    "career_goals_and_ambitions", "linguistic_background",
+                ):
+                    if field in row and pd.notna(row[field]):
+                        persona_data[field] = row[field]
+                personas.append(RawPersona(**persona_data))
+            except Exception:
+                continue
+        return personas
 
     def _generate_synthetic_personas(self, count: int) -> List[RawPersona]:
         """Generate synthetic personas for demo purposes."""
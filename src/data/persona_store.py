@@ -0,0 +1,105 @@
+"""Persistent store for hydrated (LLM-enriched) personas.
+
+Hydration asks the LLM for purchasing power, literacy, device etc. The answer only
+depends on the raw persona and the hydration prompt, so it is stored in DuckDB
+keyed by (persona uuid, prompt version) and reused across runs. Changing the
+hydration prompt or model changes the version and naturally invalidates old rows.
+"""
+
+import json
+from typing import Dict, List
+
+import duckdb
+
+from src.utils.schemas import EnrichedPersona
+from src.utils.config import DB_PATH
+
+
+class HydratedPersonaStore:
+    """DuckDB table of EnrichedPersona records, versioned by hydration prompt hash."""
+
+    TABLE = "hydrated_personas"
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        conn = duckdb.connect(self.db_path)
+        if not self._initialized:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    uuid VARCHAR NOT NULL,
+                    prompt_version VARCHAR NOT NULL,
+                    payload VARCHAR NOT NULL,
+                    created_at TIMESTAMP DEFAULT current_timestamp,
+                    PRIMARY KEY (uuid, prompt_version)
+                )
+                """
+            )
+            self._initialized = True
+        return conn
+
+    def get_many(self, uuids: List[str], prompt_version: str) -> Dict[str, EnrichedPersona]:
+        """Return stored personas for the given uuids (missing uuids are simply absent)."""
+        if not uuids:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    f"SELECT uuid, payload FROM {self.TABLE} "
+                    f"WHERE prompt_version = ? AND uuid IN (SELECT UNNEST(?::VARCHAR[]))",
+                    [prompt_version, list(set(uuids))],
+                ).fetchall()
+            finally:
+                conn.close()
+        except Exception as exc:
+            print(f"[PERSONA_STORE] [get_many] FAILED | error={exc!r}")
+            return {}
+
+        found = {}
+        for uuid, payload in rows:
+            try:
+                found[uuid] = EnrichedPersona.model_validate_json(payload)
+            except Exception:
+                continue  # schema drift: treat as a miss and re-hydrate
+        return found
+
+    def put_many(self, personas: List[EnrichedPersona], prompt_version: str) -> int:
+        """Upsert hydrated personas. Returns the number of rows written."""
+        if not personas:
+            return 0
+        rows = [(p.uuid, prompt_version, json.dumps(p.model_dump())) for p in personas]
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (uuid, prompt_version, payload) VALUES (?, ?, ?)",
+                    rows,
+                )
+            finally:
+                conn.close()
+        except Exception as exc:
+            print(f"[PERSONA_STORE] [put_many] FAILED | error={exc!r}")
+            return 0
+        return len(rows)
+
+    def count(self, prompt_version: str | None = None) -> int:
+        """Number of stored personas (optionally for one prompt version)."""
+        conn = self._connect()
+        try:
+            if prompt_version:
+                (n,) = conn.execute(
+                    f"SELECT COUNT(*) FROM {self.TABLE} WHERE prompt_version = ?", [prompt_version]
+                ).fetchone()
+            else:
+                (n,) = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()
+            return n
+        finally:
+            conn.close()
+
+
+# Global singleton
+hydrated_persona_store = HydratedPersonaStore()
@@ -0,0 +1,169 @@
+"""BM25 full-text index over the personas table, stored as plain DuckDB tables.
+
+Built once when personas are loaded (and lazily if missing or stale):
+
+  persona_terms    (term, uuid, tf)   postings, sorted by term so that
+                                      `term IN (...)` lookups prune row groups
+  persona_docs     (uuid, doc_len)    weighted document lengths
+  persona_term_df  (term, df)         document frequencies
+  persona_index_meta                  persona count at build time (staleness check)
+
+Occupation matches are weighted above narrative matches. This avoids the DuckDB
+FTS extension so it works without downloading extensions at runtime.
+"""
+
+import re
+from typing import List, Tuple
+
+import duckdb
+
+
+# Indexed text columns and their term weights (BM25F-style field boosting)
+INDEXED_FIELDS = {
+    "occupation": 3.0,
+    "professional_persona": 1.0,
+    "skills_and_expertise": 1.0,
+}
+
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "their", "they", "them",
+    "who", "whom", "has", "have", "had", "are", "was", "were", "his", "her", "she",
+    "him", "its", "into", "also", "about", "over", "such", "been", "being", "which",
+    "while", "where", "when", "than", "then", "all", "any", "can", "not", "but",
+    "our", "your", "you", "will", "would", "other", "more", "most", "very",
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _normalize_sql(expr: str) -> str:
+    """SQL for the light plural stemming applied to indexed terms (mirrors normalize_term)."""
+    return (
+        f"CASE WHEN length({expr}) > 4 AND {expr} LIKE '%s' AND {expr} NOT LIKE '%ss' "
+        f"THEN substr({expr}, 1, length({expr}) - 1) ELSE {expr} END"
+    )
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase + drop a trailing plural 's' (freelancers → freelancer)."""
+    term = term.lower()
+    if len(term) > 4 and term.endswith("s") and not term.endswith("ss"):
+        return term[:-1]
+    return term
+
+
+def tokenize_query(text: str) -> List[str]:
+    """Split free text into normalized, de-duplicated index terms."""
+    terms = []
+    for raw in re.split(r"[^a-z0-9]+", text.lower()):
+        if len(raw) <= 2 or raw in STOPWORDS:
+            continue
+        term = normalize_term(raw)
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+class PersonaSearchIndex:
+    """Builds and queries the BM25 persona index on an open DuckDB connection."""
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        self.conn = conn
+
+    def _tables(self) -> set:
+        rows = self.conn.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def is_current(self) -> bool:
+        """True if the index exists and was built from the current personas table."""
+        tables = self._tables()
+        if not {"persona_terms", "persona_docs", "persona_term_df", "persona_index_meta", "personas"} <= tables:
+            return False
+        (n_personas,) = self.conn.execute("SELECT COUNT(*) FROM personas").fetchone()
+        row = self.conn.execute("SELECT persona_count FROM persona_index_meta").fetchone()
+        return row is not None and row[0] == n_personas
+
+    def build(self) -> int:
+        """(Re)build the index from the personas table. Returns number of postings."""
+        columns = {r[0] for r in self.conn.execute("DESCRIBE personas").fetchall()}
+        fields = [(col, w) for col, w in INDEXED_FIELDS.items() if col in columns]
+        if not fields:
+            raise ValueError("personas table has none of the indexed text columns")
+
+        field_sql = "\n    UNION ALL ".join(
+            f"SELECT uuid, {col} AS txt, {w} AS w FROM personas" for col, w in fields
+        )
+        stopwords_sql = ", ".join(f"'{w}'" for w in sorted(STOPWORDS))
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TABLE persona_terms AS
+            WITH fields AS (
+                {field_sql}
+            ),
+            tokens AS (
+                SELECT uuid, w,
+                       UNNEST(regexp_split_to_array(LOWER(COALESCE(txt, '')), '[^a-z0-9]+')) AS raw
+                FROM fields
+            )
+            SELECT {_normalize_sql('raw')} AS term, CAST(uuid AS VARCHAR) AS uuid, SUM(w) AS tf
+            FROM tokens
+            WHERE length(raw) > 2 AND raw NOT IN ({stopwords_sql})
+            GROUP BY 1, 2
+            ORDER BY term
+            """
+        )
+        self.conn.execute(
+            "CREATE OR REPLACE TABLE persona_docs AS "
+            "SELECT uuid, SUM(tf) AS doc_len FROM persona_terms GROUP BY uuid"
+        )
+        self.conn.execute(
+            "CREATE OR REPLACE TABLE persona_term_df AS "
+            "SELECT term, COUNT(*) AS df FROM persona_terms GROUP BY term ORDER BY term"
+        )
+        self.conn.execute(
+            "CREATE OR REPLACE TABLE persona_index_meta AS "
+            "SELECT COUNT(*) AS persona_count, current_timestamp AS built_at FROM personas"
+        )
+        (n,) = self.conn.execute("SELECT COUNT(*) FROM persona_terms").fetchone()
+        return n
+
+    def ensure(self) -> None:
+        """Build the index if it is missing or stale."""
+        if not self.is_current():
+            print("🔎 Building persona search index (BM25)...")
+            postings = self.build()
+            print(f"✅ Persona search index ready ({postings:,} postings)")
+
+    def search(self, terms: List[str], limit: int) -> List[Tuple[str, float]]:
+        """Return (uuid, bm25_score) for the best-matching personas, most relevant first."""
+        if not terms:
+            return []
+        # Literal IN-list (not a subquery) so min/max zonemaps on the sorted postings prune row groups
+        term_list = ", ".join("'" + t.replace("'", "''") + "'" for t in dict.fromkeys(terms))
+        return self.conn.execute(
+            f"""
+            WITH stats AS (SELECT COUNT(*) AS n, AVG(doc_len) AS avgdl FROM persona_docs),
+            hits AS (
+                SELECT t.uuid, t.term, t.tf, d.df
+                FROM persona_terms t
+                JOIN persona_term_df d ON d.term = t.term
+                WHERE t.term IN ({term_list})
+            )
+            SELECT h.uuid,
+                   SUM(
+                       LN(1 + (s.n - h.df + 0.5) / (h.df + 0.5))
+                       * (h.tf * ({BM25_K1} + 1))
+                       / (h.tf + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * pd.doc_len / s.avgdl))
+                   ) AS score
+            FROM hits h
+            JOIN persona_docs pd ON pd.uuid = h.uuid
+            CROSS JOIN stats s
+            GROUP BY h.uuid
+            ORDER BY score DESC, h.uuid
+            LIMIT ?
+            """,
+            [int(limit)],
+        ).fetchall()
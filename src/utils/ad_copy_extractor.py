@@ -1,11 +1,12 @@
-"""Ad copy extraction using vision models."""
+"""Ad copy extraction using vision models.
+
+Copy is read from the combined creative analysis (src/utils/creative_analysis.py),
+which also produces the visual anchor, so each image costs one Pro call total.
+"""
 
-import asyncio
-from tenacity import RetryError
 from pathlib import Path
-from typing import Optional
 
-from src.api.gemini_client import gemini_client
+from src.utils.creative_analysis import analyze_creative, analyze_creatives
 
 
 async def extract_ad_copy_from_image(image_path: str) -> str:
@@ -13,47 +14,17 @@ async def extract_ad_copy_from_image(image_path: str) -> str:
     
     print(f"   📸 Extracting copy from: {Path(image_path).name}")
     
-    try:
-        # Load image
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
-        
-        prompt = """You are analyzing an advertising creative image.
-
-Extract ALL TEXT visible in this ad image.
-
-Include:
-- Main headline
-- Subheadline
-- Body copy
-- Call-to-action
-- Any other visible text
-
-Return the text in a natural reading order. If there's no text, return "No text found in image".
-"""
-        
-        response = await gemini_client.generate_pro(prompt, image_data)
-        
-        # Clean up the response
-        copy = response.strip()
-        
-        if copy and "no text" not in copy.lower():
-            print(f"   ✅ Extracted: {copy[:80]}...")
-            return copy
-        else:
-            print(f"   ⚠️ No text found in image")
-            return ""
-            
-    except RetryError as e:
-        last_exc = e.last_attempt.exception() if e.last_attempt else None
-        if last_exc:
-            print(f"   ❌ Error extracting copy (retry exhausted): {last_exc}")
-        else:
-            print(f"   ❌ Error extracting copy (retry exhausted): {e}")
-        return ""
-    except Exception as e:
-        print(f"   ❌ Error extracting copy: {e}")
+    analysis = await analyze_creative(image_path)
+    if analysis is None:
+        print(f"   ❌ Error extracting copy: analysis failed")
         return ""
+    
+    copy = analysis["ad_copy"]
+    if copy:
+        print(f"   ✅ Extracted: {copy[:80]}...")
+    else:
+        print(f"   ⚠️ No text found in image")
+    return copy
 
 
 async def extract_copy_for_all_ads(ads_dir: Path) -> dict:
@@ -68,13 +39,14 @@ async def extract_copy_for_all_ads(ads_dir: Path) -> dict:
     print(f"\n📝 Extracting copy from {len(ad_files)} ad images...")
     print("-" * 80)
     
+    # All images at once; the Pro rate limiter in gemini_client bounds concurrency
+    analyses = await analyze_creatives([str(f) for f in ad_files])
     copy_map = {}
-
-    # Process sequentially to avoid rate-limit spikes
-    for ad_file in ad_files:
-        copy = await extract_ad_copy_from_image(str(ad_file))
-        copy_map[str(ad_file)] = copy
-        await asyncio.sleep(0.5)
+    for path, analysis in analyses.items():
+        copy = analysis["ad_copy"] if analysis else ""
+        copy_map[path] = copy
+        status = f"✅ {copy[:80]}..." if copy else ("⚠️ No text found" if analysis else "❌ Analysis failed")
+        print(f"   📸 {Path(path).name}: {status}")
     
     print("-" * 80)
     print(f"✅ Extraction complete\n")
@@ -15,7 +15,8 @@ DATA_DIR.mkdir(exist_ok=True)
 
 # API Configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "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")
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Override to point at a local OpenAI-compatible stub (benchmarks/fake_openrouter.py)
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Model Configuration (OpenRouter model IDs)
 # Using Claude for Pro tasks (vision capable) and GPT-3.5 for Flash tasks (fast/cheap)
@@ -25,11 +26,95 @@ GEMINI_FLASH_MODEL = os.getenv("GEMINI_FLASH_MODEL", "openai/gpt-3.5-turbo")
 # Simulation Configuration
 TIER1_SAMPLE_SIZE = int(os.getenv("TIER1_SAMPLE_SIZE", "100"))
 TIER2_SAMPLE_SIZE = int(os.getenv("TIER2_SAMPLE_SIZE", "900"))
+# Which personas get Pro (Tier 1): random | stratified (by audience cluster) | uncertainty
+# (clusters with the least certain prior outcome first) | neyman (cluster size x prior std
+# dev, at least one per cluster). TIER_ASSIGNMENT_SEED makes the split reproducible; unset
+# draws a fresh seed per run (logged and journaled)
+TIER_ASSIGNMENT_STRATEGY = os.getenv("TIER_ASSIGNMENT_STRATEGY", "random")
+TIER_ASSIGNMENT_SEED = int(os.environ["TIER_ASSIGNMENT_SEED"]) if os.getenv("TIER_ASSIGNMENT_SEED") else None
+# Calibrate Flash trust / relevance per audience cluster: TIER_CALIBRATION_PAIRS Tier 1
+# personas per cluster are also run with Flash (extra Flash calls x ads) and the Pro - Flash
+# offset, shrunk towards the overall one with weight TIER_CALIBRATION_SHRINKAGE, is added
+# to that cluster's Tier 2 scores
+TIER_CALIBRATION_ENABLED = os.getenv("TIER_CALIBRATION_ENABLED", "0") == "1"
+TIER_CALIBRATION_PAIRS = int(os.getenv("TIER_CALIBRATION_PAIRS", "3"))
+TIER_CALIBRATION_SHRINKAGE = float(os.getenv("TIER_CALIBRATION_SHRINKAGE", "5"))
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+# Adaptive (AIMD) concurrency per model tier: starts at MAX_CONCURRENT_REQUESTS,
+# grows while calls are healthy, halves on 429 / Retry-After
+PRO_MAX_CONCURRENCY = int(os.getenv("PRO_MAX_CONCURRENCY", "16"))
+FLASH_MAX_CONCURRENCY = int(os.getenv("FLASH_MAX_CONCURRENCY", "64"))
+PRO_LATENCY_TARGET_SECONDS = float(os.getenv("PRO_LATENCY_TARGET_SECONDS", "60"))
+FLASH_LATENCY_TARGET_SECONDS = float(os.getenv("FLASH_LATENCY_TARGET_SECONDS", "20"))
+# Tier 2 batching: >1 packs several (persona, ad) reactions into one Flash request
+TIER2_BATCH_SIZE = int(os.getenv("TIER2_BATCH_SIZE", "1"))
+TIER2_BATCH_MODE = os.getenv("TIER2_BATCH_MODE", "per_ad")  # per_ad | per_persona
+# Reaction prompts are assembled from per-persona / per-ad segments (src/core/prompt_builder.py).
+# inline keeps the original prompts; static_first moves the template into the system prompt
+# with [[placeholders]] and sends only the values, so the prefix is identical across calls
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "inline")  # inline | static_first
+PROMPT_SEGMENT_CACHE_SIZE = int(os.getenv("PROMPT_SEGMENT_CACHE_SIZE", "20000"))
+# Adaptive sampling (opt-in): run Tier 2 in randomized persona waves and stop once the
+# leading ad's high-intent Wilson interval separates from the rest and the budget split
+# has moved less than ADAPTIVE_SPLIT_TOLERANCE points for ADAPTIVE_STABLE_WAVES waves
+ADAPTIVE_SAMPLING_ENABLED = os.getenv("ADAPTIVE_SAMPLING_ENABLED", "0") == "1"
+ADAPTIVE_WAVE_SIZE = int(os.getenv("ADAPTIVE_WAVE_SIZE", "100"))
+ADAPTIVE_MIN_PERSONAS = int(os.getenv("ADAPTIVE_MIN_PERSONAS", "300"))
+ADAPTIVE_SPLIT_TOLERANCE = float(os.getenv("ADAPTIVE_SPLIT_TOLERANCE", "5.0"))
+ADAPTIVE_STABLE_WAVES = int(os.getenv("ADAPTIVE_STABLE_WAVES", "2"))
+ADAPTIVE_CONFIDENCE_Z = float(os.getenv("ADAPTIVE_CONFIDENCE_Z", "1.96"))
+
+# Checkpoint journals for resumable runs (--resume <run_id>), one directory per run
+RUN_JOURNAL_DIR = os.getenv("RUN_JOURNAL_DIR", str(DATA_DIR / "runs"))
 
 # DuckDB Configuration
 DB_PATH = os.getenv("DB_PATH", str(DATA_DIR / "apriori.db"))
 
+# Reuse LLM-hydrated personas across runs (DuckDB table hydrated_personas in DB_PATH)
+HYDRATION_STORE_ENABLED = os.getenv("HYDRATION_STORE_ENABLED", "1") == "1"
+
+# LLM response cache (opt-in): identical requests are served from a local SQLite file
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "0") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(Path(DB_PATH).parent / "llm_cache.sqlite"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+
+# Provider prompt caching: the system message is sent as a cache_control breakpoint for
+# models whose id starts with one of PROMPT_CACHE_MODELS (OpenRouter forwards it to Anthropic /
+# Gemini; other providers cache long prefixes implicitly) once it is at least
+# PROMPT_CACHE_MIN_CHARS long (providers ignore prefixes under ~1024 tokens)
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "1") == "1"
+PROMPT_CACHE_MODELS = tuple(m.strip() for m in os.getenv("PROMPT_CACHE_MODELS", "anthropic/,google/").split(",") if m.strip())
+PROMPT_CACHE_MIN_CHARS = int(os.getenv("PROMPT_CACHE_MIN_CHARS", "4000"))
+
+# LLM call telemetry (src/api/llm_telemetry.py): ask OpenRouter to report each call's cost in
+# usage.cost, and keep this many recent latencies per aggregate for p50 / p95
+OPENROUTER_USAGE_ACCOUNTING = os.getenv("OPENROUTER_USAGE_ACCOUNTING", "1") == "1"
+LLM_TELEMETRY_LATENCY_SAMPLES = int(os.getenv("LLM_TELEMETRY_LATENCY_SAMPLES", "2000"))
+
+# Image downloads: one pooled HTTP client + content-addressed on-disk cache (src/api/image_cache.py)
+IMAGE_DOWNLOAD_CONCURRENCY = int(os.getenv("IMAGE_DOWNLOAD_CONCURRENCY", "16"))
+IMAGE_DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("IMAGE_DOWNLOAD_TIMEOUT_SECONDS", "30"))
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "1") == "1"
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", str(DATA_DIR / "image_cache"))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+IMAGE_CACHE_REVALIDATE_SECONDS = int(os.getenv("IMAGE_CACHE_REVALIDATE_SECONDS", "3600"))
+
+# Combined copy + visual-anchor analysis per ad image, cached by image SHA-256
+CREATIVE_ANALYSIS_CACHE_ENABLED = os.getenv("CREATIVE_ANALYSIS_CACHE_ENABLED", "1") == "1"
+CREATIVE_ANALYSIS_CACHE_PATH = os.getenv("CREATIVE_ANALYSIS_CACHE_PATH", str(DATA_DIR / "creative_analysis.sqlite"))
+
+# Async simulation jobs (POST /simulations/jobs): in-process worker pool and result retention
+MAX_CONCURRENT_SIMULATIONS = int(os.getenv("MAX_CONCURRENT_SIMULATIONS", "4"))
+SIMULATION_JOB_TTL_SECONDS = int(os.getenv("SIMULATION_JOB_TTL_SECONDS", "3600"))
+
+# Internal monologues (one extra Flash call per reaction / journey):
+#   eager - generated before /run returns (default)
+#   lazy  - generated on first GET /simulations/{id}/monologues/{persona_uuid}, then cached
+#           in this process for SIMULATION_JOB_TTL_SECONDS (opt in per request or here)
+#   off   - never generated
+MONOLOGUE_MODE = os.getenv("MONOLOGUE_MODE", "eager")
+
 # Firestore (frontend / Clerk integration)
 FIRESTORE_USERS_COLLECTION = os.getenv("FIRESTORE_USERS_COLLECTION", "apriori_users")
 
@@ -53,6 +138,20 @@ GENERATION_CONFIG = {
     "max_output_tokens": 2048,
 }
 
+# Flow steps: personas with identical context build identical step prompts. With
+# FLOW_STEP_SINGLE_FLIGHT concurrent identical prompts share one in-flight call, and with
+# FLOW_STEP_REUSE_DECISIONS finished decisions are reused too. Both default to on only when
+# sampling is deterministic (temperature 0); otherwise each persona draws its own decision
+FLOW_STEP_SINGLE_FLIGHT = os.getenv(
+    "FLOW_STEP_SINGLE_FLIGHT", "1" if GENERATION_CONFIG["temperature"] == 0 else "0"
+) == "1"
+FLOW_STEP_REUSE_DECISIONS = os.getenv(
+    "FLOW_STEP_REUSE_DECISIONS", "1" if GENERATION_CONFIG["temperature"] == 0 else "0"
+) == "1"
+
+# Run all flows of a comparison at once instead of one after another
+FLOW_CONCURRENT_FLOWS = os.getenv("FLOW_CONCURRENT_FLOWS", "1") == "1"
+
 # Validation Thresholds
 TRUST_SCORE_THRESHOLD = 3
 MIN_LITERACY_FOR_COMPLEX_FORM = 5
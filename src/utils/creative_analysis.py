@@ -0,0 +1,226 @@
+"""Combined creative analysis: ad copy + visual grounding in one vision call.
+
+Each ad image used to go to the Pro model twice: once for copy extraction
+(ad_copy_extractor) and again in TieredSimulationEngine.create_visual_anchor.
+analyze_creative() asks for both in one multimodal request and caches the
+result by image SHA-256 + prompt version, in memory and in a small SQLite file,
+so the second consumer (and later runs on the same creative) make no call.
+
+analyze_image() puts any other vision prompt (flow screen analyses, the
+standalone visual anchor) behind the same cache, keyed by image SHA-256 +
+the version of that prompt, so unchanged screenshots are analyzed once across
+runs and - with a shared CREATIVE_ANALYSIS_CACHE_PATH - across machines.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.api.gemini_client import gemini_client
+from src.api.llm_telemetry import llm_caller
+from src.utils.config import CREATIVE_ANALYSIS_CACHE_ENABLED, CREATIVE_ANALYSIS_CACHE_PATH
+
+
+CREATIVE_ANALYSIS_PROMPT = """You are an expert in visual design and advertising psychology.
+
+Analyze this ad creative image carefully.
+
+1. **Ad Copy**: Extract ALL TEXT visible in the image (headline, subheadline, body copy,
+   call-to-action, any other text) in natural reading order. Use "" if there is no text.
+2. **Trust Signals**: Logos, certifications, security badges, professional design elements
+3. **Visual Quality**: Resolution, typography, color harmony, layout professionalism
+4. **Color Psychology**: Dominant colors and their emotional impact
+5. **Brand Perception**: Does this look like a legitimate brand or a scam?
+6. **Scam Indicators**: Suspicious elements like typos, poor quality, fake urgency, unrealistic promises
+
+Return as JSON:
+{
+    "ad_copy": "<all visible text>",
+    "trust_signals": "<description>",
+    "visual_quality": "<description>",
+    "color_psychology": "<description>",
+    "brand_perception": "<description>",
+    "scam_indicators": "<list of red flags or 'None detected'>"
+}
+"""
+
+ANALYSIS_FIELDS = (
+    "ad_copy",
+    "trust_signals",
+    "visual_quality",
+    "color_psychology",
+    "brand_perception",
+    "scam_indicators",
+)
+
+
+def _log_creative(step: str, message: str, **kwargs: Any) -> None:
+    """Console log for creative analysis."""
+    extra = " | ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
+    line = f"[CREATIVE] [{step}] {message}"
+    if extra:
+        line += f" | {extra}"
+    print(line)
+
+
+def prompt_version(prompt: str = CREATIVE_ANALYSIS_PROMPT) -> str:
+    """Hash of analysis prompt + Pro model; cached analyses are only reused for the same version."""
+    blob = f"{gemini_client.pro_model}\n{prompt}".encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+class CreativeAnalysisCache:
+    """Analyses keyed by (image sha256, prompt version): in-process dict plus optional SQLite file.
+
+    The table keeps its original name; rows for other prompts differ by prompt_version.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        self._memory: Dict[tuple, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS creative_analyses (
+                    image_sha256 TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (image_sha256, prompt_version)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        if key in self._memory:
+            return self._memory[key]
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM creative_analyses WHERE image_sha256 = ? AND prompt_version = ?", key
+            ).fetchone()
+        if row is None:
+            return None
+        self._memory[key] = json.loads(row[0])
+        return self._memory[key]
+
+    def set(self, key: tuple, analysis: Dict[str, Any]) -> None:
+        self._memory[key] = analysis
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO creative_analyses (image_sha256, prompt_version, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (*key, json.dumps(analysis, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+
+# Global singleton
+creative_analysis_cache = CreativeAnalysisCache(
+    CREATIVE_ANALYSIS_CACHE_PATH if CREATIVE_ANALYSIS_CACHE_ENABLED else None
+)
+
+# Analyses currently being requested, so concurrent callers share one Pro call
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+
+async def _analyze_with_llm(image_data: bytes, name: str) -> Optional[Dict[str, str]]:
+    try:
+        with llm_caller("creative_analysis"):
+            response = await gemini_client.generate_pro(CREATIVE_ANALYSIS_PROMPT, image_data)
+        data = gemini_client.parse_json_response(response)
+    except Exception as exc:
+        _log_creative("ANALYZE", "Analysis failed", image=name, error=repr(exc))
+        return None
+    analysis = {field: str(data.get(field) or "").strip() for field in ANALYSIS_FIELDS}
+    if "no text" in analysis["ad_copy"].lower():
+        analysis["ad_copy"] = ""
+    return analysis
+
+
+async def _cached(
+    key: tuple, name: str, compute: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+) -> Optional[Dict[str, Any]]:
+    """Cache lookup, else one shared call per key; None results and errors are not cached."""
+    cached = creative_analysis_cache.get(key)
+    if cached is not None:
+        _log_creative("CACHE_HIT", "Reusing image analysis", image=name)
+        return cached
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The caller that owned the call was cancelled - look again and run it ourselves
+            return await _cached(key, name, compute)
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        analysis = await compute()
+        if analysis is not None:
+            creative_analysis_cache.set(key, analysis)
+        future.set_result(analysis)
+        return analysis
+    except Exception as exc:
+        future.set_exception(exc)
+        future.exception()  # waiters re-raise it; mark retrieved when there are none
+        raise
+    finally:
+        if not future.done():
+            future.cancel()  # cancelled mid-call: waiters take over
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def analyze_creative(image_path: str) -> Optional[Dict[str, str]]:
+    """Copy + visual-grounding analysis for one ad image, or None if the call failed.
+
+    Concurrent calls for the same image share one request; failures are not cached.
+    """
+    try:
+        image_data = Path(image_path).read_bytes()
+    except OSError as exc:
+        _log_creative("ANALYZE", "Could not read image", image=image_path, error=repr(exc))
+        return None
+
+    name = Path(image_path).name
+    key = (hashlib.sha256(image_data).hexdigest(), prompt_version())
+    return await _cached(key, name, lambda: _analyze_with_llm(image_data, name))
+
+
+async def analyze_image(image_path: str, prompt: str) -> Dict[str, Any]:
+    """Parsed JSON answer of the Pro vision model for one image and prompt, cached.
+
+    Unlike analyze_creative this raises (OSError, API / parse errors) so callers
+    keep their own fallbacks; failures are not cached.
+    """
+    image_data = Path(image_path).read_bytes()
+
+    async def _call() -> Dict[str, Any]:
+        response = await gemini_client.generate_pro(prompt, image_data)
+        return gemini_client.parse_json_response(response)
+
+    key = (hashlib.sha256(image_data).hexdigest(), prompt_version(prompt))
+    return await _cached(key, Path(image_path).name, _call)
+
+
+async def analyze_creatives(image_paths: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+    """Analyze all images concurrently (the Pro rate limiter bounds in-flight calls)."""
+    results = await asyncio.gather(*(analyze_creative(p) for p in image_paths))
+    return dict(zip(image_paths, results))
@@ -104,6 +104,7 @@ class AdReaction(BaseModel):
     reasoning: str
     emotional_response: str
     barriers: List[str] = []
+    tier: Optional[int] = None  # 1 = Pro, 2 = Flash (set by TieredSimulationEngine)
 
 
 class ValidationResult(BaseModel):